@@ -1,14 +1,15 @@
 import streamlit as st
-import pandas as pd
 import os
-import glob
-from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
-import re
-from PIL import Image, ImageDraw
-import numpy as np
+import networkx as nx
 from streamlit_image_coordinates import streamlit_image_coordinates
 
+from dashboard_data import (
+    density_maps, density_partitions, granger_table, hmi_image, input_params, monitoring_summary, scenario_summary, scenario_versions
+)
+from optimold.causality import CONTROLS, OUTPUTS, causal_edges
+from optimold.scenario_rules import describe_rules
+
 st.set_page_config(page_title="OptiMold 공정 제어 및 분석", layout="wide")
 
 # 해당 카테고리별 탭 구성
@@ -35,15 +36,8 @@ with tabs[0]:
     
     st.text("")
 
-    import os
-    from PIL import Image, ImageDraw
-    from streamlit_image_coordinates import streamlit_image_coordinates
-
     display_width = 800
     base_path = os.path.join("hmi_base", "fifth_real_model.png")
-    base_img = Image.open(base_path).convert("RGB")
-    original_width, _ = base_img.size
-    scale_ratio = display_width / original_width
 
     # 센서 좌표 정의 (제어 입력 5 + 공정 출력 5, 각각 2구역씩)
     sensor_boxes = {
@@ -59,16 +53,8 @@ with tabs[0]:
         "Flow_Rate":      {"coords": [(635, 505, 655, 525)], "color": "dodgerblue"},
     }
 
-    # 이미지에 박스 표시
-    draw = ImageDraw.Draw(base_img)
-    for props in sensor_boxes.values():
-        for box in props["coords"]:
-            x1, y1, x2, y2 = box
-            x1 = int(x1 / scale_ratio)
-            y1 = int(y1 / scale_ratio)
-            x2 = int(x2 / scale_ratio)
-            y2 = int(y2 / scale_ratio)
-            draw.rectangle((x1, y1, x2, y2), outline=props["color"], width=3)
+    # 이미지에 박스 표시 (이미지 파일이 바뀌지 않으면 캐시된 결과 재사용)
+    base_img = hmi_image(base_path, sensor_boxes, display_width)
 
     # 좌우 배치
     col_img, col_legend = st.columns([4, 1])
@@ -177,44 +163,18 @@ with tabs[1]:
     st.markdown("시뮬레이션 진행 상황 및 최근 실행 결과를 확인할 수 있습니다.")
 
     st.subheader("📋 최근 실행 통계")
-    import re
 
     log_dir = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/csv_results"
     variables = ["Inject", "Backpr", "Piston_Pressure", "Piston_Position"]
     expected_files = 4
     recent_minutes = 10
 
-    csv_files = glob.glob(os.path.join(log_dir, "*.csv"))
-
-    # 시계열 태그 매핑
-    tag_map = {}
-    pattern = re.compile(r"_(\d{8})_(\d{6})")
-
-    for f in csv_files:
-        fname = os.path.basename(f)
-        match = pattern.search(fname)
-        if match:
-            ymd = match.group(1)
-            hms = match.group(2)
-            tag = f"{ymd}_{hms[:4]}"  # YYYYMMDD_HHMM
-            tag_map.setdefault(tag, []).append(fname)
-
-    # 가장 최근 태그로부터 1분씩 감소
-    if tag_map:
-        latest_tag = sorted(tag_map.keys(), reverse=True)[0]
-        base_dt = datetime.strptime(latest_tag, "%Y%m%d_%H%M")
-        recent_tags = [(base_dt - timedelta(minutes=i)).strftime("%Y%m%d_%H%M") for i in range(recent_minutes)]
-    else:
-        recent_tags = []
+    # 증분 추적기: 마지막 조회 이후 새로 도착한 결과 파일만 사이클 비트마스크에 반영
+    summary = monitoring_summary(log_dir, variables, recent_minutes)
 
     success, fail = 0, 0
-    for tag in recent_tags:
-        match_count = 0
-        files = tag_map.get(tag, [])
-        for var in variables:
-            if any(fname.startswith(var) for fname in files):
-                match_count += 1
-        if match_count >= 3:
+    for tag, ok in summary["recent"]:
+        if ok:
             st.success(f"✅ [{tag}] 공정이 정상적으로 진행되었습니다.")
             success += 1
         else:
@@ -227,43 +187,17 @@ with tabs[1]:
     st.markdown("---")
     st.subheader("🧮 전체 사이클 기준 성공/실패 시각화")
 
-    rid_pattern = re.compile(r"_(\d{8})_(\d{6})_RID014")
-    variables = ["Inject", "Backpr", "Piston_Pressure", "Piston_Position"]
-
-    # 변수별 성공 tag 수집
-    success_tags_by_var = {var: set() for var in variables}
-    filtered_files = [f for f in os.listdir(log_dir) if f.endswith(".csv") and "RID014" in f]
-
-    for f in filtered_files:
-        match = rid_pattern.search(f)
-        if match:
-            ymd, hms = match.groups()
-            tag = f"{ymd}_{hms[:4]}"  # YYYYMMDD_HHMM
-            for var in variables:
-                if f.startswith(var):
-                    success_tags_by_var[var].add(tag)
-
     # 각 변수별 성공 개수 출력 (디버깅 목적)
     st.markdown("##### ✅ 변수별 성공 파일 개수:")
     for var in variables:
-        st.markdown(f"- `{var}` 성공 파일 개수: {len(success_tags_by_var[var])}")
-
-    # 전체 성공 판단 로직
-    tag_sets = list(success_tags_by_var.values())
-    common_tags = set.intersection(*tag_sets)
-    all_tags = set.union(*tag_sets)
+        st.markdown(f"- `{var}` 성공 파일 개수: {summary['files_by_var'][var]}")
 
-    success_count = len(common_tags)
-    ambiguous_tags = []
+    # 전체 성공 판단 (공통 tag + 4개 중 3개 이상 탐지된 tag)
+    success_count = summary["success_count"]
+    ambiguous_tags = summary["ambiguous_tags"]
 
-    for tag in all_tags - common_tags:
-        match_count = sum(tag in tag_set for tag_set in tag_sets)
-        if match_count >= 3:
-            success_count += 1
-        elif match_count <= 2:
-            ambiguous_tags.append((tag, match_count))
-
-    total_expected = 120
+    # 기본 배치(120 사이클) 기준, 연속 운전으로 추적 사이클이 더 많으면 추적 사이클 수 기준
+    total_expected = max(120, summary["tracked"])
     fail_count = total_expected - success_count
 
     st.metric("전체 기준 성공", success_count)
@@ -288,6 +222,7 @@ with tabs[1]:
     )
     plt.setp(autotexts, size=9, weight="bold")
     st.pyplot(fig, use_container_width=False)
+    plt.close(fig)
     
 # 3. Analysis
 with tabs[2]:
@@ -298,37 +233,57 @@ with tabs[2]:
     """)
     st.text("")
     st.text("")
-    st.subheader("Extruder 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Extruder_R007.png"), width=display_width)
+    # 사이클 저장소가 있으면 RID별 밀도 지도(시간 × 값)를 바로 그림, 없으면 기존 이미지 표시
+    partitions = density_partitions()
+    if partitions:
+        rid = st.selectbox("RID 선택", partitions, index=len(partitions) - 1)
+        analysis_vars = ["Extruder", "Retract", "Inject", "Backpr", "Nozzle",
+                         "Piston_Position", "Piston_Pressure", "Piston_Velocity", "Flow_Rate", "Volume"]
+        maps = density_maps(rid, analysis_vars)
+        for var in analysis_vars:
+            if var not in maps:
+                continue
+            st.subheader(f"{var.replace('_', ' ')} 시계열 데이터 분석")
+            m = maps[var]
+            fig, ax = plt.subplots(figsize=(8, 3))
+            ax.imshow(m["density"].T, origin="lower", aspect="auto", cmap="viridis",
+                      extent=(m["t_edges"][0], m["t_edges"][-1], m["v_edges"][0], m["v_edges"][-1]))
+            ax.set_xlabel("Time (s)")
+            ax.set_ylabel(var)
+            ax.set_title(f"{var} density ({rid}, {m['n_cycles']} cycles)")
+            st.pyplot(fig)
+            plt.close(fig)
+    else:
+        st.subheader("Extruder 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Extruder_R007.png"), width=display_width)
 
-    st.subheader("Retract 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Retract_R007.png"), width=display_width)
+        st.subheader("Retract 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Retract_R007.png"), width=display_width)
 
-    st.subheader("Inject 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Inject_R007.png"), width=display_width)
+        st.subheader("Inject 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Inject_R007.png"), width=display_width)
 
-    st.subheader("Backpr 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Backpr_R007.png"), width=display_width)
+        st.subheader("Backpr 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Backpr_R007.png"), width=display_width)
 
-    st.subheader("Nozzle 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Nozzle_R007.png"), width=display_width)
+        st.subheader("Nozzle 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Nozzle_R007.png"), width=display_width)
 
-    st.subheader("Piston Position 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Piston_Position_R007.png"), width=display_width)
+        st.subheader("Piston Position 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Piston_Position_R007.png"), width=display_width)
 
-    st.subheader("Piston Pressure 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Piston_Pressure_R007.png"), width=display_width)
+        st.subheader("Piston Pressure 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Piston_Pressure_R007.png"), width=display_width)
 
-    st.subheader("Piston Velocity 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Piston_Pressure_R007(1).png"), width=display_width)
-    st.image(os.path.join("Anal_base", "Piston_Velocity_R007.png"), width=display_width)
+        st.subheader("Piston Velocity 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Piston_Pressure_R007(1).png"), width=display_width)
+        st.image(os.path.join("Anal_base", "Piston_Velocity_R007.png"), width=display_width)
 
-    st.subheader("Flow Rate 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Flow_Rate_R007.png"), width=display_width)
+        st.subheader("Flow Rate 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Flow_Rate_R007.png"), width=display_width)
 
-    st.subheader("Volume 시계열 데이터 분석")
-    st.image(os.path.join("Anal_base", "Volume_R007.png"), width=display_width)
-    
+        st.subheader("Volume 시계열 데이터 분석")
+        st.image(os.path.join("Anal_base", "Volume_R007.png"), width=display_width)
 
 
 # 4. Causality
@@ -339,7 +294,38 @@ with tabs[3]:
     - 네트워크 시각화 및 테이블 형태의 요약 결과를 제공합니다.
     """)
     st.text("")
-    st.image(os.path.join("GS_base", "GS_Network.png"), width=display_width)
+
+    # 검정표가 있으면 네트워크/요약표를 검정 결과로부터 생성, 없으면 기존 이미지 표시
+    granger_path = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/granger_table.csv"
+    granger = granger_table(granger_path)
+    if granger is None:
+        st.image(os.path.join("GS_base", "GS_Network.png"), width=display_width)
+    else:
+        edge_styles = {
+            "strong": dict(edge_color="black", style="solid"),
+            "weak": dict(edge_color="gray", style="dashed"),
+            "uncertain": dict(edge_color="lightgray", style="dotted"),
+        }
+        G = nx.DiGraph()
+        G.add_nodes_from(CONTROLS + OUTPUTS)
+        pos = {node: (-1, 4 - i) for i, node in enumerate(CONTROLS)}
+        pos.update({node: (1, 4 - i) for i, node in enumerate(OUTPUTS)})
+
+        fig, ax = plt.subplots(figsize=(8, 6))
+        nx.draw_networkx_nodes(G, pos, ax=ax, node_color=["skyblue"] * len(CONTROLS) + ["lightgreen"] * len(OUTPUTS),
+                               node_size=3000)
+        nx.draw_networkx_labels(G, pos, ax=ax, font_size=9, font_weight="bold")
+        for src, tgt, strength in causal_edges(granger):
+            nx.draw_networkx_edges(G, pos, ax=ax, edgelist=[(src, tgt)], arrows=True, arrowstyle="-|>",
+                                   arrowsize=20, **edge_styles[strength])
+        ax.set_title("Granger Causality Network (Control → Output)")
+        ax.axis("off")
+        st.pyplot(fig)
+        plt.close(fig)
+
+        st.markdown("#### 📋 지연별 최소 p-value (제어 입력 → 공정 출력)")
+        st.dataframe(granger.pivot_table(index="control", columns="output", values="p_value", aggfunc="min")
+                     .reindex(index=CONTROLS, columns=OUTPUTS))
     st.text("")
     st.image(os.path.join("GS_base", "GS_Total.png"), width=display_width)
     st.image(os.path.join("GS_base", "GS_Piston_Position.png"), width=display_width)
@@ -356,70 +342,53 @@ with tabs[4]:
 
     st.markdown("### 🔍 이상 시나리오 분포 요약")
 
-    # CSV 로드
-    csv_path = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/classified_scenarios_012.csv"
-    df = pd.read_csv(csv_path)
-
-    # 정상 / 이상 구분
-    df["result"] = df["scenario"].apply(lambda x: "Success" if x == "Normal" else "Fail")
-    result_counts = df["result"].value_counts()
-    success_count = result_counts.get("Success", 0)
-    fail_count = result_counts.get("Fail", 0)
-
-    # 시나리오 비율 계산
-    scenario_counts = df["scenario"].value_counts(normalize=True) * 100
-
-    # 📊 그래프 2:1 레이아웃 구성
-    col1, col2 = st.columns([2, 1])
-
-    with col1:
-        fig2, ax2 = plt.subplots()
-        ax2.pie(scenario_counts, labels=scenario_counts.index, autopct="%1.1f%%", textprops={"fontsize": 8})
-        ax2.set_title("Anomaly Scenario Distribution")
-        st.pyplot(fig2)
-
-    with col2:
-        fig, ax = plt.subplots(figsize=(4, 2), dpi=100)
-        wedges, texts, autotexts = ax.pie(
-            [success_count, fail_count],
-            labels=["Normal", "Anomalous"],
-            autopct="%1.1f%%",
-            startangle=180,
-            counterclock=False,
-            textprops=dict(fontsize=8),
-        )
-        plt.setp(autotexts, size=9, weight="bold")
-        ax.set_title("Normal vs Anomalous")
-        st.pyplot(fig, use_container_width=False)
+    # 분류 결과 버전 선택 (기본: 최신) 및 정상 / 이상 구분, 시나리오 비율 계산 (저장소가 바뀐 경우에만 재계산)
+    versions = scenario_versions()
+    if not versions:
+        st.warning("분류 결과가 없습니다. `python -m optimold.scenario_store`로 결과를 등록하세요.")
+    else:
+        version_labels = {
+            f"v{v['version']} · {v['source'] or '-'} · {v['created']}"
+            + (f" (= v{v['restored_from']})" if "restored_from" in v else ""): v["version"]
+            for v in reversed(versions)
+        }
+        selected_version = st.selectbox("분류 결과 버전", list(version_labels), index=0)
+        scenarios = scenario_summary(version=version_labels[selected_version])
+        success_count = scenarios["success_count"]
+        fail_count = scenarios["fail_count"]
+        scenario_counts = scenarios["scenario_counts"]
+
+        # 📊 그래프 2:1 레이아웃 구성
+        col1, col2 = st.columns([2, 1])
+
+        with col1:
+            fig2, ax2 = plt.subplots()
+            ax2.pie(scenario_counts, labels=scenario_counts.index, autopct="%1.1f%%", textprops={"fontsize": 8})
+            ax2.set_title("Anomaly Scenario Distribution")
+            st.pyplot(fig2)
+            plt.close(fig2)
+
+        with col2:
+            fig, ax = plt.subplots(figsize=(4, 2), dpi=100)
+            wedges, texts, autotexts = ax.pie(
+                [success_count, fail_count],
+                labels=["Normal", "Anomalous"],
+                autopct="%1.1f%%",
+                startangle=180,
+                counterclock=False,
+                textprops=dict(fontsize=8),
+            )
+            plt.setp(autotexts, size=9, weight="bold")
+            ax.set_title("Normal vs Anomalous")
+            st.pyplot(fig, use_container_width=False)
+            plt.close(fig)
     
     st.text("")
     st.text("")
 
     # 📘 시나리오 설명 출력 (설명 + 판정 기준 포함)
     st.text("")
-    scenario_desc = {
-        "Normal": "공정 출력이 모두 정상 범위 내에 있어 양품으로 판정됨.",
-        "Short shot": (
-            "충진 부족으로 인해 부품 일부가 비어 있거나 형상이 완성되지 않음.  \n"
-            "- **판정 기준**: 최대 충진량(Volume_max) < 45"
-        ),
-        "Overpacking / Flash": (
-            "압력이 과도하거나 피스톤 과이동으로 인해 금형 틈새로 수지가 누출됨.  \n"
-            "- **판정 기준**: 최대 충진량(Volume_max) > 55"
-        ),
-        "Sticking / Slip - Late velocity stall": (
-            "보압 시작 이후 피스톤의 속도가 비정상적으로 정지되거나 불안정하게 유지됨.  \n"
-            "- **판정 기준**: 피스톤 속도 구간 flat ratio (6초 이후) < 0.9"
-        ),
-        "Jetting - High flow surge": (
-            "충진 초기에 과도한 유량이 짧은 시간 급격히 변화하면서 외관 불량 가능성이 존재함.  \n"
-            "- **판정 기준**: Flow Rate 변화 기울기 강도가 0.6초 이상 지속"
-        ),
-        "Sink mark - Velocity stalled during packing end": (
-            "보압 종료 시점 이후 피스톤 속도가 멈추어 냉각 수축에 따른 수축 자국(sink mark)이 발생할 수 있음.  \n"
-            "- **판정 기준**: 8초 이후 피스톤 속도 flat 상태 지속시간 > 1.95초"
-        )
-    }
+    scenario_desc = describe_rules()
 
     st.markdown("### 🧠 이상 시나리오 설명")
     for label, desc in scenario_desc.items():
@@ -428,21 +397,37 @@ with tabs[4]:
 # 6. Prediction
 from prediction_module import (
     load_input_params_with_binlabel,
-    load_selected_files,
     find_closest_bin_match,
     load_time_series
 )
-
-
-def parse_bin_label(label):
-    # 예: "I7_B1_R0_N13" → [7, 1, 0, 13]
-    return list(map(int, re.findall(r'\d+', label)))
-
-def find_top_k_similar_bins(input_bin, df, k=3):
-    input_vec = parse_bin_label(input_bin)
-    df["bin_vec"] = df["bin_label"].apply(parse_bin_label)
-    df["distance"] = df["bin_vec"].apply(lambda x: sum(abs(a - b) for a, b in zip(x, input_vec)))
-    return df.nsmallest(k, "distance")
+from optimold.bin_index import BinIndex
+from optimold.binning import AXES, AXIS_RANGES
+from optimold.surrogate_model import MODEL_PATH, SurrogateModel
+from optimold.sweep import SWEEP_MODEL_PATH, SweepModel, grid_points, lhs_points, safe_window
+from optimold.timeseries_service import TimeSeriesService
+
+
+@st.cache_resource
+def get_time_series_service(csv_dir):
+    # 세션 간 공유: 최근 예측 run 시계열을 float32로 보관 (상한 256MB)
+    return TimeSeriesService(csv_dir)
+
+@st.cache_resource
+def get_model(_model_cls, model_path, mtime):
+    # 학습된 모델(대리모델 / 스윕 모델)은 프로세스당 1회 로딩 (모델 파일이 바뀔 때만 다시 로딩)
+    return _model_cls.load(model_path)
+
+@st.cache_resource
+def get_bin_index(input_path, mtime):
+    # input_params.csv가 바뀔 때(mtime)만 색인 재생성
+    return BinIndex(load_input_params_with_binlabel(input_path))
+
+def find_top_k_similar_bins(input_bin, df, bin_index, k=3):
+    # bin 격자 L1 거리 기준 상위 k개 (df는 수정하지 않음)
+    rows, distances = bin_index.top_k_bins(input_bin, k)
+    similar = df.iloc[rows].copy()
+    similar["distance"] = distances
+    return similar
 
 with tabs[5]:
     st.title(":crystal_ball: 공정 예측")
@@ -471,14 +456,14 @@ with tabs[5]:
 
         submitted = st.form_submit_button("입력값 기반 공정 예측")
         if submitted:
-            st.cache_data.clear()
             st.success(f"입력값 저장 완료 (Run ID: {run_id})")
 
             csv_dir = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/csv_results"
             input_path = os.path.join(csv_dir, "input_params.csv")
 
-            selected_files, _ = load_selected_files(csv_dir)
-            df = load_input_params_with_binlabel(input_path)
+            ts_service = get_time_series_service(csv_dir)
+            df = input_params(input_path)
+            bin_index = get_bin_index(input_path, os.path.getmtime(input_path))
 
             input_vec = [inject_peak, backpr_amp, retract_delay, nozzle_delay]
             bin_label = find_closest_bin_match(input_vec, df)
@@ -487,13 +472,22 @@ with tabs[5]:
             st.json(dict(zip(["Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay"], input_vec)))
             st.markdown(f"📌 매칭된 이산화 bin_label: `{bin_label}`")
 
-            matched_rows = df[df["bin_label"] == bin_label]
+            # 학습된 대리모델이 있으면 입력값에 대한 출력 시계열을 바로 예측 (저장된 run 탐색 불필요)
+            if os.path.exists(MODEL_PATH):
+                surrogate = get_model(SurrogateModel, MODEL_PATH, os.path.getmtime(MODEL_PATH))
+                st.markdown("### 🤖 대리모델 예측 시계열")
+                for var, df_ts in surrogate.predict_frames(input_vec).items():
+                    st.subheader(f"📈 {var} (예측)")
+                    st.line_chart(df_ts.set_index("Time"))
+                st.markdown("### 🗂️ 저장된 유사 공정")
+
+            matched_rows = df.iloc[bin_index.rows_with_label(bin_label)]
 
             if matched_rows.empty:
                 st.error("해당 입력값의 bin_label과 정확히 일치하는 공정이 없습니다.")
 
                 st.markdown("🔍 **가장 유사한 공정을 탐색합니다:**")
-                similar = find_top_k_similar_bins(bin_label, df, k=3)
+                similar = find_top_k_similar_bins(bin_label, df, bin_index, k=3)
 
                 # 유사도 기준 경고
                 if similar["distance"].min() > 5:
@@ -503,9 +497,9 @@ with tabs[5]:
                     st.markdown(f"- `{row['run_id']}` ({row['bin_label']}) → 거리: {row['distance']}")
 
                 if not similar.empty:
+                    ts_service.preload(similar["run_id"].iloc[1:])  # 나머지 후보는 백그라운드 로딩
                     chosen = similar.iloc[0]
-                    run_index = df[df["run_id"] == chosen["run_id"]].index[0]
-                    time_series = load_time_series(run_index, selected_files)
+                    time_series = load_time_series(chosen["run_id"], ts_service)
 
                     st.markdown("🧩 **해당 run 입력값:**")
                     for col in ["Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay"]:
@@ -521,8 +515,8 @@ with tabs[5]:
                 for idx, row in matched_rows.iterrows():
                     st.markdown(f"- `{row['run_id']}`")
 
-                run_index = df[df["run_id"] == matched_rows.iloc[0]["run_id"]].index[0]
-                time_series = load_time_series(run_index, selected_files)
+                ts_service.preload(matched_rows["run_id"].iloc[1:4])  # 나머지 일치 run은 백그라운드 로딩
+                time_series = load_time_series(matched_rows.iloc[0]["run_id"], ts_service)
 
                 st.markdown("🧩 **해당 run 입력값:**")
                 for col in ["Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay"]:
@@ -532,4 +526,46 @@ with tabs[5]:
                     st.subheader(f"📊 {var}")
                     st.line_chart(df_ts.iloc[:, 1] if df_ts.shape[1] == 2 else df_ts.iloc[:, 0])
 
+    # 🗺️ What-if 스윕: 제어 입력 공간 전체를 한 번에 평가하여 안전 운전 영역 탐색
+    st.markdown("---")
+    st.subheader("🗺️ What-if 스윕: 제어 입력 공간 일괄 평가")
 
+    if not os.path.exists(SWEEP_MODEL_PATH):
+        st.info("스윕 모델이 없습니다. `python -m optimold.sweep`으로 학습하세요.")
+    else:
+        sweep_model = get_model(SweepModel, SWEEP_MODEL_PATH, os.path.getmtime(SWEEP_MODEL_PATH))
+
+        with st.form("sweep_form"):
+            sweep_mode = st.radio("스윕 방식", ["Latin hypercube", "격자(grid)"], horizontal=True)
+            n_points = st.select_slider("평가 지점 수", options=[1000, 5000, 10000, 20000, 50000], value=20000)
+            col_x, col_y, col_s = st.columns(3)
+            x_axis = col_x.selectbox("X축", AXES, index=0)
+            y_axis = col_y.selectbox("Y축", AXES, index=3)
+            target = col_s.selectbox("표시 시나리오 확률", sweep_model.scenarios_,
+                                     index=sweep_model.scenarios_.index("Normal") if "Normal" in sweep_model.scenarios_ else 0)
+            sweep_submitted = st.form_submit_button("스윕 실행")
+
+        if sweep_submitted:
+            if sweep_mode == "격자(grid)":
+                points = grid_points(max(2, int(round(n_points ** 0.25))))
+            else:
+                points = lhs_points(n_points)
+            result = sweep_model.evaluate(points)
+
+            st.markdown(f"평가 지점 **{len(result):,}개** (학습 사이클 {sweep_model.n_train_}개)")
+            window = safe_window(result, x_axis, y_axis, target)
+            fig, ax = plt.subplots(figsize=(7, 5))
+            (x_lo, x_hi), (y_lo, y_hi) = (AXIS_RANGES[AXES.index(axis)] for axis in (x_axis, y_axis))
+            im = ax.imshow(window.to_numpy(), aspect="auto", cmap="RdYlGn", vmin=0, vmax=1,
+                           extent=(x_lo, x_hi, y_lo, y_hi))  # 구간 경계 = 축 범위 양 끝 (빈 칸은 NaN)
+            fig.colorbar(im, ax=ax, label=f"P({target})")
+            ax.set_xlabel(x_axis)
+            ax.set_ylabel(y_axis)
+            ax.set_title(f"P({target}) — 나머지 축 평균")
+            st.pyplot(fig)
+            plt.close(fig)
+
+            st.markdown("**예측 시나리오 분포**")
+            st.dataframe(result["scenario"].value_counts(normalize=True).mul(100).round(1).rename("비율(%)"))
+            st.download_button("스윕 결과 CSV 다운로드", result.to_csv(index=False).encode("utf-8"),
+                               file_name="whatif_sweep.csv", mime="text/csv")
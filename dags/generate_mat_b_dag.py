@@ -25,13 +25,13 @@ from airflow.operators.python import get_current_context
 from airflow.models import Variable
 from airflow.exceptions import AirflowSkipException
 from datetime import datetime, timedelta
-import subprocess
 import sys
-import os
 
 # 사용자 정의 모듈 import 경로 등록
 sys.path.append('/home/seominhyuk/code/wh04-3rd-3team-OptiMold/src')
 from optimold.generate_physical_mat import generate_mat  # 실제 .mat 생성 함수
+from optimold.sim_pool import MatlabCliBackend, MatlabEngineBackend
+from optimold.result_index import refresh as refresh_index
 
 
 # 🔁 실행 횟수 제한 로직.
@@ -40,70 +40,48 @@ def check_cycle_count():
     count = int(Variable.get("cycle_count", default_var=0))
     if count >= 120:
         raise AirflowSkipException("Cycle count reached. Skipping execution.")
+    if count == 0:
+        # cycle_count 초기화 = 새 캠페인 시작 → 캠페인 ID를 이번 DAG run ID로 기록 (난수 스트림 구분)
+        Variable.set("optimold_campaign", get_current_context()['run_id'])
     Variable.set("cycle_count", count + 1)
+    return count  # 이번 실행의 사이클 인덱스 (난수 스트림 키로 사용)
+
+# 🎲 재현 가능한 난수 스트림: 고정 root seed + (run_id, 캠페인) + 사이클 인덱스
+# airflow variables set optimold_root_seed <정수> 로 변경 가능
+# 캠페인 ID는 optimold_campaign Variable에 남으므로 generate_mat(stream_key="{run_id}:{캠페인 ID}")로 재현 가능
+def generate_cycle_mat(run_id):
+    context = get_current_context()
+    cycle = context['ti'].xcom_pull(task_ids='check_cycle_count')
+    root_seed = int(Variable.get("optimold_root_seed", default_var=42))
+    campaign = Variable.get("optimold_campaign", default_var="")
+    return generate_mat(seed=root_seed, run_id=run_id, cycle=int(cycle or 0), stream_key=f"{run_id}:{campaign}")
 
 def simulate_matlab():
     """
-    MATLAB 명령줄에서 .mat 파일 로드 및 Simulink 모델 실행
-    - MATLAB CLI 가용 환경이어야 함
-    - 모델 경로 및 이름은 고정값으로 가정
+    MATLAB에서 .mat 파일 로드 및 Simulink 모델 실행
+    - optimold_matlab_session Variable이 설정되어 있으면 해당 이름의 공유 MATLAB 세션
+      (matlab.engine.shareEngine)에 연결하여 MATLAB 기동/모델 로드 비용 없이 실행
+    - 미설정 시 기존 MATLAB CLI(-batch) 방식으로 실행
+    - 모델 경로 및 이름은 고정값으로 가정 (optimold.sim_pool 참고)
+    - 실행 후 결과 CSV 색인(optimold.result_index) 갱신
     """
     context = get_current_context()
     mat_path = context['ti'].xcom_pull(task_ids='generate_mat')
 
     if not mat_path or not mat_path.endswith('.mat'):
         raise ValueError("유효한 .mat 파일 경로가 전달되지 않았습니다.")
-    
-
-    # Simulink 모델 절대 경로 (윈도우 기준)
-    slx_path = "C:/Users/Admin/MATLAB/Projects/my_project/src/wh04_3rd_3team_optimold/fifth_real_model.slx"
-
-    # Postprocess 스크립트 경로
-    postprocess_script = "C:/Users/Admin/MATLAB/Projects/my_project/scripts/save_results_to_csv.m"
-        
-    # MATLAB CLI 실행 경로 (WSL용)
-    matlab_exe = '"/mnt/c/Program Files/MATLAB/R2024b/bin/matlab.exe"'
-    
-    # Windows 경로로 변환한 .mat 파일 경로
-    win_mat_path = mat_path.replace("/mnt/c", "C:").replace("/", "\\")
-    
-    # 🔁 변수명 매핑: {Simulink에서 필요한 이름: .mat 내부 변수명}
-    var_map = {
-        "Backpr": "backpr_data",
-        "Extruder": "extruder_data",
-        "Flow_Rate": "flow_rate_data",
-        "Inject": "inject_data",
-        "Nozzle": "nozzle_data",
-        "Piston_Position": "piston_position_data",
-        "Piston_Pressure": "piston_pressure_data",
-        "Piston_Velocity": "piston_velocity_data",
-        "Retract": "retract_data",
-        "Volume": "volume_data",
-    }
-
-    # 🔧 assignin('base', 'Simulink용 이름', .mat 내부 변수명) 생성
-    assign_lines = "; ".join([
-        f"assignin('base','{k}',{v})" for k, v in var_map.items()
-    ])
-
-    # 명령어 구성
-    matlab_cmd = (
-        f'{matlab_exe} -batch '
-        '"diary(\'C:/Users/Admin/MATLAB/Projects/my_project/log.txt\'); '
-        'clearvars -except run_id; '
-        f"load('{win_mat_path}'); "
-        f"assignin('base','Backpr',backpr_data); "
-        f"assignin('base','Extruder',extruder_data); "
-        f"assignin('base','Inject',inject_data); "
-        f"assignin('base','Nozzle',nozzle_data); "
-        f"assignin('base','Retract',retract_data); "
-        f"sim('{slx_path}'); "
-        f"run('{postprocess_script}'); "
-        'diary off;"'
-    )
 
-    print(f"실행할 MATLAB 명령: {matlab_cmd}")
-    subprocess.run(matlab_cmd, shell=True, check=True)
+    session_name = Variable.get("optimold_matlab_session", default_var="")
+    backend = MatlabEngineBackend(session_name=session_name) if session_name else MatlabCliBackend()
+
+    backend.start()
+    try:
+        backend.run(mat_path)
+    finally:
+        backend.close()
+
+    # postprocess가 저장한 CSV를 결과 색인에 반영 (신규/변경 파일만)
+    refresh_index()
 
 
 # DAG 기본 설정
@@ -132,9 +110,8 @@ with DAG(
 
     generate_mat_file = PythonOperator(
         task_id='generate_mat',
-        python_callable=generate_mat,
-        op_kwargs={'seed': int(datetime.now().timestamp()) % (2**32 - 1),
-                   'run_id': "014"}, # 여기에 직접 run_id 부여
+        python_callable=generate_cycle_mat,
+        op_kwargs={'run_id': "014"}, # 여기에 직접 run_id 부여
     )
 
     simulate_matlab_task = PythonOperator(
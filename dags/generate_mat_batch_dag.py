@@ -0,0 +1,159 @@
+# dags/generate_mat_batch_dag.py
+
+"""
+Airflow DAG: 배치 단위 .mat 파일 생성 및 병렬 Simulink 시뮬레이션
+
+[기능 요약]
+1. generate_batch 태스크:
+   - batch_size개 사이클의 .mat 파일을 한 번에 생성 (generate_batch_mats)
+   - chunk_size개씩 묶어 청크 리스트를 XCom으로 전달
+
+2. simulate_chunk 태스크 (dynamic task mapping):
+   - 청크마다 매핑된 태스크 1개가 태스크 프로세스 안에서 세션을 한 번 기동하고 청크 내 사이클을 순서대로 처리
+     (매핑 태스크 자체가 병렬 단위이므로 별도 워커 프로세스를 띄우지 않음)
+   - 동시에 실행되는 시뮬레이션 태스크 수는 OPTIMOLD_SIM_CONCURRENCY (기본 4)로 제한
+   - 공유 MATLAB 세션은 claim_session 잠금으로 세션당 태스크 1개만 사용 (base workspace 입력 섞임 방지)
+     세션이 1개뿐이면 매핑 태스크가 차례로 실행되므로 OPTIMOLD_SIM_CONCURRENCY를 세션 수 이하로 맞추는 것을 권장
+   - 청크 완료 시 결과 CSV 색인(optimold.result_index) 갱신
+
+3. join_results 태스크:
+   - 매핑된 모든 태스크의 결과를 모아 성공/실패 사이클 수를 집계
+
+4. compact_results 태스크:
+   - csv_results의 신규 사이클 CSV를 컬럼형 사이클 저장소(optimold.cycle_store)로 압축
+
+[기존 DAG(generate_mat_and_simulate_dag_v14)와의 차이]
+- DAG 실행 1회 = 배치 1개 (cycle_count Variable 읽기/쓰기 없음)
+- 배치 소요 시간은 워커 수에 비례하여 단축
+
+[환경 전제]
+- pdm 또는 .venv 환경에서 airflow 2.3+ 실행 (dynamic task mapping)
+- MATLAB CLI 또는 공유 MATLAB 세션 (optimold_matlab_session Variable, 쉼표로 여러 개 지정 가능)
+"""
+
+from airflow import DAG
+from airflow.operators.dummy import DummyOperator
+from airflow.operators.python import PythonOperator
+from airflow.operators.python import get_current_context
+from airflow.models import Variable
+from datetime import datetime, timedelta
+import sys
+import os
+
+# 사용자 정의 모듈 import 경로 등록
+sys.path.append('/home/seominhyuk/code/wh04-3rd-3team-OptiMold/src')
+from optimold.generate_physical_mat import generate_batch_mats
+from optimold.sim_pool import MatlabCliBackend, MatlabEngineBackend, claim_session, run_serial
+from optimold.cycle_store import compact
+from optimold.result_index import refresh as refresh_index
+
+# 동시에 실행할 시뮬레이션 태스크 수 (MATLAB 라이선스/CPU 코어 수에 맞게 조정)
+SIM_CONCURRENCY = int(os.environ.get("OPTIMOLD_SIM_CONCURRENCY", 4))
+
+
+def generate_batch_inputs():
+    """
+    배치 전체의 .mat 파일을 먼저 생성하고 청크 단위 op_args 리스트 반환
+    - 난수 스트림 키: root seed + (run_id, DAG run id) → 같은 DAG run 재실행 시 동일한 배치
+    """
+    context = get_current_context()
+    params = context['params']
+    batch_size = int(params['batch_size'])
+    chunk_size = int(params['chunk_size'])
+
+    root_seed = int(Variable.get("optimold_root_seed", default_var=42))
+    stream_id = f"{params['run_id']}/{context['dag_run'].run_id}"
+
+    mat_paths = generate_batch_mats(batch_size, seed=root_seed, run_id=params['run_id'], stream_key=stream_id)
+
+    chunks = [mat_paths[i:i + chunk_size] for i in range(0, len(mat_paths), chunk_size)]
+    return [[chunk] for chunk in chunks]
+
+
+def simulate_chunk(mat_paths):
+    """
+    청크 내 .mat 파일들을 하나의 세션으로 순서대로 시뮬레이션 (태스크 프로세스에서 직접 실행)
+    - 공유 세션은 비어 있는 세션을 잠금으로 독점 (모두 사용 중이면 map_index 기준 세션이 풀릴 때까지 대기)
+    """
+    context = get_current_context()
+    sessions = [s.strip() for s in Variable.get("optimold_matlab_session", default_var="").split(",") if s.strip()]
+
+    if sessions:
+        with claim_session(sessions, context['ti'].map_index) as session_name:
+            results = run_serial(MatlabEngineBackend(session_name=session_name), mat_paths)
+    else:
+        results = run_serial(MatlabCliBackend(), mat_paths)
+
+    # postprocess가 저장한 CSV를 결과 색인에 반영 (신규/변경 파일만)
+    refresh_index()
+
+    for r in results:
+        status = "✓" if r['ok'] else "✗"
+        print(f"[{status}] {os.path.basename(r['mat_path'])} ({r['elapsed']:.1f}s) {r['error'] or ''}")
+    return [{k: r[k] for k in ("mat_path", "ok", "error", "elapsed")} for r in results]
+
+
+def join_results():
+    """매핑된 simulate_chunk 결과 집계 (전부 실패 시 태스크 실패 처리)"""
+    context = get_current_context()
+    chunk_results = context['ti'].xcom_pull(task_ids='simulate_chunk') or []
+    results = [r for chunk in chunk_results if chunk for r in chunk]
+
+    success = sum(r['ok'] for r in results)
+    fail = len(results) - success
+    print(f"✅ 배치 시뮬레이션 완료: 성공 {success} / 실패 {fail}")
+    for r in results:
+        if not r['ok']:
+            print(f"   ❌ {r['mat_path']}: {r['error']}")
+
+    if results and success == 0:
+        raise RuntimeError("배치 내 모든 사이클 시뮬레이션이 실패했습니다.")
+    return {"success": success, "fail": fail}
+
+
+# DAG 기본 설정
+default_args = {
+    'owner': 'airflow',
+    'start_date': datetime(2025, 6, 5),
+    'retries': 0,
+    'retry_delay': timedelta(minutes=1)
+}
+
+with DAG(
+    dag_id='generate_mat_batch_simulate_dag_v1',
+    default_args=default_args,
+    description='Generate a batch of .mat files and run Simulink simulations in parallel mapped tasks',
+    schedule_interval=None,  # 수동 트리거 (1회 = 배치 1개)
+    catchup=False,
+    params={'batch_size': 120, 'chunk_size': 10, 'run_id': "014"},
+    tags=['optimold', 'matlab', 'simulation', 'batch']
+) as dag:
+
+    start = DummyOperator(task_id='start')
+
+    generate_batch = PythonOperator(
+        task_id='generate_batch',
+        python_callable=generate_batch_inputs,
+    )
+
+    simulate_chunks = PythonOperator.partial(
+        task_id='simulate_chunk',
+        python_callable=simulate_chunk,
+        max_active_tis_per_dag=SIM_CONCURRENCY,
+    ).expand(op_args=generate_batch.output)
+
+    join = PythonOperator(
+        task_id='join_results',
+        python_callable=join_results,
+        trigger_rule='all_done',  # 일부 청크 실패 시에도 집계 수행
+    )
+
+    compact_results = PythonOperator(
+        task_id='compact_results',
+        python_callable=compact,
+    )
+
+    end = DummyOperator(task_id='end')
+
+    # DAG 흐름 정의
+    start >> generate_batch >> simulate_chunks >> join >> compact_results >> end
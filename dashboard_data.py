@@ -0,0 +1,156 @@
+# dashboard_data.py
+
+"""
+Streamlit 대시보드(Main.py) 데이터 접근 계층
+
+- 모든 로더는 st.cache_data로 캐시되며 캐시 키에 파일/디렉토리 mtime(ns)이 포함됨
+  → 위젯 클릭 등으로 스크립트가 다시 실행되어도 파싱/집계 결과를 재사용하고,
+    새 사이클 파일이 도착하거나(결과 디렉토리 mtime 변경) 파일이 수정된 경우에만 다시 계산
+- 공개 함수는 mtime을 직접 읽어 내부 캐시 함수에 넘기므로 호출부는 경로만 전달
+- mtime이 바뀔 때마다 새 캐시 항목이 생기므로 로더별 항목 수를 CACHE_ENTRIES개로 제한
+  (생산 중 대시보드를 계속 띄워 두어도 지난 mtime의 DataFrame이 쌓이지 않음)
+- 모니터링 집계는 프로세스 수명 동안 유지되는 증분 추적기(st.cache_resource)가 담당
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+from PIL import Image, ImageDraw
+
+from optimold.cycle_store import MANIFEST, STORE_DIR, read_manifest
+from optimold.cycle_tracker import CycleTracker
+from optimold.density import DENSITY_DIR, load_map, smooth_density, update_maps
+from optimold.scenario_rules import DEFAULT_SCENARIO
+from optimold.scenario_store import SCENARIO_STORE, VERSIONS, list_versions, load_results, seed_legacy
+from optimold.signal_tensor import TENSOR_DIR, build_tensor
+
+CACHE_ENTRIES = 4
+
+
+def mtime_key(path):
+    """캐시 무효화 키: 파일/디렉토리 mtime(ns), 경로가 없으면 0"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+# [1] HMI 기본 이미지 + 센서 박스
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _hmi_image(base_path, version, sensor_boxes, display_width):
+    base_img = Image.open(base_path).convert("RGB")
+    original_width, _ = base_img.size
+    scale_ratio = display_width / original_width
+
+    draw = ImageDraw.Draw(base_img)
+    for props in sensor_boxes.values():
+        for box in props["coords"]:
+            x1, y1, x2, y2 = (int(c / scale_ratio) for c in box)
+            draw.rectangle((x1, y1, x2, y2), outline=props["color"], width=3)
+    return base_img
+
+
+def hmi_image(base_path, sensor_boxes, display_width=800):
+    return _hmi_image(base_path, mtime_key(base_path), sensor_boxes, display_width)
+
+
+# [2] 시뮬레이션 모니터링 집계 (증분 추적기: rerun마다 새로 도착한 파일만 반영)
+@st.cache_resource(show_spinner=False)
+def _cycle_tracker(log_dir, variables, rid):
+    return CycleTracker(log_dir, variables, rid)
+
+
+def monitoring_summary(log_dir, variables, recent_minutes=10, rid="014"):
+    """
+    반환값: {"recent": [(tag, 성공 여부)], "files_by_var": {변수: 성공 tag 수},
+             "success_count": 전체 성공 사이클 수, "ambiguous_tags": [(tag, 탐지 변수 수)],
+             "tracked": 지정 RID에서 감시 변수가 1개 이상 도착한 사이클 수}
+    """
+    tracker = _cycle_tracker(log_dir, tuple(variables), rid)
+    tracker.poll()
+    return {**tracker.summary(), "recent": tracker.recent(recent_minutes)}
+
+
+# [3] 이상 시나리오 분류 결과 (버전 저장소: 최신 또는 고정 버전)
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _scenario_versions(store_dir, version):
+    return list_versions(store_dir)
+
+
+@st.cache_resource(show_spinner=False)
+def _seed_legacy(store_dir):
+    """기존 classified_scenarios_012.csv 등록은 프로세스당 1회만 (rerun마다 해시/쓰기 반복 방지)"""
+    return seed_legacy(store_dir)
+
+
+def scenario_versions(store_dir=SCENARIO_STORE):
+    """저장소 버전 목록 (오래된 순), 저장소가 비어 있으면 기존 classified_scenarios_012.csv로 시작"""
+    _seed_legacy(store_dir)
+    return _scenario_versions(store_dir, mtime_key(os.path.join(store_dir, VERSIONS)))
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _scenario_summary(store_dir, pinned, version):
+    df = load_results(pinned, store_dir)
+    is_normal = df["scenario"] == DEFAULT_SCENARIO
+    return {
+        "success_count": int(is_normal.sum()),
+        "fail_count": int((~is_normal).sum()),
+        "scenario_counts": df["scenario"].value_counts(normalize=True) * 100,
+    }
+
+
+def scenario_summary(store_dir=SCENARIO_STORE, version=None):
+    """
+    version: None이면 최신, 버전 번호 또는 digest 접두어로 고정 가능
+    반환값: {"success_count", "fail_count", "scenario_counts": 시나리오별 비율(%) Series}
+    """
+    return _scenario_summary(store_dir, version, mtime_key(os.path.join(store_dir, VERSIONS)))
+
+
+# [4] 입력 매개변수 테이블 (bin_label 포함)
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _input_params(input_path, version):
+    return pd.read_csv(input_path)
+
+
+def input_params(input_path):
+    return _input_params(input_path, mtime_key(input_path))
+
+
+# [5] Granger Causality 검정표 (optimold.causality 결과)
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _granger_table(table_path, version):
+    return pd.read_csv(table_path)
+
+
+def granger_table(table_path):
+    """검정표 DataFrame, 파일이 없으면 None"""
+    if not os.path.exists(table_path):
+        return None
+    return _granger_table(table_path, mtime_key(table_path))
+
+
+# [6] 사이클 밀도 지도 (저장소 manifest가 바뀐 경우에만 신호 텐서/지도 증분 갱신 후 평활화)
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _density_maps(store_dir, tensor_dir, density_dir, rid, variables, version):
+    build_tensor(store_dir, tensor_dir, rid)
+    update_maps(tensor_dir, density_dir, rid, variables)
+    maps = {}
+    for var in variables:
+        density = load_map(var, rid, density_dir)
+        if density is not None:
+            maps[var] = {"density": smooth_density(density["counts"]), "t_edges": density["t_edges"],
+                         "v_edges": density["v_edges"], "n_cycles": len(density["cycles"])}
+    return maps
+
+
+def density_partitions(store_dir=STORE_DIR):
+    return sorted(read_manifest(store_dir)["partitions"])
+
+
+def density_maps(rid, variables, store_dir=STORE_DIR, tensor_dir=TENSOR_DIR, density_dir=DENSITY_DIR):
+    """반환값: {변수: {"density": 평활화된 (시간 × 값) 밀도, "t_edges", "v_edges", "n_cycles"}}"""
+    version = mtime_key(os.path.join(store_dir, MANIFEST))
+    return _density_maps(store_dir, tensor_dir, density_dir, rid, tuple(variables), version)
@@ -1,138 +1,77 @@
 import os
-import glob
+import argparse
 import pandas as pd
-import numpy as np
+
+from optimold.binning import AXES, discretize
+from optimold.param_extract import extract_cycles
+from optimold.param_table import is_overdue, pending_run_ids, read_processed, read_watermark, save_rows
+from optimold.result_index import query
 
 # 경로 설정
 csv_dir = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/csv_results"
 csv_path = os.path.join(csv_dir, "input_params.csv")
-os.makedirs(csv_dir, exist_ok=True)
+columns = ["run_id", "Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay", "bin_label"]
+
+def build_file_index(base_dir):
+    """결과 디렉토리를 1회만 조회하여 (변수, 'YYYYMMDD_HHMM') → 파일 경로 리스트(파일명 순) 구성"""
+    file_index = {}
+    for row in query(rid="014", csv_dir=base_dir):
+        file_index.setdefault((row["variable"], f"{row['date']}_{row['time'][:4]}"), []).append(row["path"])
+    return file_index
 
-def find_closest_file(base_dir, variable, run_id):
-    prefix = run_id[:13]  # 'YYYYMMDD_HHMM'
-    pattern = os.path.join(base_dir, f"{variable}_{prefix}??_RID014.csv")
-    candidates = glob.glob(pattern)
+def find_closest_file(file_index, variable, run_id):
+    candidates = file_index.get((variable, run_id[:13]))  # 'YYYYMMDD_HHMM'
     if not candidates:
         return None
-    return sorted(candidates)[0]
-
-def extract_param_from_csv(path, valid_time, method="mean"):
-    df = pd.read_csv(path, skiprows=1)
-    t = df.iloc[:, 0].astype(float).values
-    v = df.iloc[:, 1].astype(float).values
-    idx = (t >= valid_time[0]) & (t <= valid_time[1])
-    if not np.any(idx):
-        return np.nan
-    if method == "mean":
-        return float(np.mean(v[idx]))
-    elif method == "max":
-        return float(np.max(v[idx]))
-    elif method == "std":
-        return float(np.std(v[idx]))
-    return np.nan
-
-# ✅ Backpressure 노이즈 추정값 계산 (정규화된 평균 편차)
-def extract_backpr_noise(path, base_pressure=26.0, noise_std=0.7):
-    df = pd.read_csv(path, skiprows=1)
-    t = df.iloc[:, 0].astype(float).values
-    v = df.iloc[:, 1].astype(float).values
-    idx = (t >= backpr_noise_time[0]) & (t <= backpr_noise_time[1])
-    if not np.any(idx):
-        return np.nan
-    mean_val = np.mean(v[idx])
-    return float((mean_val - base_pressure) / noise_std)
-
-def find_24bar_time(path, valid_time):
-    df = pd.read_csv(path, skiprows=1)
-    t = df.iloc[:, 0].astype(float).values
-    v = df.iloc[:, 1].astype(float).values
-    idx = (t >= valid_time[0]) & (t <= valid_time[1])
-    t_window, v_window = t[idx], v[idx]
-    if len(t_window) < 2 or max(v_window) < 24:
-        return np.nan
-    for i in range(1, len(v_window)):
-        if v_window[i - 1] < 24 <= v_window[i]:
-            t1, t2 = t_window[i - 1], t_window[i]
-            v1, v2 = v_window[i - 1], v_window[i]
-            return t1 + (24 - v1) * (t2 - t1) / (v2 - v1)
-    return np.nan
-
-# 유효 시간대 설정
-inject_valid_time = (5.6, 5.8)
-backpr_noise_time = (0.0, 2.02)  # Backpr_amp 기준 시간대
-retract_valid_time = (2.0, 2.6)
-nozzle_valid_time = (5.6, 8.5)
-
-# run_id 추출
-input_list = sorted(glob.glob(os.path.join(csv_dir, "Inject_*_RID014.csv")))
-run_ids = [os.path.basename(f).split("_", 1)[1].replace(".csv", "") for f in input_list]
-
-inject_list, backpr_list, retract_list, nozzle_list = [], [], [], []
-valid_ids = []
-
-for run_id in run_ids:
-    inject_path = find_closest_file(csv_dir, "Inject", run_id)
-    backpr_path = find_closest_file(csv_dir, "Backpr", run_id)
-    retract_path = find_closest_file(csv_dir, "Retract", run_id)
-    nozzle_path = find_closest_file(csv_dir, "Nozzle", run_id)
-
-    if not all([inject_path, backpr_path, retract_path, nozzle_path]):
-        print(f"⚠️ 누락된 파일로 인해 제외됨: {run_id}")
-        continue
-
-    inject_val = extract_param_from_csv(inject_path, inject_valid_time, method="mean")
-    backpr_val = extract_backpr_noise(backpr_path)
-
-    # Retract_delay (보간 → 실패 시 fallback to max)
-    retract_24 = find_24bar_time(retract_path, retract_valid_time)
-    if not np.isnan(retract_24):
-        retract_val = retract_24 - 2.06
-    else:
-        retract_val = extract_param_from_csv(retract_path, retract_valid_time, method="max")
-
-    # Nozzle_delay (보간 → 실패 시 fallback to max)
-    nozzle_24 = find_24bar_time(nozzle_path, nozzle_valid_time)
-    if not np.isnan(nozzle_24):
-        nozzle_val = nozzle_24 - 5.64
-    else:
-        nozzle_val = extract_param_from_csv(nozzle_path, nozzle_valid_time, method="max")
-
-    if any(pd.isna([inject_val, backpr_val, retract_val, nozzle_val])):
-        print(f"⚠️ NaN 발생으로 제외됨: {run_id}")
-        continue
-
-    inject_list.append(inject_val)
-    backpr_list.append(backpr_val)
-    retract_list.append(retract_val)
-    nozzle_list.append(nozzle_val)
-    valid_ids.append(run_id)
-
-df_new = pd.DataFrame({
-    "run_id": valid_ids,
-    "Inject": inject_list,
-    "Backpr_amp": backpr_list,
-    "Retract_delay": retract_list,
-    "Nozzle_delay": nozzle_list
-})
-
-def compute_bin_label(row):
-    inject_bins = np.linspace(10.0, 30.0, 21)
-    backpr_bins = np.linspace(-2.0, 2.0, 21)
-    retract_bins = np.linspace(0.0, 0.5, 21)
-    nozzle_bins = np.linspace(0.0, 1.0, 21)
-
-    inject_bin = np.digitize(row["Inject"], inject_bins) - 1
-    backpr_bin = np.digitize(row["Backpr_amp"], backpr_bins) - 1
-    retract_bin = np.digitize(row["Retract_delay"], retract_bins) - 1
-    nozzle_bin = np.digitize(row["Nozzle_delay"], nozzle_bins) - 1
-
-    inject_bin = np.clip(inject_bin, 0, 19)
-    backpr_bin = np.clip(backpr_bin, 0, 19)
-    retract_bin = np.clip(retract_bin, 0, 19)
-    nozzle_bin = np.clip(nozzle_bin, 0, 19)
-
-    return f"I{inject_bin}_B{backpr_bin}_R{retract_bin}_N{nozzle_bin}"
-
-df_new["bin_label"] = df_new.apply(compute_bin_label, axis=1)
-df_new.to_csv(csv_path, index=False)
-print("✅ input_params.csv 라벨링 포함 완료.")
+    return candidates[0]
+
+def main():
+    # 실행 옵션 (기본: 워터마크 이후 신규 사이클만 추출하여 추가)
+    parser = argparse.ArgumentParser(description="input_params.csv 생성 (bin_label 포함)")
+    parser.add_argument("--full", action="store_true", help="워터마크 무시하고 전체 재생성")
+    parser.add_argument("--workers", type=int, default=None, help="추출 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    os.makedirs(csv_dir, exist_ok=True)
+    watermark = None if args.full else read_watermark(csv_path, "generate_binlabel_column", columns)
+
+    # run_id 추출 (워터마크 이후 사이클만)
+    file_index = build_file_index(csv_dir)
+    input_list = sorted(path for (var, _), paths in file_index.items() if var == "Inject" for path in paths)
+    processed = read_processed(csv_path, "generate_binlabel_column", watermark)
+    run_ids = pending_run_ids([os.path.basename(f).split("_", 1)[1].replace(".csv", "") for f in input_list],
+                              watermark, processed)
+
+    jobs = []  # 파일이 모두 있는 (run_id, 경로)
+    failed = []  # 처리 완료지만 행이 없는 run_id (영구 누락 / 읽기 실패 / NaN)
+    for run_id in run_ids:
+        paths = {var: find_closest_file(file_index, var, run_id) for var in ("Inject", "Backpr", "Retract", "Nozzle")}
+        if not all(paths.values()):
+            if is_overdue(paths.values()):
+                print(f"⚠️ 누락된 파일로 인해 제외됨: {run_id}")
+                failed.append(run_id)
+            continue  # 아직 도착 중이면 다음 실행에서 재검사
+        jobs.append((run_id, paths))
+
+    # 사이클별 매개변수 일괄 추출 (파일당 1회 로딩, 프로세스 풀)
+    results = extract_cycles([paths for _, paths in jobs], n_workers=args.workers)
+
+    rows = []
+    for (run_id, _), params in zip(jobs, results):
+        if any(pd.isna(list(params.values()))):
+            print(f"⚠️ NaN 발생으로 제외됨: {run_id}")
+            failed.append(run_id)
+            continue
+        rows.append({"run_id": run_id, **params})
+
+    df_new = pd.DataFrame(rows, columns=columns[:-1])
+    _, df_new["bin_label"] = discretize(df_new[AXES].to_numpy())
+
+    # 저장 (증분 실행이면 기존 테이블 뒤에 추가)
+    # 워터마크는 연속으로 처리 완료(저장/실패)된 run_id까지만 이동 → 파일이 덜 도착한 가장 이른 사이클부터 다음 실행에서 재검사
+    n_saved = save_rows(csv_path, df_new[columns], "generate_binlabel_column", watermark, run_ids, failed)
+    print(f"✅ input_params.csv 라벨링 포함 완료. (신규 {n_saved}행, 검사 {len(run_ids)}개 사이클)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,36 @@
 import pandas as pd
 import os
-import glob
-import re
+import argparse
 import numpy as np
 
+from optimold.param_table import is_overdue, pending_run_ids, read_processed, read_watermark, save_rows
+from optimold.result_index import files_by_cycle
+
+# [0] 실행 옵션 (기본: 워터마크 이후 신규 사이클만 추출하여 추가)
+parser = argparse.ArgumentParser(description="input_params.csv 생성")
+parser.add_argument("--full", action="store_true", help="워터마크 무시하고 전체 재생성")
+args = parser.parse_args()
+
 # [1] 경로 설정
 csv_dir = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/csv_results"
 save_path = os.path.join(csv_dir, "input_params.csv")
 os.makedirs(csv_dir, exist_ok=True)
+columns = ["run_id", "Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay"]
+watermark = None if args.full else read_watermark(save_path, "generate_input_params", columns)
 
-# [2] run_id 그룹핑 (분 단위로 식별)
-pattern = re.compile(r"_(\d{8})_(\d{6})_RID014")
-run_id_map = {}
-all_files = glob.glob(os.path.join(csv_dir, "*.csv"))
-for f in all_files:
-    match = pattern.search(os.path.basename(f))
-    if match:
-        date, time = match.groups()
-        run_id = f"{date}_{time[:4]}_RID014"
-        run_id_map.setdefault(run_id, []).append(f)
+# [2] run_id 그룹핑 (분 단위로 식별, 결과 색인 조회) → 워터마크 이후 사이클만 선택
+run_id_map = {run_id: list(files.values()) for run_id, files in files_by_cycle(rid="014", csv_dir=csv_dir).items()}
+pending = pending_run_ids(run_id_map, watermark, read_processed(save_path, "generate_input_params", watermark))
 
 # [3] 입력값 추출
-records = []
-for run_id, files in run_id_map.items():
+# 파일이 덜 도착한 사이클은 미완료(다음 실행에서 재검사), 추출 중 예외/결측은 실패(재시도해도 같으므로 처리 완료)
+records, failed = [], []
+for run_id in pending:
+    files = run_id_map[run_id]
+    if not all(any(var in f.lower() for f in files) for var in ("inject", "backpr", "retract", "nozzle")):
+        if is_overdue(files):
+            failed.append(run_id)
+        continue
     entry = {"run_id": run_id}
     try:
         # Inject
@@ -56,13 +64,17 @@ for run_id, files in run_id_map.items():
             delay_time = nozzle_df.iloc[delay_index, 0]
             entry["Nozzle_delay"] = np.clip(delay_time - 2.0, 0, 1.5)
 
-        if len(entry) == 5:
+        if len(entry) == 5 and not pd.isna(list(entry.values())).any():
             records.append(entry)
+        else:
+            failed.append(run_id)
     except Exception:
-        continue
+        failed.append(run_id)  # 예: 노즐 신호가 한 번도 양수가 아닌 사이클 (iloc[NaN])
 
-# [4] 정렬 및 저장
-df = pd.DataFrame(records)
+# [4] 정렬 및 저장 (증분 실행이면 기존 테이블 뒤에 추가)
+# 워터마크는 연속으로 처리 완료(저장/실패)된 사이클까지만 이동 → 파일이 덜 도착한 가장 이른 사이클부터 다음 실행에서 재검사
+df = pd.DataFrame(records, columns=columns)
 df = df.sort_values(by="run_id").reset_index(drop=True)  # ✅ run_id 기준 정렬
-df.to_csv(save_path, index=False)
-print(f"[✓] Saved {len(df)} entries to {save_path}")
+n_saved = save_rows(save_path, df, "generate_input_params", watermark, pending, failed)
+mode = "appended" if watermark is not None else "saved"
+print(f"[✓] {mode.capitalize()} {n_saved} entries ({len(pending)} new cycles scanned, {len(failed)} failed) to {save_path}")
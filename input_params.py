@@ -2,25 +2,17 @@
 
 import pandas as pd
 import os
-import glob
-import re
 import numpy as np
 
+from optimold.result_index import files_by_cycle
+
 # [1] 경로 설정
 csv_dir = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/csv_results"
 save_path = os.path.join(csv_dir, "input_params.csv")
 os.makedirs(csv_dir, exist_ok=True)
 
-# [2] run_id 그룹핑 (분 단위로 식별)
-pattern = re.compile(r"_(\d{8})_(\d{6})_RID014")
-run_id_map = {}
-all_files = glob.glob(os.path.join(csv_dir, "*.csv"))
-for f in all_files:
-    match = pattern.search(os.path.basename(f))
-    if match:
-        date, time = match.groups()
-        run_id = f"{date}_{time[:4]}_RID014"
-        run_id_map.setdefault(run_id, []).append(f)
+# [2] run_id 그룹핑 (분 단위로 식별, 결과 색인 조회)
+run_id_map = {run_id: list(files.values()) for run_id, files in files_by_cycle(rid="014", csv_dir=csv_dir).items()}
 
 # [3] 입력값 추출
 records = []
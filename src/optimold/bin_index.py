@@ -0,0 +1,104 @@
+# src/optimold/bin_index.py
+
+"""
+bin_label 정수 인코딩 및 최근접 공정 탐색 색인 (Process Prediction)
+
+- bin_label "I7_B1_R0_N13" → 축별 bin 번호 (N, 4) uint8 → 단일 uint32 코드 (축당 8bit, optimold.binning)
+  (문자열 파싱은 색인 생성 시 1회만 수행)
+- top_k_bins: bin 격자 위 맨해튼(L1) 거리 기준 상위 k개 run
+  · 서로 다른 bin 셀(최대 20^4개)만으로 cKDTree(p=1)를 만들어 탐색 후 셀에 속한 run으로 확장
+  · 거리 동률이면 input_params 행 순서가 빠른 run 우선 (기존 DataFrame.nsmallest와 동일)
+- nearest_runs: 연속값 (Inject, Backpr_amp, Retract_delay, Nozzle_delay)을 bin 폭으로 나눈 공간의 L1 최근접
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from optimold.binning import AXES, bin_widths, pack_codes, unpack_codes
+
+LABEL_PATTERN = r"^I(\d+)_B(\d+)_R(\d+)_N(\d+)$"
+
+# 축별 bin 폭 (optimold.binning 기본 구간 기준)
+AXIS_WIDTH = bin_widths()
+
+
+def parse_bin_labels(labels):
+    """bin_label 문자열 배열 → (N, 4) uint8 bin 번호 (벡터화 정규식 1회)"""
+    parts = pd.Series(labels, dtype=str).str.extract(LABEL_PATTERN)
+    if parts.isna().any().any():
+        bad = pd.Series(labels)[parts.isna().any(axis=1).to_numpy()].iloc[0]
+        raise ValueError(f"bin_label 형식 오류: {bad}")
+    return parts.to_numpy(dtype=np.uint8)
+
+
+def parse_bin_label(label):
+    """bin_label 1개 → (4,) uint8 bin 번호 (조회 입력용, pandas 경유 없음)"""
+    match = re.match(LABEL_PATTERN, label)
+    if not match:
+        raise ValueError(f"bin_label 형식 오류: {label}")
+    return np.array(match.groups(), dtype=np.uint8)
+
+
+class BinIndex:
+    """input_params(bin_label 포함) DataFrame으로 1회 생성하여 재사용하는 탐색 색인"""
+
+    def __init__(self, df):
+        self.run_ids = df["run_id"].to_numpy()
+        self.bins = parse_bin_labels(df["bin_label"])
+        self.codes = pack_codes(self.bins)
+
+        # bin 셀 단위 그룹: 셀 → 행 번호(오름차순)
+        self.cells, inverse = np.unique(self.codes, return_inverse=True)
+        self._cell_rows = np.argsort(inverse, kind="stable")
+        self._cell_start = np.searchsorted(inverse[self._cell_rows], np.arange(len(self.cells) + 1))
+        self._cell_tree = cKDTree(unpack_codes(self.cells).astype(float))
+
+        values = df[AXES].to_numpy(dtype=float) / AXIS_WIDTH
+        self._value_tree = cKDTree(values)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _rows_of_cells(self, cell_ids):
+        cell_ids = np.atleast_1d(cell_ids)
+        return np.concatenate([self._cell_rows[self._cell_start[c]:self._cell_start[c + 1]] for c in cell_ids])
+
+    def rows_with_label(self, label):
+        """bin_label이 정확히 일치하는 행 번호 (오름차순)"""
+        code = pack_codes(parse_bin_label(label)[None])[0]
+        pos = np.searchsorted(self.cells, code)
+        if pos == len(self.cells) or self.cells[pos] != code:
+            return np.empty(0, dtype=np.intp)
+        return self._rows_of_cells(pos)
+
+    def top_k_bins(self, label, k=3):
+        """
+        bin 격자 L1 거리 기준 상위 k개 행
+        반환값: (행 번호 배열, 정수 거리 배열) — 거리, 행 번호 순 정렬
+        """
+        if len(self.cells) == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=int)
+        target = parse_bin_label(label).astype(float)
+
+        # k번째로 가까운 셀까지의 거리 안에 상위 k개 행이 모두 포함됨 → 그 반경의 셀만 후보로 확장
+        k_cells = min(k, len(self.cells))
+        dist, _ = self._cell_tree.query(target, k=k_cells, p=1)
+        radius = np.atleast_1d(dist)[-1]
+        cell_ids = self._cell_tree.query_ball_point(target, r=radius + 1e-9, p=1)
+
+        rows = self._rows_of_cells(cell_ids)
+        distances = np.abs(self.bins[rows].astype(int) - target.astype(int)).sum(axis=1)
+        order = np.lexsort((rows, distances))[:k]
+        return rows[order], distances[order]
+
+    def nearest_runs(self, input_vec, k=3):
+        """
+        연속 입력값 기준 최근접 k개 행 (bin 폭 단위 L1 거리)
+        반환값: (행 번호 배열, 거리 배열)
+        """
+        k = min(k, len(self.codes))
+        dist, rows = self._value_tree.query(np.asarray(input_vec, dtype=float) / AXIS_WIDTH, k=k, p=1)
+        return np.atleast_1d(rows), np.atleast_1d(dist)
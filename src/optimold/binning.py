@@ -0,0 +1,79 @@
+# src/optimold/binning.py
+
+"""
+입력 매개변수 이산화(binning) 공용 모듈
+
+- 축: Inject, Backpr_amp, Retract_delay, Nozzle_delay
+- 기본 구간: Inject 10~30 / Backpr_amp -2~2 / Retract_delay 0~0.5 / Nozzle_delay 0~1, 축당 20개 구간
+- bin 번호 = np.digitize(값, 경계) - 1 을 [0, n_bins - 1]로 클리핑 (범위 밖 값은 양 끝 bin)
+- bin 코드: 축당 8bit를 묶은 uint32 (I<<24 | B<<16 | R<<8 | N), 라벨: "I7_B1_R0_N13"
+- (N, 4) 배열 전체를 축별 np.digitize 1회로 처리 (행 단위 apply 없음)
+"""
+
+import numpy as np
+
+AXES = ["Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay"]
+LABEL_PREFIXES = ["I", "B", "R", "N"]
+AXIS_RANGES = [(10.0, 30.0), (-2.0, 2.0), (0.0, 0.5), (0.0, 1.0)]
+N_BINS = 20
+
+
+def _per_axis(n_bins):
+    n_bins = np.broadcast_to(np.asarray(n_bins, dtype=int), (len(AXES),))
+    if np.any(n_bins < 1) or np.any(n_bins > 256):
+        raise ValueError("축별 bin 개수는 1 ~ 256 이어야 합니다 (축당 8bit 코드).")
+    return n_bins
+
+
+def bin_edges(n_bins=N_BINS, ranges=AXIS_RANGES):
+    """축별 bin 경계 리스트 (n_bins: 정수 또는 축별 4개)"""
+    return [np.linspace(lo, hi, n + 1) for (lo, hi), n in zip(ranges, _per_axis(n_bins))]
+
+
+def bin_widths(n_bins=N_BINS, ranges=AXIS_RANGES):
+    """축별 bin 폭 (4,)"""
+    return np.array([(hi - lo) / n for (lo, hi), n in zip(ranges, _per_axis(n_bins))])
+
+
+def bin_indices(params, n_bins=N_BINS, ranges=AXIS_RANGES):
+    """
+    (N, 4) 매개변수 배열 → (N, 4) bin 번호 (uint8)
+    - params 열 순서는 AXES와 동일 (DataFrame이면 df[AXES] 전달)
+    """
+    params = np.asarray(params, dtype=float).reshape(-1, len(AXES))
+    bins = np.empty(params.shape, dtype=np.uint8)
+    for axis, (edges, n) in enumerate(zip(bin_edges(n_bins, ranges), _per_axis(n_bins))):
+        bins[:, axis] = np.clip(np.digitize(params[:, axis], edges, right=False) - 1, 0, n - 1)
+    return bins
+
+
+def pack_codes(bins):
+    """(N, 4) bin 번호 → uint32 코드 (I<<24 | B<<16 | R<<8 | N)"""
+    bins = np.asarray(bins, dtype=np.uint32)
+    return (bins[:, 0] << 24) | (bins[:, 1] << 16) | (bins[:, 2] << 8) | bins[:, 3]
+
+
+def unpack_codes(codes):
+    """uint32 코드 → (N, 4) uint8 bin 번호"""
+    codes = np.asarray(codes, dtype=np.uint32)
+    return np.stack([(codes >> s) & 0xFF for s in (24, 16, 8, 0)], axis=1).astype(np.uint8)
+
+
+def format_bin_label(bins):
+    return "_".join(f"{p}{int(b)}" for p, b in zip(LABEL_PREFIXES, bins))
+
+
+def code_labels(codes):
+    """uint32 코드 배열 → bin_label 문자열 배열 (서로 다른 코드만 문자열로 만든 뒤 인덱싱)"""
+    uniq, inverse = np.unique(np.asarray(codes, dtype=np.uint32), return_inverse=True)
+    labels = np.array([format_bin_label(b) for b in unpack_codes(uniq)], dtype=object)
+    return labels[inverse.reshape(-1)]
+
+
+def discretize(params, n_bins=N_BINS, ranges=AXIS_RANGES):
+    """
+    (N, 4) 매개변수 배열 일괄 이산화
+    반환값: (uint32 bin 코드 (N,), bin_label 문자열 배열 (N,))
+    """
+    codes = pack_codes(bin_indices(params, n_bins, ranges))
+    return codes, code_labels(codes)
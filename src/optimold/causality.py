@@ -0,0 +1,137 @@
+# src/optimold/causality.py
+
+"""
+Granger Causality 일괄 분석 엔진 (제어 입력 5 × 공정 출력 5)
+
+- 입력: 정렬된 신호 텐서(optimold.signal_tensor)의 (cycles, signals, samples) memmap → CSV 재파싱/복사 없음
+- 지연(lag) 설계 행렬은 사이클마다 따로 구성 → 사이클 경계를 넘는 지연 샘플 없음
+  (기존 노트북은 사이클을 이어 붙여 경계에서 가짜 지연 관계가 생겼음)
+- 검정: statsmodels grangercausalitytests의 ssr F-test와 같은 정의
+  · 제한 모형:   y_t ~ 1 + y_{t-1..p}
+  · 비제한 모형: y_t ~ 1 + y_{t-1..p} + x_{t-1..p}
+  · F = ((RSS_r - RSS_u) / p) / (RSS_u / (N - 2p - 1))
+- 최소제곱: 출력 1개에 대해 제어 입력 5개의 설계 행렬 [1, y 지연, x 지연, y]를 묶어 배치 QR
+  사이클별 R 인자를 쌓아 다시 QR (TSQR) → R의 마지막 열에서 두 모형의 RSS를 동시에 얻음
+- 작업 단위 = 공정 출력 1개 (25쌍 × 지연), 프로세스 풀에서 워커가 텐서 파일을 직접 mmap으로 읽음
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from optimold.result_files import CSV_DIR
+from optimold.signal_tensor import TENSOR_DIR, build_tensor, open_tensor
+
+CONTROLS = ["Inject", "Backpr", "Nozzle", "Retract", "Extruder"]
+OUTPUTS = ["Piston_Position", "Piston_Pressure", "Piston_Velocity", "Flow_Rate", "Volume"]
+TABLE_COLUMNS = ["control", "output", "lag", "F", "p_value", "df_num", "df_denom", "n_obs"]
+
+RANK_TOL = 1e-10
+
+
+def lag_design(y, xs, p):
+    """
+    사이클 1개의 배치 설계 행렬
+    - y: (T,) 출력, xs: (n_x, T) 제어 입력
+    반환값: (n_x, T - p, 2p + 2) = [1, y_{t-1..p}, x_{t-1..p}, y_t]
+    """
+    n_x, T = xs.shape
+    rows = T - p
+    out = np.empty((n_x, rows, 2 * p + 2))
+    out[:, :, 0] = 1.0
+    for lag in range(1, p + 1):
+        out[:, :, lag] = y[p - lag:T - lag]
+        out[:, :, p + lag] = xs[:, p - lag:T - lag]
+    out[:, :, -1] = y[p:]
+    return out
+
+
+def granger_rss(ys, xs, p):
+    """
+    여러 사이클을 합친 Granger 회귀
+    - ys: (n_cycles, T), xs: 제어 입력별 (n_cycles, T) 배열/뷰 리스트 (사이클 단위로만 읽음)
+    반환값: (RSS_r (n_x,), RSS_u (n_x,), 유효 x 지연 수 (n_x,), 관측치 수 N)
+    """
+    k = 2 * p + 1
+    r_blocks = []
+    n_obs = 0
+    for i in range(ys.shape[0]):
+        y = np.asarray(ys[i], dtype=float)
+        x = np.array([xv[i] for xv in xs], dtype=float)
+        r_blocks.append(np.linalg.qr(lag_design(y, x, p), mode="r"))
+        n_obs += y.shape[0] - p
+    R = np.linalg.qr(np.concatenate(r_blocks, axis=1), mode="r")  # (n_x, k + 1, k + 1)
+
+    # x 지연 열이 앞선 열과 선형 종속(예: 상수 입력)이면 해당 성분은 잡음 방향이므로 제외
+    col_norm = np.linalg.norm(R[:, :, p + 1:k], axis=1)
+    diag = np.abs(np.diagonal(R, axis1=1, axis2=2)[:, p + 1:k])
+    independent = diag > RANK_TOL * np.maximum(col_norm, np.finfo(float).tiny)
+
+    x_part = np.where(independent, R[:, p + 1:k, k], 0.0)
+    rss_u = R[:, k, k] ** 2 + np.sum(np.where(independent, 0.0, R[:, p + 1:k, k]) ** 2, axis=1)
+    rss_r = rss_u + np.sum(x_part ** 2, axis=1)
+    return rss_r, rss_u, independent.sum(axis=1), n_obs
+
+
+def _output_table(tensor_dir, rid, output, controls, maxlag, stride):
+    """워커: 공정 출력 1개 × 제어 입력 전체 × 지연 1..maxlag 검정표"""
+    tensor = open_tensor(rid, tensor_dir)
+    ys = tensor.signal(output)[:, ::stride]
+    xs = [tensor.signal(var)[:, ::stride] for var in controls]
+
+    rows = []
+    for p in range(1, maxlag + 1):
+        rss_r, rss_u, df_num, n_obs = granger_rss(ys, xs, p)
+        df_denom = n_obs - 2 * p - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f_stat = np.where(df_num > 0, ((rss_r - rss_u) / np.maximum(df_num, 1)) / (rss_u / df_denom), np.nan)
+        p_value = stats.f.sf(f_stat, np.maximum(df_num, 1), df_denom)
+        for j, control in enumerate(controls):
+            rows.append((control, output, p, f_stat[j], p_value[j], int(df_num[j]), df_denom, n_obs))
+    return rows
+
+
+def granger_table(tensor_dir=TENSOR_DIR, rid="RID014", controls=CONTROLS, outputs=OUTPUTS,
+                  maxlag=5, stride=1, n_workers=None):
+    """
+    제어 입력 → 공정 출력 Granger 검정표 (tidy)
+    - 컬럼: control, output, lag, F, p_value, df_num, df_denom, n_obs
+    - stride: 공통 시간축(1ms) 샘플 간격 (지연 1 = stride ms)
+    - n_workers: 프로세스 수 (None이면 CPU 수, 1 이하면 순차 처리)
+    """
+    tasks = list(outputs)
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers <= 1 or len(tasks) <= 1:
+        blocks = [_output_table(tensor_dir, rid, out, controls, maxlag, stride) for out in tasks]
+    else:
+        n = len(tasks)
+        with ProcessPoolExecutor(max_workers=min(n_workers, n)) as executor:
+            blocks = list(executor.map(_output_table, [tensor_dir] * n, [rid] * n, tasks,
+                                       [list(controls)] * n, [maxlag] * n, [stride] * n))
+    return pd.DataFrame([row for block in blocks for row in block], columns=TABLE_COLUMNS)
+
+
+def causal_edges(table, alpha=0.05):
+    """
+    검정표 → 네트워크 간선 [(제어 입력, 공정 출력, 강도)] (검정표의 제어/출력 순서 유지)
+    - strong: 모든 지연에서 p < alpha, weak: 일부 지연에서만 유의, uncertain: 유의한 지연 없음
+    """
+    edges = []
+    for (control, output), group in table.groupby(["control", "output"], sort=False):
+        n_sig = int((group["p_value"] < alpha).sum())
+        strength = "strong" if n_sig == len(group) else "weak" if n_sig > 0 else "uncertain"
+        edges.append((control, output, strength))
+    return edges
+
+
+if __name__ == "__main__":
+    out_path = os.path.join(os.path.dirname(CSV_DIR), "granger_table.csv")
+    build_tensor(rid="RID014")
+    table = granger_table()
+    table.to_csv(out_path, index=False)
+    for control, output, strength in causal_edges(table):
+        print(f"  {control:>8} → {output:<16} {strength}")
+    print(f"[✓] Granger 검정표 {len(table)}행 저장 완료 → {out_path}")
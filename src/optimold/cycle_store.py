@@ -0,0 +1,305 @@
+# src/optimold/cycle_store.py
+
+"""
+사이클 단위 컬럼형 저장소 (chunked .npy + manifest)
+
+csv_results에 사이클당 10개씩 쌓이는 CSV를 한 번만 파싱하여
+RID별 파티션 / 청크별 변수 배열로 압축 보관
+
+    store_dir/
+      manifest.json                  # 시간축, 파티션별 청크 목록과 사이클 키
+      time.npy                       # 공통 시간축 (T,)
+      RID014/chunk_00000/Volume.npy  # (청크 사이클 수, T) — 변수당 파일 1개
+      RID014/chunk_00000/...
+
+- 모든 신호는 공통 고정 시간축(기본 0~10초, 1ms)으로 보간되어 사이클 내/사이클 간 정렬됨
+- 압축(compact)은 manifest에 없는 '완전한' 사이클(10개 변수 모두 존재)만 새 청크로 추가 (append-only)
+- append_cycles는 수집 데몬이 이미 파싱한 사이클 묶음을 같은 방식으로 새 청크에 추가
+  파티션 끝의 작은 청크가 쌓이면 chunk_size 이하로 병합 (사이클 순서 유지)
+- 쓰기는 store_lock(파일 잠금) 안에서 manifest를 다시 읽고 청크 이름(next_chunk 카운터)을 할당
+  → 압축 DAG와 수집 데몬이 동시에 써도 안전, 읽기는 잠금 없이 manifest 기준
+- load_signal은 청크 파일을 mmap으로 열어 변수 1개의 전체 사이클을 한 번에 반환
+"""
+
+import json
+import os
+import shutil
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from optimold.result_files import CSV_DIR, VARIABLES, parse_result_filename, read_signal_csv, resample
+
+STORE_DIR = os.path.join(os.path.dirname(CSV_DIR), "cycle_store")
+MANIFEST = "manifest.json"
+LOCK_FILE = ".lock"
+MAX_SMALL_CHUNKS = 16
+RETIRE_GRACE = 300.0  # 병합으로 교체된 청크 디렉토리 보존 시간(초)
+
+
+def make_time_grid(t_end=10.0, dt=1e-3):
+    return np.round(np.arange(0.0, t_end + dt / 2, dt), 9)
+
+
+def read_manifest(store_dir=STORE_DIR):
+    path = os.path.join(store_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {"version": 0, "t_end": 10.0, "dt": 1e-3, "partitions": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, MANIFEST)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)  # 원자적 교체: 읽는 쪽은 항상 완전한 manifest만 봄
+
+
+def stored_cycles(manifest, rid=None):
+    """manifest에 기록된 사이클 키 목록 (rid 지정 시 해당 파티션만)"""
+    parts = manifest["partitions"]
+    keys = [rid] if rid is not None else sorted(parts)
+    return [c for p in keys for chunk in parts.get(p, []) for c in chunk["cycles"]]
+
+
+def group_cycle_files(csv_dir=CSV_DIR, fnames=None):
+    """
+    결과 디렉토리를 한 번만 훑어 {사이클 키: {변수: 파일 경로}} 구성
+    같은 사이클/변수에 파일이 여러 개면 가장 이른 파일 사용
+    """
+    if fnames is None:
+        fnames = os.listdir(csv_dir)
+    cycles = defaultdict(dict)
+    for fname in sorted(fnames):
+        info = parse_result_filename(fname)
+        if info is None:
+            continue
+        cycles[info["cycle"]].setdefault(info["variable"], os.path.join(csv_dir, fname))
+    return dict(cycles)
+
+
+def compact(csv_dir=CSV_DIR, store_dir=STORE_DIR, chunk_size=256, t_end=10.0, dt=1e-3):
+    """
+    csv_results의 신규 완전 사이클을 저장소에 청크 단위로 추가
+    반환값: 새로 추가된 사이클 키 리스트
+    """
+    grid = _store_grid(store_dir, t_end, dt)
+    done = set(stored_cycles(read_manifest(store_dir)))
+    pending = defaultdict(list)
+    for key, files in sorted(group_cycle_files(csv_dir).items()):
+        if key in done or len(files) < len(VARIABLES):
+            continue  # 이미 저장됐거나 아직 일부 변수만 도착한 사이클
+        pending[key.rsplit("_", 1)[1]].append((key, files))
+
+    added = []
+    for rid, items in sorted(pending.items()):
+        for lo in range(0, len(items), chunk_size):
+            part = items[lo:lo + chunk_size]
+            arrays = {}
+            for var in VARIABLES:  # CSV 파싱은 잠금 밖에서 (청크 1개 분량만 메모리에 유지)
+                arrays[var] = np.empty((len(part), len(grid)))
+                for i, (_, files) in enumerate(part):
+                    arrays[var][i] = resample(*read_signal_csv(files[var]), grid)
+            added += _commit_chunk(store_dir, rid, [key for key, _ in part], arrays, t_end, dt, chunk_size)
+    print(f"[✓] 사이클 저장소 압축 완료: 신규 {len(added)}개 → {store_dir}")
+    return added
+
+
+def append_cycles(cycles, store_dir=STORE_DIR, t_end=10.0, dt=1e-3, chunk_size=256, max_small=MAX_SMALL_CHUNKS):
+    """
+    이미 파싱/보간된 사이클을 RID별 새 청크 1개로 추가 (수집 데몬 optimold.ingest 용)
+    - cycles: {사이클 키: {변수: (T,) 배열}} (T = 저장소 시간축 길이, 10개 변수 모두 필요)
+    - 작은 청크가 max_small개 쌓이면 chunk_size 이하 청크로 병합 (consolidate)
+    반환값: 새로 추가된 사이클 키 리스트 (이미 저장된 키는 건너뜀)
+    """
+    grid = _store_grid(store_dir, t_end, dt)
+    pending = defaultdict(list)
+    for key, signals in sorted(cycles.items()):
+        missing = [var for var in VARIABLES if var not in signals]
+        if missing:
+            raise ValueError(f"{key}: 누락 변수 {missing}")
+        pending[key.rsplit("_", 1)[1]].append((key, signals))
+
+    added = []
+    for rid, items in sorted(pending.items()):
+        arrays = {var: np.stack([np.asarray(signals[var], dtype=float) for _, signals in items])
+                  for var in VARIABLES}
+        if arrays[VARIABLES[0]].shape[1] != len(grid):
+            raise ValueError(f"시간축 길이 불일치 ({arrays[VARIABLES[0]].shape[1]} != {len(grid)})")
+        added += _commit_chunk(store_dir, rid, [key for key, _ in items], arrays, t_end, dt, chunk_size, max_small)
+    return added
+
+
+@contextmanager
+def store_lock(store_dir=STORE_DIR):
+    """
+    저장소 쓰기 잠금 (프로세스 간): manifest 읽기 → 청크 이름 할당/쓰기 → manifest 교체를 한 번에 수행
+    압축 DAG(compact)와 수집 데몬(append_cycles)이 동시에 실행돼도 청크 이름 충돌/manifest 갱신 유실 없음
+    읽는 쪽(load_signal 등)은 원자적으로 교체되는 manifest만 보므로 잠그지 않음
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, LOCK_FILE), "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _next_chunk_name(manifest):
+    """저장소 전체에서 한 번도 쓰이지 않은 청크 이름 (manifest의 next_chunk 카운터, 잠금 안에서 호출)"""
+    if "next_chunk" not in manifest:  # 카운터 이전 형식: 기존 청크 번호 다음부터
+        used = [int(c["chunk"].split("_")[1]) for chunks in manifest["partitions"].values() for c in chunks]
+        used += [int(os.path.basename(path).split("_")[1]) for path, _ in manifest.get("retired", [])]
+        manifest["next_chunk"] = max(used, default=-1) + 1
+    name = f"chunk_{manifest['next_chunk']:05d}"
+    manifest["next_chunk"] += 1
+    return name
+
+
+def _write_chunk(store_dir, rid, name, arrays):
+    chunk_dir = os.path.join(store_dir, rid, name)
+    os.makedirs(chunk_dir, exist_ok=True)
+    for var in VARIABLES:
+        np.save(os.path.join(chunk_dir, f"{var}.npy"), arrays[var])
+
+
+def _commit_chunk(store_dir, rid, keys, arrays, t_end, dt, chunk_size=256, max_small=None):
+    """
+    잠금 안에서 manifest를 다시 읽어 아직 없는 사이클만 새 청크로 추가 후 manifest 교체
+    - max_small 지정 시 파티션 끝의 작은 청크를 병합
+    반환값: 추가된 사이클 키 리스트
+    """
+    with store_lock(store_dir):
+        manifest = read_manifest(store_dir)
+        if manifest["version"] == 0:
+            manifest.update({"t_end": t_end, "dt": dt})
+        done = set(stored_cycles(manifest, rid))
+        rows = [i for i, key in enumerate(keys) if key not in done]  # 다른 쪽이 먼저 저장한 사이클 제외
+        if not rows:
+            return []
+
+        name = _next_chunk_name(manifest)
+        _write_chunk(store_dir, rid, name, {var: arrays[var][rows] for var in VARIABLES})
+        added = [keys[i] for i in rows]
+        manifest["partitions"].setdefault(rid, []).append({"chunk": name, "n": len(added), "cycles": added})
+        if max_small is not None:
+            _consolidate(store_dir, manifest, rid, chunk_size, max_small)
+        _remove_retired(store_dir, manifest)
+        manifest["version"] += 1
+        _write_manifest(store_dir, manifest)
+        return added
+
+
+def _consolidate(store_dir, manifest, rid, chunk_size, max_small):
+    """
+    파티션 끝에 연속된 작은 청크(n < chunk_size)가 max_small개 이상이면 순서대로 chunk_size 이하로 묶어 다시 씀
+    → 수집 데몬이 2초마다 사이클 몇 개씩 추가해도 청크 파일 수는 (사이클 수 / chunk_size + max_small) 수준 유지
+    기존 청크 디렉토리는 retired에 기록 후 RETIRE_GRACE초 뒤 삭제 (이전 manifest로 읽는 중인 쪽 보호)
+    """
+    chunks = manifest["partitions"][rid]
+    start = len(chunks)
+    while start > 0 and chunks[start - 1]["n"] < chunk_size:
+        start -= 1
+    small = chunks[start:]
+    if len(small) < max_small:
+        return
+
+    merged, group = [], []
+    for chunk in small + [None]:
+        if chunk is None or (group and sum(c["n"] for c in group) + chunk["n"] > chunk_size):
+            name = _next_chunk_name(manifest)
+            arrays = {var: np.concatenate([np.load(os.path.join(store_dir, rid, c["chunk"], f"{var}.npy"))
+                                           for c in group]) for var in VARIABLES}
+            _write_chunk(store_dir, rid, name, arrays)
+            keys = [key for c in group for key in c["cycles"]]
+            merged.append({"chunk": name, "n": len(keys), "cycles": keys})
+            group = []
+        if chunk is not None:
+            group.append(chunk)
+
+    now = time.time()
+    manifest.setdefault("retired", []).extend([os.path.join(rid, c["chunk"]), now] for c in small)
+    manifest["partitions"][rid] = chunks[:start] + merged
+
+
+def _remove_retired(store_dir, manifest):
+    now = time.time()
+    keep = []
+    for path, retired_at in manifest.get("retired", []):
+        if now - retired_at < RETIRE_GRACE:
+            keep.append([path, retired_at])
+        else:
+            shutil.rmtree(os.path.join(store_dir, path), ignore_errors=True)
+    manifest["retired"] = keep
+
+
+def _store_grid(store_dir, t_end, dt):
+    """저장소 시간축 (기존 저장소는 manifest의 시간축 설정 유지, time.npy가 없으면 생성)"""
+    manifest = read_manifest(store_dir)
+    if manifest["version"] > 0:
+        t_end, dt = manifest["t_end"], manifest["dt"]
+    grid = make_time_grid(t_end, dt)
+    path = os.path.join(store_dir, "time.npy")
+    if not os.path.exists(path):
+        os.makedirs(store_dir, exist_ok=True)
+        np.save(path, grid)
+    return grid
+
+
+def load_time(store_dir=STORE_DIR):
+    return np.load(os.path.join(store_dir, "time.npy"))
+
+
+def load_signal(variable, store_dir=STORE_DIR, rid=None, mmap=True):
+    """
+    변수 1개의 전체 사이클 로딩 (파일 수천 개 대신 청크 파일 몇 개만 열람)
+    반환값: (사이클 키 리스트, (n_cycles, T) 배열)
+    """
+    manifest = read_manifest(store_dir)
+    parts = [rid] if rid is not None else sorted(manifest["partitions"])
+    keys, arrays = [], []
+    for p in parts:
+        for chunk in manifest["partitions"].get(p, []):
+            path = os.path.join(store_dir, p, chunk["chunk"], f"{variable}.npy")
+            arrays.append(np.load(path, mmap_mode="r" if mmap else None))
+            keys.extend(chunk["cycles"])
+    if not arrays:
+        return [], np.empty((0, 0))
+    data = arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+    return keys, data
+
+
+def load_cycle(cycle, store_dir=STORE_DIR, variables=VARIABLES):
+    """사이클 1개의 변수별 시계열 {변수: (T,) 배열} 로딩, 없으면 None"""
+    manifest = read_manifest(store_dir)
+    rid = cycle.rsplit("_", 1)[1]
+    for chunk in manifest["partitions"].get(rid, []):
+        if cycle in chunk["cycles"]:
+            row = chunk["cycles"].index(cycle)
+            chunk_dir = os.path.join(store_dir, rid, chunk["chunk"])
+            return {var: np.array(np.load(os.path.join(chunk_dir, f"{var}.npy"), mmap_mode="r")[row])
+                    for var in variables}
+    return None
+
+
+if __name__ == "__main__":
+    compact()
@@ -0,0 +1,114 @@
+# src/optimold/cycle_tracker.py
+
+"""
+사이클 완결성 증분 추적기 (Monitoring 탭)
+
+- 폴링 커서: 결과 색인(optimold.result_index) files 테이블의 seq (AUTOINCREMENT, 번호 재사용 없음)
+  → poll()마다 색인을 갱신(디렉토리 변경 없으면 스캔 생략)하고 커서 이후 새로 등록된 행만 읽음
+- 사이클(분 단위 태그 YYYYMMDD_HHMM)마다 도착한 변수를 비트마스크로 누적
+- 감시 변수 중 도착 수에 따라 분류: 4개 전부 = 완전, 3개 이상 = 성공, 1~2개 = 누락 의심(ambiguous)
+  분류별 개수는 마스크가 바뀔 때만 증감하므로 조회는 O(1)
+- 결과 파일은 append-only로 가정 (삭제된 파일은 반영하지 않음)
+"""
+
+import os
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+
+from optimold.result_files import CSV_DIR, VARIABLES
+from optimold.result_index import INDEX_PATH, connect, refresh
+
+MONITORED = ["Inject", "Backpr", "Piston_Pressure", "Piston_Position"]
+
+
+class CycleTracker:
+    """
+    - masks: {태그: 변수 비트마스크} (모든 RID, 최근 N분 현황용)
+    - rid_masks: {태그: 변수 비트마스크} (지정 RID만, 전체 성공/실패 집계용)
+    """
+
+    def __init__(self, csv_dir=CSV_DIR, variables=MONITORED, rid="014", db_path=INDEX_PATH):
+        self.csv_dir = csv_dir
+        self.variables = list(variables)
+        self.rid = rid
+        self.db_path = db_path
+        self._bits = {var: 1 << i for i, var in enumerate(VARIABLES)}
+        self._watch = sum(self._bits[var] for var in self.variables)
+
+        self.cursor = 0
+        self.masks = {}
+        self.rid_masks = {}
+        self.latest_tag = None
+        self._counts = {"tracked": 0, "complete": 0, "success": 0}
+        self._var_counts = {var: 0 for var in self.variables}
+        self._ambiguous = set()
+        self._lock = threading.Lock()
+
+    def _level(self, mask):
+        return bin(mask & self._watch).count("1")
+
+    def _classify(self, tag, level, sign):
+        if level >= 1:
+            self._counts["tracked"] += sign
+        if level == len(self.variables):
+            self._counts["complete"] += sign
+        if level >= 3:
+            self._counts["success"] += sign
+        elif level >= 1:
+            (self._ambiguous.add if sign > 0 else self._ambiguous.discard)(tag)
+
+    def _update(self, tag, rid, variable):
+        bit = self._bits[variable]
+        self.masks[tag] = self.masks.get(tag, 0) | bit
+        if self.latest_tag is None or tag > self.latest_tag:
+            self.latest_tag = tag
+
+        if rid != self.rid:
+            return
+        old = self.rid_masks.get(tag, 0)
+        new = old | bit
+        if new == old:
+            return
+        self.rid_masks[tag] = new
+        if variable in self._var_counts:
+            self._var_counts[variable] += 1
+        self._classify(tag, self._level(old), -1)
+        self._classify(tag, self._level(new), +1)
+
+    def poll(self):
+        """커서 이후 새로 등록된 결과 파일 반영, 반환값: 반영한 파일 수"""
+        refresh(self.csv_dir, self.db_path)
+        with closing(connect(self.db_path)) as conn:
+            rows = conn.execute(
+                "SELECT seq, date, time, rid, variable FROM files WHERE dir = ? AND seq > ? ORDER BY seq",
+                (os.path.abspath(self.csv_dir), self.cursor),
+            ).fetchall()
+        with self._lock:
+            for seq, date, time, rid, variable in rows:
+                self._update(f"{date}_{time[:4]}", rid, variable)
+                self.cursor = max(self.cursor, seq)
+        return len(rows)
+
+    def recent(self, minutes=10):
+        """가장 최근 태그부터 1분씩 거슬러 올라간 [(태그, 성공 여부)] (모든 RID 기준)"""
+        with self._lock:
+            if self.latest_tag is None:
+                return []
+            base_dt = datetime.strptime(self.latest_tag, "%Y%m%d_%H%M")
+            tags = [(base_dt - timedelta(minutes=i)).strftime("%Y%m%d_%H%M") for i in range(minutes)]
+            return [(tag, self._level(self.masks.get(tag, 0)) >= 3) for tag in tags]
+
+    def summary(self):
+        """
+        반환값: {"tracked": 감시 변수가 1개 이상 도착한 사이클 수 (지정 RID), "complete", "success_count",
+                 "ambiguous_tags": [(태그, 탐지 변수 수)], "files_by_var": {변수: 도착 사이클 수}}
+        """
+        with self._lock:
+            return {
+                "tracked": self._counts["tracked"],
+                "complete": self._counts["complete"],
+                "success_count": self._counts["success"],
+                "ambiguous_tags": sorted((tag, self._level(self.rid_masks[tag])) for tag in self._ambiguous),
+                "files_by_var": dict(self._var_counts),
+            }
@@ -0,0 +1,134 @@
+# src/optimold/density.py
+
+"""
+사이클 밀도 지도 (Analysis 탭: 시간-값 2D 히스토그램)
+
+- 입력: 정렬된 신호 텐서(optimold.signal_tensor)의 RID 파티션 (모든 사이클이 공통 시간축 위에 정렬됨)
+- 지도 = (시간 구간 × 값 구간) 샘플 수 (uint32), 변수별 .npz 1개로 압축 저장
+
+    density_dir/RID014/Volume.npz   # counts, t_edges, v_edges, cycles(반영된 사이클 키)
+
+- update_maps(): 지도에 아직 반영되지 않은 사이클만 bincount로 누적 (append-only 텐서 기준 증분)
+  새 사이클 값이 기존 값 범위를 벗어나면 해당 변수 지도를 전체 범위로 다시 구성
+- smooth_density(): 표시 직전에 가우시안 커널 FFT 합성곱으로 평활화 → 기존 sns.kdeplot 대비 수 ms
+"""
+
+import os
+
+import numpy as np
+from scipy.signal import fftconvolve
+
+from optimold.cycle_store import read_manifest
+from optimold.result_files import CSV_DIR, VARIABLES
+from optimold.signal_tensor import TENSOR_DIR, build_tensor, open_tensor
+
+DENSITY_DIR = os.path.join(os.path.dirname(CSV_DIR), "density_maps")
+
+N_TIME_BINS = 200
+N_VALUE_BINS = 200
+RANGE_PADDING = 0.05
+
+
+def value_edges(v_min, v_max, n_bins=N_VALUE_BINS, padding=RANGE_PADDING):
+    """값 범위 양쪽에 여유(padding × 폭)를 둔 구간 경계 (상수 신호는 ±0.5 폭)"""
+    span = v_max - v_min
+    pad = span * padding if span > 0 else 0.5
+    return np.linspace(v_min - pad, v_max + pad, n_bins + 1)
+
+
+def bin_cycles(values, time, t_edges, v_edges):
+    """
+    (n_cycles, T) 신호 → (n_t_bins, n_v_bins) 샘플 수
+    - 시간 구간 인덱스는 공통 시간축에서 한 번만 계산, 값 구간은 등간격이므로 나눗셈으로 계산
+    """
+    n_t, n_v = len(t_edges) - 1, len(v_edges) - 1
+    t_idx = np.clip(np.searchsorted(t_edges, time, side="right") - 1, 0, n_t - 1)
+    values = np.asarray(values, dtype=float)
+    v_idx = np.floor((values - v_edges[0]) / (v_edges[-1] - v_edges[0]) * n_v).astype(np.int64)
+    v_idx = np.clip(v_idx, 0, n_v - 1)
+    valid = np.isfinite(values)
+    flat = (t_idx[None, :] * n_v + v_idx)[valid]
+    return np.bincount(flat, minlength=n_t * n_v).reshape(n_t, n_v).astype(np.uint32)
+
+
+def map_path(variable, rid, density_dir=DENSITY_DIR):
+    return os.path.join(density_dir, rid, f"{variable}.npz")
+
+
+def load_map(variable, rid, density_dir=DENSITY_DIR):
+    """반환값: {"counts", "t_edges", "v_edges", "cycles"} 또는 None"""
+    path = map_path(variable, rid, density_dir)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {key: data[key] for key in ("counts", "t_edges", "v_edges", "cycles")}
+
+
+def _save_map(path, density):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez_compressed(tmp, **density)
+    os.replace(tmp, path)  # 원자적 교체: 대시보드는 항상 완전한 지도만 읽음
+
+
+def update_maps(tensor_dir=TENSOR_DIR, density_dir=DENSITY_DIR, rid="RID014", variables=VARIABLES,
+                n_time_bins=N_TIME_BINS, n_value_bins=N_VALUE_BINS):
+    """
+    신호 텐서의 신규 사이클을 변수별 밀도 지도에 반영
+    반환값: {변수: 새로 반영한 사이클 수}
+    """
+    tensor = open_tensor(rid, tensor_dir)
+    if tensor is None or len(tensor) == 0:
+        return {var: 0 for var in variables}
+    time = tensor.time
+    keys = tensor.cycles
+    t_edges = np.linspace(time[0], time[-1], n_time_bins + 1)
+
+    added = {}
+    for var in variables:
+        values = tensor.signal(var)
+        density = load_map(var, rid, density_dir)
+        start = 0 if density is None else len(density["cycles"])
+        if start == len(keys):
+            added[var] = 0
+            continue
+
+        new = np.asarray(values[start:], dtype=float)
+        rebuild = density is None or density["counts"].shape != (n_time_bins, n_value_bins)
+        if not rebuild:
+            v_edges = density["v_edges"]
+            rebuild = np.nanmin(new) < v_edges[0] or np.nanmax(new) > v_edges[-1]
+
+        if rebuild:
+            v_edges = value_edges(float(np.nanmin(values)), float(np.nanmax(values)), n_value_bins)
+            counts = bin_cycles(values, time, t_edges, v_edges)
+        else:
+            counts = density["counts"] + bin_cycles(new, time, density["t_edges"], v_edges)
+            t_edges = density["t_edges"]
+
+        _save_map(map_path(var, rid, density_dir),
+                  {"counts": counts, "t_edges": t_edges, "v_edges": v_edges, "cycles": np.array(keys)})
+        added[var] = len(keys) - start
+    return added
+
+
+def gaussian_kernel(sigma):
+    """(sigma_t, sigma_v) 구간 단위 가우시안 커널 (±3σ)"""
+    axes = [np.exp(-0.5 * (np.arange(-int(3 * s), int(3 * s) + 1) / s) ** 2) if s > 0 else np.ones(1)
+            for s in sigma]
+    kernel = np.outer(axes[0], axes[1])
+    return kernel / kernel.sum()
+
+
+def smooth_density(counts, sigma=(1.5, 1.5)):
+    """FFT 합성곱 평활화 + 정규화 (전체 합 1인 결합 밀도)"""
+    smoothed = np.clip(fftconvolve(counts.astype(float), gaussian_kernel(sigma), mode="same"), 0.0, None)
+    total = smoothed.sum()
+    return smoothed / total if total > 0 else smoothed
+
+
+if __name__ == "__main__":
+    for part in sorted(read_manifest()["partitions"]):
+        build_tensor(rid=part)
+        added = update_maps(rid=part)
+        print(f"[✓] {part} 밀도 지도 갱신: 신규 사이클 {max(added.values(), default=0)}개 → {DENSITY_DIR}")
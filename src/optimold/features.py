@@ -0,0 +1,139 @@
+# src/optimold/features.py
+
+"""
+사이클 특징량(feature_df) 벡터화 추출 엔진
+
+- 입력: 사이클 저장소(optimold.cycle_store)의 변수별 (n_cycles, T) 배열 (공통 시간축 0~10초, 1ms)
+- 모든 특징량은 axis=1 방향 NumPy 연산으로 사이클 묶음 전체를 한 번에 계산
+- 작업 단위 = 저장소 청크(최대 256 사이클), 프로세스 풀에서 워커가 청크 파일을 직접 mmap으로 읽음
+- 사이클별 계산은 다른 사이클/청크 구성과 무관하므로 재실행 시 동일한 값(바이트 단위 동일 CSV) 보장
+
+[특징량]
+- 기본 (feature_df_from_csv.csv와 동일한 컬럼): {변수}_max / _mean / _auc / _std / _flat_ratio / _rise_time
+  · flat_ratio: |np.gradient(신호)| < 1e-4 인 샘플 비율
+  · rise_time: 최소~최대 구간의 10% → 90% 최초 도달 시각 차
+- 시나리오 판정용 (classified_scenarios 컬럼): Piston_Pressure_max_t6 / _mean_t6, Piston_Position_min,
+  Piston_Velocity_flat_ratio_t6 / _flat_duration_t8, Flow_Rate_jetting_duration
+- 기존 노트북은 가변 간격 원본 샘플로 계산했으므로 flat_ratio 등 샘플 수 기반 값은 소폭 다를 수 있음
+- 입력은 float64 저장소를 그대로 사용 (float32 신호 텐서는 Piston_Pressure(~5e6) 값 해상도가
+  flat 판정 임계값 1e-4보다 커서 flat_ratio가 달라짐)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from optimold.cycle_store import STORE_DIR, load_time, read_manifest
+from optimold.result_files import CSV_DIR
+
+FEATURE_VARIABLES = ["Volume", "Piston_Pressure", "Flow_Rate", "Piston_Position", "Piston_Velocity"]
+BASE_FEATURES = ["max", "mean", "auc", "std", "flat_ratio", "rise_time"]
+SCENARIO_FEATURES = [
+    "Piston_Pressure_max_t6", "Piston_Pressure_mean_t6", "Piston_Position_min",
+    "Piston_Velocity_flat_ratio_t6", "Piston_Velocity_flat_duration_t8", "Flow_Rate_jetting_duration",
+]
+FEATURE_COLUMNS = [f"{var}_{name}" for var in FEATURE_VARIABLES for name in BASE_FEATURES] + SCENARIO_FEATURES
+
+FLAT_THRESHOLD = 1e-4
+JETTING_THRESHOLD = 1e-5
+
+
+def flat_count(x, threshold=FLAT_THRESHOLD):
+    """행별 |gradient| < threshold 샘플 수 (np.gradient는 샘플 간격 1 기준, 기존 노트북과 동일)"""
+    return np.count_nonzero(np.abs(np.gradient(x, axis=1)) < threshold, axis=1)
+
+
+def rise_time(x, time):
+    """행별 10% → 90% 최초 도달 시각 차 (값이 없는 행은 NaN)"""
+    v_min = x.min(axis=1, keepdims=True)
+    span = x.max(axis=1, keepdims=True) - v_min
+    i10 = np.argmax(x >= v_min + 0.1 * span, axis=1)
+    i90 = np.argmax(x >= v_min + 0.9 * span, axis=1)
+    out = time[i90] - time[i10]
+    out[np.isnan(span[:, 0])] = np.nan
+    return out
+
+
+def base_features(x, time):
+    """(n, T) 신호 → {특징량 이름: (n,) 배열}"""
+    return {
+        "max": x.max(axis=1),
+        "mean": x.mean(axis=1),
+        "auc": np.trapezoid(x, time, axis=1),
+        "std": x.std(axis=1),
+        "flat_ratio": flat_count(x) / x.shape[1],
+        "rise_time": rise_time(x, time),
+    }
+
+
+def scenario_features(signals, time):
+    """시나리오 판정용 구간 특징량 (t > 6초, t > 8초 구간은 기존 노트북 정의와 동일)"""
+    dt = float(np.mean(np.diff(time)))
+    after6 = time > 6.0
+    after8 = time > 8.0
+    pressure = signals["Piston_Pressure"][:, after6]
+    velocity = signals["Piston_Velocity"]
+    flow = signals["Flow_Rate"]
+    return {
+        "Piston_Pressure_max_t6": pressure.max(axis=1),
+        "Piston_Pressure_mean_t6": pressure.mean(axis=1),
+        "Piston_Position_min": signals["Piston_Position"].min(axis=1),
+        "Piston_Velocity_flat_ratio_t6": flat_count(velocity[:, after6]) / after6.sum(),
+        "Piston_Velocity_flat_duration_t8": flat_count(velocity[:, after8]) * dt,
+        "Flow_Rate_jetting_duration": np.count_nonzero(
+            np.abs(np.gradient(np.abs(flow), axis=1)) > JETTING_THRESHOLD, axis=1) * dt,
+    }
+
+
+def compute_features(signals, time):
+    """
+    {변수: (n, T) 배열} → (n, len(FEATURE_COLUMNS)) 특징량 배열 (컬럼 순서 FEATURE_COLUMNS)
+    """
+    columns = {}
+    for var in FEATURE_VARIABLES:
+        for name, values in base_features(signals[var], time).items():
+            columns[f"{var}_{name}"] = values
+    columns.update(scenario_features(signals, time))
+    return np.column_stack([columns[c] for c in FEATURE_COLUMNS])
+
+
+def _chunk_features(store_dir, rid, chunk):
+    """워커: 저장소 청크 1개의 특징량 계산 (청크 파일을 워커에서 직접 로딩)"""
+    time = load_time(store_dir)
+    chunk_dir = os.path.join(store_dir, rid, chunk)
+    signals = {var: np.load(os.path.join(chunk_dir, f"{var}.npy"), mmap_mode="r") for var in FEATURE_VARIABLES}
+    return compute_features(signals, time)
+
+
+def build_feature_df(store_dir=STORE_DIR, rid=None, n_workers=None):
+    """
+    저장소 전체(또는 rid 파티션)의 사이클 특징량 DataFrame
+    - 컬럼: cycle_id + FEATURE_COLUMNS, 행 순서는 manifest 순서 (파티션 → 청크 → 사이클)
+    - n_workers: 프로세스 수 (None이면 CPU 수, 1 이하면 순차 처리)
+    """
+    manifest = read_manifest(store_dir)
+    parts = [rid] if rid is not None else sorted(manifest["partitions"])
+    tasks = [(p, chunk["chunk"], chunk["cycles"]) for p in parts for chunk in manifest["partitions"].get(p, [])]
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers <= 1 or len(tasks) <= 1:
+        blocks = [_chunk_features(store_dir, p, chunk) for p, chunk, _ in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as executor:
+            blocks = list(executor.map(_chunk_features, [store_dir] * len(tasks),
+                                       [p for p, _, _ in tasks], [c for _, c, _ in tasks]))
+
+    cycle_ids = [c for _, _, cycles in tasks for c in cycles]
+    values = np.concatenate(blocks) if blocks else np.empty((0, len(FEATURE_COLUMNS)))
+    df = pd.DataFrame(values, columns=FEATURE_COLUMNS)
+    df.insert(0, "cycle_id", cycle_ids)
+    return df
+
+
+if __name__ == "__main__":
+    out_path = os.path.join(os.path.dirname(CSV_DIR), "feature_df.csv")
+    feature_df = build_feature_df()
+    feature_df.to_csv(out_path, index=False)
+    print(f"[✓] 사이클 특징량 {len(feature_df)}개 저장 완료 → {out_path}")
@@ -4,11 +4,22 @@ import numpy as np
 from scipy.io import savemat
 from datetime import datetime
 import os
+from optimold.rng_streams import draw_cycles, resolve_seed
 
-def generate_mat(seed=None, run_id=None):
+# 정상 기준 타임포인트 (모든 신호 공통)
+TIMEPOINTS = np.array([0, 0.1, 5.68, 5.84, 7.98, 8.12, 9.0])
+
+BASE_BP = np.array([26, 26, 0, 0, 25, 25, 25])
+RETRACT_VALUES = np.array([0, 0, 0, 24, 24, 0.5, 0.5])
+EXTRUDER_VALUES = np.array([0, 0, 24.5, 24.5, 0.5, 0.5, 0.5])
+
+
+def generate_mat(seed=None, run_id=None, cycle=0, stream_key=None):
     """
     분포 기반 이상치가 반영된 사출 성형용 .mat 파일 생성 함수
     run_id: 사용자가 지정하는 고유 ID (예: 001, testA, cycle3 등)
+    cycle: run 내 사이클 인덱스 (seed, 스트림 키, cycle 조합으로 난수 스트림이 고정됨)
+    stream_key: 난수 스트림 키 (미지정 시 run_id), 같은 run_id로 캠페인을 반복할 때 캠페인별로 구분
     - inject_data: 정규분포 기반 압력 저하
     - backpr_data: ±0.7 bar 저주파 진동 노이즈
     - retract_data: 지연 offset (지수분포), 시간 순서 보장
@@ -17,8 +28,7 @@ def generate_mat(seed=None, run_id=None):
 
     저장 경로: /mnt/c/Users/Admin/MATLAB/Projects/my_project/cycle_results
     """
-    if seed is not None:
-        np.random.seed(seed)
+    seed = resolve_seed(seed)
 
     win_path = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/cycle_results"
     os.makedirs(win_path, exist_ok=True)
@@ -26,71 +36,88 @@ def generate_mat(seed=None, run_id=None):
     id_tag = f"_RID{run_id}" if run_id else ""
     output_path = os.path.join(win_path, f"cycle_{now}{id_tag}.mat")
 
-    timepoints = np.array([0, 0.1, 5.68, 5.84, 7.98, 8.12, 9.0])
-    timepoints += np.random.uniform(1e-6, 1e-5, size=timepoints.shape)
+    # 전역 np.random 상태 대신 (seed, 스트림 키, cycle) 전용 스트림에서 1개 사이클 샘플링
+    key = stream_key if stream_key is not None else run_id
+    batch = _build_signals(draw_cycles(_draw_params, seed, key, cycle, 1))
+    mat_data = {name: arr[0] for name, arr in batch.items()}
+
+    savemat(output_path, mat_data)
+    print(f"[✓] .mat 파일 저장 완료 → {output_path}")
+    return output_path
+
+
+def generate_batch(n, seed=None, output_path=None, run_id=None, start=0):
+    """
+    N개 사이클의 입력 신호를 한 번에 생성하는 배치 함수 (모든 신호 (N, 7, 2))
+    - 사이클 인덱스 [start, start + n) 구간 생성, 같은 (seed, run_id)면 샤딩 여부와 무관하게 동일한 결과
+    - output_path 지정 시 하나의 통합 .mat 파일로 저장
+    """
+    seed = resolve_seed(seed)
+    batch = _build_signals(draw_cycles(_draw_params, seed, run_id, start, n))
 
-    # inject_data: 압력 peak 저하
-    inject_peaks = np.clip(
-    np.random.normal(loc=17.5, scale=1.5, size=2),
-    10.0, 30.0  # 하한 10 bar, 상한 30 bar
-    )
-    inject_values = [0, inject_peaks[0], inject_peaks[1], -0.5, -0.5, 24, 24]
-    inject_data = np.column_stack([timepoints, inject_values])
+    if output_path is not None:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        savemat(output_path, {**batch, "n_cycles": n, "seed": str(seed), "start": start})
+        print(f"[✓] 배치 .mat 파일 저장 완료 ({n} cycles) → {output_path}")
+    return batch
+
+
+def _draw_params(rng, n):
+    """
+    사이클별 난수 파라미터를 (N,) / (N, k) 배열로 샘플링 (rng: np.random.Generator)
+    - retract 간격: 기존 U(0.05, 0.5) + '>= 0.1' 기각 루프와 같은 분포인 U(0.1, 0.5)로 직접 샘플링
+    """
+    return {
+        "time_jitter": rng.uniform(1e-6, 1e-5, size=(n, len(TIMEPOINTS))),
+        "inject_peaks": rng.normal(loc=17.5, scale=1.5, size=(n, 2)),
+        "noise_bp": rng.normal(0, 0.7, size=(n, 7)),
+        "delay_offset": rng.exponential(scale=0.4, size=n),
+        "retract_gap": rng.uniform(0.1, 0.5, size=n),
+        "nozzle_offset": rng.exponential(scale=0.3, size=n),
+        "fail_chance": rng.binomial(1, 0.1, size=n),
+    }
+
+
+def _build_signals(params):
+    """샘플링된 파라미터로부터 (N, 7, 2) 형태의 구간 선형 입력 신호 생성"""
+    n = len(params["delay_offset"])
+    timepoints = TIMEPOINTS + params["time_jitter"]
+
+    # inject_data: 압력 peak 저하 (하한 10 bar, 상한 30 bar)
+    inject_values = np.zeros((n, 7))
+    inject_values[:, 1:3] = np.clip(params["inject_peaks"], 10.0, 30.0)
+    inject_values[:, 3:5] = -0.5
+    inject_values[:, 5:7] = 24
 
     # backpr_data: ±0.7bar 진동 노이즈
-    base_bp = np.array([26, 26, 0, 0, 25, 25, 25])
-    noise_bp = np.random.normal(0, 0.7, size=7)
-    backpr_values = np.maximum(base_bp + noise_bp, 0.0)
-    backpr_data = np.column_stack([timepoints, backpr_values])
+    backpr_values = np.maximum(BASE_BP + params["noise_bp"], 0.0)
 
     # retract_data: 지연 offset + 시간 오름차순 보장
-    while True:
-        delay_offset = np.random.exponential(scale=0.4)
-        t4 = 5.84 + delay_offset
-        t5_candidate = t4 + np.random.uniform(0.05, 0.5)
-        if t5_candidate - t4 >= 0.1:
-            break
-    t5 = t5_candidate
-    
+    t4 = 5.84 + params["delay_offset"]
     retract_times = timepoints.copy()
-    retract_times[3] = t4
-    retract_times[4] = t5
-    retract_times = np.sort(retract_times)
-    retract_values = np.array([0, 0, 0, 24, 24, 0.5, 0.5])
-    sort_idx = np.argsort(retract_times)
-    retract_data = np.column_stack([
-        retract_times[sort_idx],
-        retract_values[sort_idx]
-    ])
+    retract_times[:, 3] = t4
+    retract_times[:, 4] = t4 + params["retract_gap"]
+    retract_times = np.sort(retract_times, axis=1)
+    retract_values = np.broadcast_to(RETRACT_VALUES, (n, 7))
 
     # nozzle_data: 개방 지연 + 실패 확률 + 정렬 포함
-    nozzle_offset = np.random.exponential(scale=0.3)
-    fail_chance = np.random.binomial(1, 0.1)
-    nozzle_val = 0 if fail_chance else 24
-
+    nozzle_val = np.where(params["fail_chance"] == 1, 0.0, 24.0)
     nozzle_times = timepoints.copy()
-    nozzle_times[3:5] += nozzle_offset
-    nozzle_values = np.array([0, 0, 0, nozzle_val, nozzle_val, 0, 0])
-
-    sort_idx = np.argsort(nozzle_times)
-    nozzle_data = np.column_stack([
-        nozzle_times[sort_idx],
-        nozzle_values[sort_idx]
-    ])
-
+    nozzle_times[:, 3:5] += params["nozzle_offset"][:, None]
+    nozzle_values = np.zeros((n, 7))
+    nozzle_values[:, 3] = nozzle_val
+    nozzle_values[:, 4] = nozzle_val
+    sort_idx = np.argsort(nozzle_times, axis=1)
+    nozzle_times = np.take_along_axis(nozzle_times, sort_idx, axis=1)
+    nozzle_values = np.take_along_axis(nozzle_values, sort_idx, axis=1)
 
     # extruder_data: 고정값
-    extruder_values = [0, 0, 24.5, 24.5, 0.5, 0.5, 0.5]
-    extruder_data = np.column_stack([timepoints, extruder_values])
-
-    mat_data = {
-        "inject_data": inject_data,
-        "backpr_data": backpr_data,
-        "retract_data": retract_data,
-        "nozzle_data": nozzle_data,
-        "extruder_data": extruder_data
-    }
+    extruder_values = np.broadcast_to(EXTRUDER_VALUES, (n, 7))
 
-    savemat(output_path, mat_data)
-    print(f"[✓] .mat 파일 저장 완료 → {output_path}")
-    return output_path
+    return {
+        "inject_data": np.stack([timepoints, inject_values], axis=-1),
+        "backpr_data": np.stack([timepoints, backpr_values], axis=-1),
+        "retract_data": np.stack([retract_times, retract_values], axis=-1),
+        "nozzle_data": np.stack([nozzle_times, nozzle_values], axis=-1),
+        "extruder_data": np.stack([timepoints, extruder_values], axis=-1),
+    }
@@ -4,11 +4,28 @@ import numpy as np
 from scipy.io import savemat
 from datetime import datetime
 import os
+from optimold.rng_streams import draw_cycles, resolve_seed
 
-def generate_mat(seed=None, run_id=None):
+# .mat 저장 경로 (WSL에서 마운트된 Windows 경로)
+CYCLE_DIR = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/cycle_results"
+
+# 정상 기준 타임포인트
+INJECT_TIME = np.array([0, 0.1, 5.68, 5.84, 7.98, 8.12, 9.0])
+BACKPR_TIME = np.array([0, 2.02, 2.1, 2.34, 2.46, 9, 10])
+NOZZLE_TIME = np.array([0, 5.46, 5.64, 8.34, 8.42, 9, 10])
+EXTRUDER_TIME = np.array([0, 0.46, 0.58, 1.64, 1.7, 8, 9, 10])
+
+BASE_BP = np.array([26, 26, 0, 0, 25, 25, 26])
+RETRACT_VALUES = np.array([0, 0, 24, 24, 0.5, -0.23684, -0.23684])
+EXTRUDER_VALUES = np.array([0, 0, 24.5, 24.5456, 0.5, 0.12048, 0.12048, 0])
+
+
+def generate_mat(seed=None, run_id=None, cycle=0, stream_key=None):
     """
     분포 기반 이상치가 반영된 사출 성형용 .mat 파일 생성 함수
     run_id: 사용자가 지정하는 고유 ID (예: 001, testA, cycle3 등)
+    cycle: run 내 사이클 인덱스 (seed, 스트림 키, cycle 조합으로 난수 스트림이 고정됨)
+    stream_key: 난수 스트림 키 (미지정 시 run_id), 같은 run_id로 캠페인을 반복할 때 캠페인별로 구분
     - inject_data: 정규분포 기반 압력 저하
     - backpr_data: ±0.7 bar 저주파 진동 노이즈
     - retract_data: 지연 offset (지수분포), 시간 순서 보장
@@ -18,71 +35,134 @@ def generate_mat(seed=None, run_id=None):
     저장 경로: /mnt/c/Users/Admin/MATLAB/Projects/my_project/cycle_results
     """
 
-    def enforce_min_interval(t_array, min_dt=0.05):
-        for i in range(1, len(t_array)):
-            if t_array[i] - t_array[i - 1] < min_dt:
-                t_array[i] = t_array[i - 1] + min_dt
-        return t_array
-
-    if seed is not None:
-        np.random.seed(seed)
+    seed = resolve_seed(seed)
 
-    win_path = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/cycle_results"
+    win_path = CYCLE_DIR
     os.makedirs(win_path, exist_ok=True)
     now = datetime.now().strftime("%Y%m%d_%H%M%S")
     id_tag = f"_RID{run_id}" if run_id else ""
     output_path = os.path.join(win_path, f"cycle_{now}{id_tag}.mat")
 
-    # 정상 기준 타임포인트
-    inject_time = np.array([0, 0.1, 5.68, 5.84, 7.98, 8.12, 9.0])
-    backpr_time = np.array([0, 2.02, 2.1, 2.34, 2.46, 9, 10])
-    retract_time = np.array([0, 1.96, 2.06, 2.3, 2.4, 8, 9, 10])
-    nozzle_time = np.array([0, 5.46, 5.64, 8.34, 8.42, 9, 10])
-    extruder_time = np.array([0, 0.46, 0.58, 1.64, 1.7, 8, 9, 10])
+    # 전역 np.random 상태 대신 (seed, 스트림 키, cycle) 전용 스트림에서 1개 사이클 샘플링
+    key = stream_key if stream_key is not None else run_id
+    batch = _build_signals(draw_cycles(_draw_params, seed, key, cycle, 1))
+    mat_data = {name: arr[0] for name, arr in batch.items()}
+
+    savemat(output_path, mat_data)
+    print(f"[✓] .mat 파일 저장 완료 → {output_path}")
+    return output_path
+
+
+def generate_batch(n, seed=None, output_path=None, run_id=None, start=0):
+    """
+    N개 사이클의 입력 신호를 한 번에 생성하는 배치 함수
+    - 모든 난수(inject 피크, backpr 노이즈, retract/nozzle 지연, nozzle 실패)를 (N, ...) 배열로 한 번에 샘플링
+    - 사이클 인덱스 [start, start + n) 구간 생성, 같은 (seed, run_id)면 샤딩 여부와 무관하게 동일한 결과
+      (병렬 실행은 rng_streams.generate_sharded(generate_batch, n, seed, run_id) 사용)
+    - 반환값: {"inject_data": (N, 7, 2), "backpr_data": (N, 7, 2), "retract_data": (N, 7, 2),
+              "nozzle_data": (N, 7, 2), "extruder_data": (N, 8, 2)}
+    - output_path 지정 시 사이클별 파일 대신 하나의 통합 .mat 파일로 저장
+    """
+    seed = resolve_seed(seed)
+    batch = _build_signals(draw_cycles(_draw_params, seed, run_id, start, n))
+
+    if output_path is not None:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        savemat(output_path, {**batch, "n_cycles": n, "seed": str(seed), "start": start})
+        print(f"[✓] 배치 .mat 파일 저장 완료 ({n} cycles) → {output_path}")
+    return batch
+
+
+def generate_batch_mats(n, seed=None, run_id=None, start=0, out_dir=CYCLE_DIR, stream_key=None):
+    """
+    N개 사이클을 generate_batch로 한 번에 생성한 뒤 Simulink 입력용 사이클별 .mat 파일로 저장
+    - 파일명: cycle_YYYYMMDD_HHMMSS_RID{run_id}_C{사이클 인덱스 4자리}.mat
+    - stream_key: 난수 스트림 키 (미지정 시 run_id), 같은 run_id로 여러 배치를 만들 때 배치별로 구분
+    - 반환값: 저장된 .mat 경로 리스트 (사이클 인덱스 순)
+    """
+    key = stream_key if stream_key is not None else run_id
+    batch = generate_batch(n, seed=seed, run_id=key, start=start)
+
+    os.makedirs(out_dir, exist_ok=True)
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    id_tag = f"_RID{run_id}" if run_id else ""
+
+    paths = []
+    for i in range(n):
+        path = os.path.join(out_dir, f"cycle_{now}{id_tag}_C{start + i:04d}.mat")
+        savemat(path, {name: arr[i] for name, arr in batch.items()})
+        paths.append(path)
+    print(f"[✓] 사이클별 .mat 파일 {n}개 저장 완료 → {out_dir}")
+    return paths
+
+
+def _draw_params(rng, n):
+    """
+    사이클별 난수 파라미터를 (N,) / (N, k) 배열로 샘플링 (rng: np.random.Generator)
+    """
+    return {
+        "inject_peaks": rng.normal(loc=17.5, scale=1.5, size=(n, 2)),
+        "noise_bp": rng.normal(0, 0.7, size=(n, 7)),
+        "delay_offset": rng.exponential(scale=0.1, size=n),
+        "retract_gap": rng.uniform(0.1, 0.5, size=n),
+        "nozzle_offset": rng.exponential(scale=0.3, size=n),
+        "fail_chance": rng.binomial(1, 0.1, size=n),
+    }
+
+
+def _enforce_min_interval(t_array, min_dt=0.05):
+    """시간축(axis=1)을 따라 최소 간격 보장, 사이클 축(axis=0)은 벡터화"""
+    t_array = t_array.copy()
+    for i in range(1, t_array.shape[1]):
+        t_array[:, i] = np.maximum(t_array[:, i], t_array[:, i - 1] + min_dt)
+    return t_array
+
+
+def _build_signals(params):
+    """샘플링된 파라미터로부터 (N, k, 2) 형태의 구간 선형 입력 신호 생성"""
+    n = len(params["delay_offset"])
 
     # inject_data: 압력 피크 저하
-    inject_peaks = np.clip(np.random.normal(loc=17.5, scale=1.5, size=2), 10.0, 30.0)
-    inject_values = [0, inject_peaks[0], inject_peaks[1], -0.5, -0.5, 24, 24]
-    inject_data = np.column_stack([inject_time, inject_values])
+    inject_peaks = np.clip(params["inject_peaks"], 10.0, 30.0)
+    inject_values = np.zeros((n, 7))
+    inject_values[:, 1:3] = inject_peaks
+    inject_values[:, 3:5] = -0.5
+    inject_values[:, 5:7] = 24
+    inject_time = np.broadcast_to(INJECT_TIME, (n, 7))
 
     # backpr_data: ±0.7bar 노이즈
-    base_bp = np.array([26, 26, 0, 0, 25, 25, 26])
-    noise_bp = np.random.normal(0, 0.7, size=7)
-    backpr_values = np.maximum(base_bp + noise_bp, 0.0)
-    backpr_data = np.column_stack([backpr_time, backpr_values])
+    backpr_values = np.maximum(BASE_BP + params["noise_bp"], 0.0)
+    backpr_time = np.broadcast_to(BACKPR_TIME, (n, 7))
 
     # retract_data: 지연 + 시간 간격 보장
-    delay_offset = np.random.exponential(scale=0.1)
-    t3 = 2.06 + delay_offset
-    t4 = t3 + np.random.uniform(0.1, 0.5)
-    retract_mod_time = np.array([0, 1.96, t3, t4, 8, 9, 10])
-    retract_mod_time = enforce_min_interval(np.sort(retract_mod_time))
-    retract_values = [0, 0, 24, 24, 0.5, -0.23684, -0.23684]
-    retract_data = np.column_stack([retract_mod_time, retract_values])
+    t3 = 2.06 + params["delay_offset"]
+    t4 = t3 + params["retract_gap"]
+    retract_time = np.empty((n, 7))
+    retract_time[:, :2] = [0, 1.96]
+    retract_time[:, 2] = t3
+    retract_time[:, 3] = t4
+    retract_time[:, 4:] = [8, 9, 10]
+    retract_time = _enforce_min_interval(np.sort(retract_time, axis=1))
+    retract_values = np.broadcast_to(RETRACT_VALUES, (n, 7))
 
     # nozzle_data: 지연 + 실패 확률 + 시간 간격 보장
-    nozzle_offset = np.random.exponential(scale=0.3)
-    fail_chance = np.random.binomial(1, 0.1)
-    nozzle_val = 0 if fail_chance else 24
-    nozzle_mod_time = nozzle_time.copy()
-    nozzle_mod_time[2:4] += nozzle_offset
-    nozzle_mod_time = enforce_min_interval(np.sort(nozzle_mod_time))
-    nozzle_values = [0, 0, nozzle_val, nozzle_val, 0, -0.36709, -1]
-    nozzle_data = np.column_stack([nozzle_mod_time, nozzle_values])
+    nozzle_val = np.where(params["fail_chance"] == 1, 0.0, 24.0)
+    nozzle_time = np.tile(NOZZLE_TIME.astype(float), (n, 1))
+    nozzle_time[:, 2:4] += params["nozzle_offset"][:, None]
+    nozzle_time = _enforce_min_interval(np.sort(nozzle_time, axis=1))
+    nozzle_values = np.zeros((n, 7))
+    nozzle_values[:, 2] = nozzle_val
+    nozzle_values[:, 3] = nozzle_val
+    nozzle_values[:, 5:7] = [-0.36709, -1]
 
     # extruder_data: 고정값 + 시간 간격 보장
-    extruder_time = enforce_min_interval(extruder_time.copy())
-    extruder_values = [0, 0, 24.5, 24.5456, 0.5, 0.12048, 0.12048, 0]
-    extruder_data = np.column_stack([extruder_time, extruder_values])
-
-    mat_data = {
-        "inject_data": inject_data,
-        "backpr_data": backpr_data,
-        "retract_data": retract_data,
-        "nozzle_data": nozzle_data,
-        "extruder_data": extruder_data
-    }
+    extruder_time = _enforce_min_interval(np.tile(EXTRUDER_TIME.astype(float), (n, 1)))
+    extruder_values = np.broadcast_to(EXTRUDER_VALUES, (n, 8))
 
-    savemat(output_path, mat_data)
-    print(f"[✓] .mat 파일 저장 완료 → {output_path}")
-    return output_path
+    return {
+        "inject_data": np.stack([inject_time, inject_values], axis=-1),
+        "backpr_data": np.stack([backpr_time, backpr_values], axis=-1),
+        "retract_data": np.stack([retract_time, retract_values], axis=-1),
+        "nozzle_data": np.stack([nozzle_time, nozzle_values], axis=-1),
+        "extruder_data": np.stack([extruder_time, extruder_values], axis=-1),
+    }
@@ -0,0 +1,281 @@
+# src/optimold/ingest.py
+
+"""
+시뮬레이션 결과 CSV 실시간 수집 데몬 (asyncio)
+
+- 결과 디렉토리를 poll_interval마다 scandir로 훑어 새 CSV 감지
+  · 크기/mtime이 두 번 연속 같을 때만 '저장 완료'로 간주 (MATLAB이 쓰는 중인 파일은 건너뜀)
+- 새 파일은 즉시 파싱 시작: 스레드 풀 + Semaphore로 동시 파싱 수 제한 (max_parallel)
+  · 파싱 = read_signal_csv + 공통 시간축 보간 (cycle_store.compact와 같은 값)
+  · 검증: 샘플 존재 / 값 유한 → 실패 시 사이클 전체 제외 (invalid 이벤트)
+- 사이클(run_id) 단위로 10개 변수가 모두 모이면 저장 대기열로 이동
+  일정 시간(incomplete_timeout) 안에 변수가 다 모이지 않으면 incomplete 이벤트 (계속 대기)
+  evict_timeout이 지나도 다 모이지 않으면 invalid 이벤트 후 제외 (메모리 정리)
+- 저장 대기열은 batch_size개 또는 flush_interval초마다 cycle_store.append_cycles로 한 번에 추가
+  → 결과 색인(result_index)에도 등록 → stored 이벤트 발행
+  저장 실패 시 error 이벤트 후 대기열에 되돌려 다음 주기에 재시도 (데몬은 계속 실행)
+- 저장/제외된 사이클의 파일별 상태는 바로 정리, 키만 stored/invalid 집합에 남겨 재처리 방지
+- 구독자(대시보드, 분류기 등)는 subscribe()로 받은 asyncio.Queue에서 이벤트를 읽음
+  이벤트: {"type": "stored" | "invalid" | "incomplete" | "error", "rid", "cycles", ...}
+  · stored 이벤트의 "signals"는 {사이클 키: {변수: (T,) 배열}} (저장소 재로딩 없이 바로 사용)
+- 기존 일괄 압축(compact)과 같은 저장소/manifest를 쓰고 쓰기는 store_lock으로 직렬화되므로
+  두 방식을 동시에 섞어 써도 중복 저장/manifest 갱신 유실 없음
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from optimold.cycle_store import STORE_DIR, append_cycles, make_time_grid, read_manifest, stored_cycles
+from optimold.result_files import CSV_DIR, VARIABLES, parse_result_filename, read_signal_csv, resample
+from optimold.result_index import INDEX_PATH, register_files
+
+
+def parse_signal(path, grid):
+    """결과 CSV 1개 → 공통 시간축 (T,) 배열 (검증 실패 시 ValueError)"""
+    t, v = read_signal_csv(path)
+    if len(t) == 0:
+        raise ValueError("샘플 없음")
+    if not (np.all(np.isfinite(t)) and np.all(np.isfinite(v))):
+        raise ValueError("NaN/Inf 값 포함")
+    return resample(t, v, grid)
+
+
+class IngestService:
+    """
+    결과 디렉토리 감시 → 파싱/검증 → 사이클 저장소 추가 → 구독자 알림
+    - run(stop): stop(asyncio.Event)이 설정될 때까지 감시, 종료 시 남은 파싱/저장 마무리
+    - subscribe(maxsize): 이벤트 큐 (가득 찬 큐에는 이벤트를 버리고 dropped 카운트 증가)
+    """
+
+    def __init__(self, csv_dir=CSV_DIR, store_dir=STORE_DIR, db_path=INDEX_PATH, max_parallel=8,
+                 poll_interval=1.0, flush_interval=2.0, batch_size=64, incomplete_timeout=120.0,
+                 evict_timeout=3600.0, t_end=10.0, dt=1e-3):
+        self.csv_dir = csv_dir
+        self.store_dir = store_dir
+        self.db_path = db_path
+        self.max_parallel = max_parallel
+        self.poll_interval = poll_interval
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.incomplete_timeout = incomplete_timeout
+        self.evict_timeout = evict_timeout
+
+        manifest = read_manifest(store_dir)
+        if manifest["version"] > 0:
+            t_end, dt = manifest["t_end"], manifest["dt"]  # 기존 저장소의 시간축 유지
+        self.t_end, self.dt = t_end, dt
+        self.grid = make_time_grid(t_end, dt)
+
+        self.subscribers = []
+        self.dropped = 0
+        self.stored = set(stored_cycles(manifest))  # 이미 저장된 사이클 (재시작 시 건너뜀)
+        self.invalid = set()
+        self.pending_stat = {}  # 파일명 → 직전 폴링의 (크기, mtime)
+        self.started = defaultdict(set)  # 사이클 키 → 파싱을 시작한 파일명
+        self.partial = defaultdict(dict)  # 사이클 키 → {변수: (T,) 배열}
+        self.paths = defaultdict(dict)  # 사이클 키 → {변수: 파일 경로}
+        self.first_seen = {}  # 사이클 키 → 첫 파일 감지 시각
+        self.reported = set()  # incomplete 이벤트를 이미 보낸 사이클
+        self.ready = {}  # 저장 대기 사이클 키 → {변수: (T,) 배열}
+        self.ready_since = None
+        self.tasks = set()
+        self._semaphore = None
+        self._executor = None
+
+    # ---------------- 구독 ----------------
+    def subscribe(self, maxsize=0):
+        queue = asyncio.Queue(maxsize)
+        self.subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        if queue in self.subscribers:
+            self.subscribers.remove(queue)
+
+    def _publish(self, event):
+        event.setdefault("time", time.time())
+        for queue in self.subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1  # 느린 구독자 때문에 수집이 멈추지 않도록 버림
+
+    # ---------------- 감시 / 파싱 ----------------
+    def _scan(self):
+        """결과 디렉토리 1회 스캔 → [(파일명, 파싱 정보, (크기, mtime))] (아직 처리하지 않은 결과 파일만)"""
+        found = []
+        with os.scandir(self.csv_dir) as entries:
+            for entry in entries:
+                info = parse_result_filename(entry.name)
+                if info is None or info["cycle"] in self.stored or info["cycle"] in self.invalid:
+                    continue
+                if entry.name in self.started.get(info["cycle"], ()) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                found.append((entry.name, info, (stat.st_size, stat.st_mtime)))
+        return found
+
+    async def poll_once(self):
+        """새로 저장이 끝난 파일의 파싱 작업 시작 + 오래된 미완성 사이클 알림"""
+        loop = asyncio.get_running_loop()
+        if not os.path.isdir(self.csv_dir):
+            return 0
+        found = await loop.run_in_executor(self._executor, self._scan)
+
+        stable, current = [], {}
+        for fname, info, stat in sorted(found, key=lambda item: item[0]):
+            if stat[0] > 0 and self.pending_stat.get(fname) == stat:
+                stable.append((fname, info))
+            else:
+                current[fname] = stat  # 쓰는 중일 수 있으므로 다음 폴링에서 다시 확인
+        self.pending_stat = current
+
+        paths = []
+        for fname, info in stable:
+            self.started[info["cycle"]].add(fname)
+            if info["variable"] in self.paths[info["cycle"]]:
+                continue  # 같은 사이클/변수 중복 파일: 가장 이른 파일 사용 (group_cycle_files와 동일)
+            path = os.path.join(self.csv_dir, fname)
+            self.paths[info["cycle"]][info["variable"]] = path
+            self.first_seen.setdefault(info["cycle"], time.monotonic())
+            paths.append(path)
+            task = asyncio.create_task(self._parse(info, path))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+        if paths:
+            await loop.run_in_executor(self._executor, register_files, paths, self.db_path)
+
+        now = time.monotonic()
+        for key, since in list(self.first_seen.items()):
+            if now - since > self.evict_timeout:
+                self._reject(key, None, f"{self.evict_timeout:.0f}초 안에 완성되지 않음")
+                continue
+            missing = [var for var in VARIABLES if var not in self.paths[key]]
+            if missing and key not in self.reported and now - since > self.incomplete_timeout:
+                self.reported.add(key)  # 파일은 모두 도착했고 파싱만 대기 중인 사이클은 제외
+                self._publish({"type": "incomplete", "rid": key.rsplit("_", 1)[1], "cycles": [key],
+                               "missing": missing})
+        return len(paths)
+
+    async def _parse(self, info, path):
+        key = info["cycle"]
+        async with self._semaphore:
+            if key in self.invalid:
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                values = await loop.run_in_executor(self._executor, parse_signal, path, self.grid)
+            except Exception as exc:
+                self._reject(key, info["variable"], f"{os.path.basename(path)}: {exc}")
+                return
+        if key in self.invalid:
+            return
+        signals = self.partial[key]
+        signals[info["variable"]] = values
+        if len(signals) == len(VARIABLES):
+            self.ready[key] = self.partial.pop(key)
+            self.first_seen.pop(key, None)
+            if self.ready_since is None:
+                self.ready_since = time.monotonic()
+
+    def _reject(self, key, variable, reason):
+        self.invalid.add(key)
+        self._evict(key)
+        self._publish({"type": "invalid", "rid": key.rsplit("_", 1)[1], "cycles": [key],
+                       "variable": variable, "reason": reason})
+
+    def _evict(self, key):
+        """저장/제외가 끝난 사이클의 파일별 상태 정리 (키는 stored/invalid에 남아 재처리되지 않음)"""
+        self.paths.pop(key, None)
+        self.started.pop(key, None)
+        self.partial.pop(key, None)
+        self.first_seen.pop(key, None)
+        self.reported.discard(key)
+
+    # ---------------- 저장 ----------------
+    async def flush(self, force=False):
+        """저장 대기 사이클을 저장소에 한 번에 추가 (batch_size 도달 / flush_interval 경과 / force)"""
+        if not self.ready:
+            return []
+        waited = time.monotonic() - self.ready_since
+        if not force and len(self.ready) < self.batch_size and waited < self.flush_interval:
+            return []
+        batch, self.ready, self.ready_since = self.ready, {}, None
+
+        loop = asyncio.get_running_loop()
+        try:
+            added = await loop.run_in_executor(self._executor, append_cycles, batch, self.store_dir,
+                                               self.t_end, self.dt)
+        except Exception as exc:
+            # 저장 실패 (디스크 부족 등): 대기열에 되돌려 다음 주기에 재시도
+            self.ready = {**batch, **self.ready}
+            self.ready_since = time.monotonic()
+            self._publish({"type": "error", "rid": None, "cycles": sorted(batch), "reason": str(exc)})
+            return []
+        self.stored.update(batch)
+        for key in batch:
+            self._evict(key)
+        by_rid = defaultdict(list)
+        for key in added:
+            by_rid[key.rsplit("_", 1)[1]].append(key)
+        for rid, keys in sorted(by_rid.items()):
+            self._publish({"type": "stored", "rid": rid, "cycles": keys,
+                           "signals": {key: batch[key] for key in keys}})
+        return added
+
+    async def run(self, stop=None):
+        stop = stop or asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_parallel)
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            self._executor = executor
+            while not stop.is_set():
+                await self.poll_once()
+                await self.flush()
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+            if self.tasks:
+                await asyncio.gather(*self.tasks)
+            await self.flush(force=True)
+        self._executor = None
+
+
+async def classify_subscriber(queue, grid):
+    """예시 구독자: 저장된 사이클을 바로 특징량 계산 + 규칙 판정 (grid: 서비스 공통 시간축)"""
+    from optimold.features import FEATURE_COLUMNS, compute_features
+    from optimold.scenario_rules import classify
+
+    while True:
+        event = await queue.get()
+        if event["type"] != "stored":
+            print(f"  [{event['type']}] {', '.join(event['cycles'])} {event.get('missing') or event.get('reason', '')}")
+            continue
+        keys = event["cycles"]
+        signals = {var: np.stack([event["signals"][key][var] for key in keys]) for var in VARIABLES}
+        features = compute_features(signals, grid)
+        scenarios = classify({col: features[:, j] for j, col in enumerate(FEATURE_COLUMNS)})
+        for key, scenario in zip(keys, scenarios):
+            print(f"  [stored] {key} → {scenario}")
+
+
+async def main():
+    service = IngestService()
+    consumer = asyncio.create_task(classify_subscriber(service.subscribe(), service.grid))
+    print(f"[…] 결과 디렉토리 감시 시작: {service.csv_dir} → {service.store_dir}")
+    try:
+        await service.run()
+    finally:
+        consumer.cancel()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("[✓] 수집 데몬 종료")
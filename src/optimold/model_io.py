@@ -0,0 +1,32 @@
+# src/optimold/model_io.py
+
+"""
+학습된 모델 저장/로딩 (joblib)
+
+- JoblibModel을 상속한 모델은 save(path) / load(path)를 공유 (surrogate_model, sweep)
+- 저장은 임시 파일에 쓴 뒤 원자적으로 교체 → 대시보드는 항상 완전한 모델 파일만 읽음
+"""
+
+import os
+
+import joblib
+
+
+class JoblibModel:
+    """default_path: 경로를 생략했을 때 쓰는 모델 파일 경로 (하위 클래스에서 지정)"""
+
+    default_path = None
+
+    def save(self, path=None):
+        path = path or self.default_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        joblib.dump(self, tmp)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=None):
+        model = joblib.load(path or cls.default_path)
+        if not isinstance(model, cls):
+            raise TypeError(f"{path or cls.default_path}: {cls.__name__} 모델 파일이 아닙니다 ({type(model).__name__})")
+        return model
@@ -0,0 +1,399 @@
+# src/optimold/online_detector.py
+
+"""
+사이클 진행 중 실시간 이상 탐지 (스트리밍)
+
+- 입력: 후처리가 내보내는 신호 샘플 묶음 push(신호, t, v) → 신호 스트림 종료 시 finish(신호)
+- 신호별 상태는 O(1) 메모리: 직전 샘플 / 기울기 계산용 꼬리 2개 / 누적 카운터만 보관
+  · 가변 간격 샘플은 공통 시간축(dt 간격)으로 즉시 선형 보간 (cycle_store.resample와 같은 값)
+  · 기울기는 np.gradient(샘플 간격 1)와 같은 정의를 스트림으로 계산 (구간 첫/끝 샘플은 한쪽 차분)
+- 특징량 누적기는 최종값의 [하한, 상한]을 유지
+  · Volume_max: 현재까지 최댓값 ~ (스트림 종료 전 상한 없음)
+  · flat ratio / flat duration / jetting duration: 현재 개수 ~ 현재 개수 + 남은 샘플 수
+- 판정 규칙(optimold.scenario_rules.RULES)을 구간 논리로 평가 (참 / 거짓 / 미정)
+  · alert: 규칙 조건이 확정적으로 참이 되는 즉시 발생 (예: Volume이 55 초과하는 순간 Flash)
+  · decision: 우선순위상 앞선 규칙이 모두 거짓으로 확정되고 현재 규칙이 참이면 최종 시나리오 확정
+- 최종 특징량 값은 features.py(1ms 저장소 기준)와 동일
+- 샘플 공급원
+  · LiveMonitor: 결과 디렉토리에서 postprocess가 쓰고 있는 CSV를 tail로 따라 읽어 사이클별 판정기에 공급
+    (신호 파일이 도착하는 대로, 파일 안에서도 새로 쓰인 행만 읽음 → 10개 파일 저장 완료를 기다리지 않음)
+    파일 크기가 idle_polls번 연속 그대로면 해당 신호 스트림 종료로 간주
+  · replay_cycle: 저장된 CSV를 chunk_size 샘플씩 재생 (검증용)
+"""
+
+import math
+import os
+import time
+
+import numpy as np
+
+from optimold.features import FLAT_THRESHOLD, JETTING_THRESHOLD
+from optimold.result_files import CSV_DIR, parse_result_filename, read_signal_csv
+from optimold.scenario_rules import DEFAULT_SCENARIO, RULES
+
+
+class StreamResampler:
+    """가변 간격 (t, v) 묶음 → 고정 시간축 값 (앞/뒤 범위 밖은 첫/마지막 값, np.interp와 동일)"""
+
+    def __init__(self, dt=1e-3, t_end=10.0):
+        self.dt = dt
+        self.n_total = int(round(t_end / dt)) + 1
+        self.next_index = 0
+        self.last = None  # 직전 원본 샘플 (t, v)
+
+    def _grid(self, lo, hi):
+        return np.round(np.arange(lo, hi) * self.dt, 9)
+
+    def push(self, t, v):
+        t = np.asarray(t, dtype=float)
+        v = np.asarray(v, dtype=float)
+        if t.size == 0:
+            return np.empty(0), np.empty(0)
+        if self.last is not None:
+            t = np.concatenate(([self.last[0]], t))
+            v = np.concatenate(([self.last[1]], v))
+        hi = min(int(math.floor(round(t[-1] / self.dt, 9))) + 1, self.n_total)
+        grid = self._grid(self.next_index, max(hi, self.next_index))
+        self.next_index += len(grid)
+        self.last = (t[-1], v[-1])
+        return grid, np.interp(grid, t, v)
+
+    def finish(self):
+        """스트림 종료: 남은 시간축 지점은 마지막 값으로 채움"""
+        grid = self._grid(self.next_index, self.n_total)
+        self.next_index = self.n_total
+        fill = np.nan if self.last is None else self.last[1]
+        return grid, np.full(len(grid), fill)
+
+
+class StreamGradient:
+    """np.gradient(x)와 같은 값을 샘플 묶음 단위로 계산 (마지막 샘플은 다음 샘플/종료 시 확정)"""
+
+    def __init__(self):
+        self.tail = np.empty(0)  # 기울기가 아직 확정되지 않은 마지막 샘플과 그 직전 샘플
+        self.started = False
+
+    def push(self, x):
+        x = np.asarray(x, dtype=float)
+        buf = np.concatenate((self.tail, x))
+        if len(buf) < 2:
+            self.tail = buf
+            return np.empty(0)
+        if not self.started:
+            grads = np.concatenate(([buf[1] - buf[0]], (buf[2:] - buf[:-2]) / 2))
+            self.started = True
+        else:
+            grads = (buf[2:] - buf[:-2]) / 2
+        self.tail = buf[-2:]
+        return grads
+
+    def finish(self):
+        if len(self.tail) < 2:
+            return np.zeros(len(self.tail))
+        return np.array([self.tail[-1] - self.tail[-2]])
+
+
+class RunningMax:
+    """최댓값 누적기 (Volume_max)"""
+
+    def __init__(self, signal):
+        self.signal = signal
+        self.value = -np.inf
+        self.done = False
+
+    def update(self, time, values):
+        if len(values):
+            self.value = max(self.value, float(np.nanmax(values)))
+
+    def finish(self):
+        self.done = True
+
+    def bounds(self):
+        if self.done:
+            final = np.nan if self.value == -np.inf else self.value
+            return final, final
+        return self.value, np.inf
+
+
+class GradientCounter:
+    """
+    구간(t > t_from) 기울기 조건 개수 누적기
+    - mode="ratio": 개수 / 구간 샘플 수, mode="duration": 개수 × dt
+    - flat: |기울기| < threshold, jetting: |기울기(|x|)| > threshold
+    """
+
+    def __init__(self, signal, grid, t_from=None, threshold=FLAT_THRESHOLD, kind="flat", mode="duration"):
+        self.signal = signal
+        self.t_from = t_from
+        self.threshold = threshold
+        self.kind = kind
+        self.mode = mode
+        self.dt = float(np.mean(np.diff(grid)))
+        self.n_window = int(np.count_nonzero(grid > t_from)) if t_from is not None else len(grid)
+        self.gradient = StreamGradient()
+        self.count = 0
+        self.seen = 0
+        self.done = False
+
+    def _count(self, grads):
+        if self.kind == "flat":
+            self.count += int(np.count_nonzero(np.abs(grads) < self.threshold))
+        else:
+            self.count += int(np.count_nonzero(np.abs(grads) > self.threshold))
+
+    def update(self, time, values):
+        if self.t_from is not None:
+            values = values[time > self.t_from]
+        if self.kind == "jetting":
+            values = np.abs(values)
+        self.seen += len(values)
+        self._count(self.gradient.push(values))
+
+    def finish(self):
+        self._count(self.gradient.finish())
+        self.done = True
+
+    def _scale(self, count):
+        return count / self.n_window if self.mode == "ratio" else count * self.dt
+
+    def bounds(self):
+        if self.done:
+            return self._scale(self.count), self._scale(self.count)
+        pending = self.n_window - self.seen + (1 if self.seen else 0)  # 마지막 샘플 기울기는 미확정
+        return self._scale(self.count), self._scale(self.count + pending)
+
+
+def make_accumulators(grid):
+    """판정 규칙이 쓰는 특징량 → 누적기 (특징량 정의는 optimold.features와 동일)"""
+    return {
+        "Volume_max": RunningMax("Volume"),
+        "Piston_Velocity_flat_ratio_t6": GradientCounter("Piston_Velocity", grid, t_from=6.0, mode="ratio"),
+        "Piston_Velocity_flat_duration_t8": GradientCounter("Piston_Velocity", grid, t_from=8.0),
+        "Flow_Rate_jetting_duration": GradientCounter("Flow_Rate", grid, threshold=JETTING_THRESHOLD,
+                                                      kind="jetting"),
+    }
+
+
+def condition_state(op, threshold, lo, hi):
+    """최종값 ∈ [lo, hi]일 때 조건 판정: True / False / None(미정), NaN은 거짓"""
+    if np.isnan(lo) or np.isnan(hi):
+        return False
+    if op == "<":
+        return True if hi < threshold else False if lo >= threshold else None
+    if op == "<=":
+        return True if hi <= threshold else False if lo > threshold else None
+    if op == ">":
+        return True if lo > threshold else False if hi <= threshold else None
+    if op == ">=":
+        return True if lo >= threshold else False if hi < threshold else None
+    raise ValueError(f"지원하지 않는 비교 연산자: {op}")
+
+
+class OnlineDetector:
+    """
+    사이클 1개 실시간 판정기 (사이클마다 새로 생성)
+    - push(signal, t, v) / finish(signal) → 새로 발생한 이벤트 리스트
+      이벤트: {"type": "alert" | "decision", "scenario", "signal", "time"(해당 신호 스트림 시각)}
+    - decision: 확정된 최종 시나리오 (미정이면 None)
+    """
+
+    def __init__(self, rules=RULES, dt=1e-3, t_end=10.0):
+        grid = np.round(np.arange(0.0, t_end + dt / 2, dt), 9)
+        accumulators = make_accumulators(grid)
+        missing = {c for rule in rules for c, _, _ in rule["conditions"]} - set(accumulators)
+        if missing:
+            raise ValueError(f"스트리밍 누적기가 없는 특징량: {sorted(missing)}")
+        self.rules = rules
+        self.accumulators = accumulators
+        self.signals = sorted({acc.signal for acc in accumulators.values()})
+        self.resamplers = {signal: StreamResampler(dt, t_end) for signal in self.signals}
+        self.alerted = set()
+        self.decision = None
+        self.stream_time = {signal: 0.0 for signal in self.signals}
+
+    def _feed(self, signal, time, values):
+        for acc in self.accumulators.values():
+            if acc.signal == signal:
+                acc.update(time, values)
+        if len(time):
+            self.stream_time[signal] = float(time[-1])
+
+    def push(self, signal, t, v):
+        if signal not in self.resamplers:
+            return []
+        self._feed(signal, *self.resamplers[signal].push(t, v))
+        return self._evaluate(signal)
+
+    def finish(self, signal):
+        if signal not in self.resamplers:
+            return []
+        self._feed(signal, *self.resamplers[signal].finish())
+        for acc in self.accumulators.values():
+            if acc.signal == signal:
+                acc.finish()
+        return self._evaluate(signal)
+
+    def rule_states(self):
+        """[(시나리오, True / False / None)] (우선순위 순서)"""
+        bounds = {name: acc.bounds() for name, acc in self.accumulators.items()}
+        states = []
+        for rule in self.rules:
+            conds = [condition_state(op, thr, *bounds[col]) for col, op, thr in rule["conditions"]]
+            state = False if False in conds else True if all(c is True for c in conds) else None
+            states.append((rule["scenario"], state))
+        return states
+
+    def _evaluate(self, signal):
+        events = []
+        states = self.rule_states()
+        for scenario, state in states:
+            if state is True and scenario not in self.alerted:
+                self.alerted.add(scenario)
+                events.append({"type": "alert", "scenario": scenario, "signal": signal,
+                               "time": self.stream_time[signal]})
+
+        if self.decision is None:
+            decided = DEFAULT_SCENARIO
+            for scenario, state in states:
+                if state is None:
+                    decided = None
+                    break
+                if state:
+                    decided = scenario
+                    break
+            if decided is not None:
+                self.decision = decided
+                events.append({"type": "decision", "scenario": decided, "signal": signal,
+                               "time": self.stream_time[signal]})
+        return events
+
+    def features(self):
+        """현재 특징량 [하한, 상한] (스트림이 끝난 신호는 하한 = 상한 = 최종값)"""
+        return {name: acc.bounds() for name, acc in self.accumulators.items()}
+
+
+def replay_cycle(paths, chunk_size=200, detector=None):
+    """
+    저장된 사이클 CSV({신호: 경로})를 chunk_size 샘플씩 신호 순서대로 흘려보내는 재생기
+    반환값: (판정기, 이벤트 리스트)
+    """
+    detector = detector or OnlineDetector()
+    events = []
+    for signal in detector.signals:
+        if signal not in paths:
+            events += detector.finish(signal)
+            continue
+        t, v = read_signal_csv(paths[signal])
+        for lo in range(0, len(t), chunk_size):
+            events += detector.push(signal, t[lo:lo + chunk_size], v[lo:lo + chunk_size])
+        events += detector.finish(signal)
+    return detector, events
+
+
+class CsvTail:
+    """쓰는 중인 결과 CSV를 따라 읽기: read()마다 마지막 위치 이후의 완전한 행만 (t, v) 배열로 반환"""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.pending = b""  # 아직 줄바꿈이 오지 않은 마지막 행 조각
+        self.header = False
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        lines = (self.pending + data).split(b"\n")
+        self.pending = lines.pop()
+        if not self.header and lines:
+            lines.pop(0)
+            self.header = True
+        rows = [line.decode("utf-8").rstrip("\r").split(",") for line in lines if line.strip()]
+        if not rows:
+            return np.empty(0), np.empty(0)
+        t = np.array([r[0].replace("초", "").replace("s", "") for r in rows], dtype=float)  # clean_time과 동일
+        v = np.array([r[1] for r in rows], dtype=float)
+        return t, v
+
+    def flush(self):
+        """스트림 종료: 줄바꿈 없이 끝난 마지막 행까지 반환"""
+        if not self.pending.strip():
+            return np.empty(0), np.empty(0)
+        self.pending += b"\n"
+        return self.read()
+
+
+class LiveMonitor:
+    """
+    결과 디렉토리 실시간 판정기
+    - poll(): 판정기가 쓰는 신호(Volume / Piston_Velocity / Flow_Rate)의 결과 CSV를 새로 쓰인 만큼 공급
+      반환값: 새 이벤트 리스트 (OnlineDetector 이벤트 + "cycle": 사이클 키)
+    - 판정이 확정되고 모든 신호 스트림이 끝난 사이클, cycle_timeout초가 지난 사이클은 추적 종료
+    - skip_existing: 시작 시점에 이미 파일이 있던 사이클은 건너뜀
+    """
+
+    def __init__(self, csv_dir=CSV_DIR, rules=RULES, idle_polls=2, cycle_timeout=120.0, dt=1e-3, t_end=10.0,
+                 skip_existing=True):
+        self.csv_dir = csv_dir
+        self.rules = rules
+        self.idle_polls = idle_polls
+        self.cycle_timeout = cycle_timeout
+        self.dt, self.t_end = dt, t_end
+        self.cycles = {}  # 사이클 키 → {"detector", "tails", "sizes", "idle", "ended", "since"}
+        self.closed = set()
+        self.signals = OnlineDetector(rules, dt, t_end).signals
+        if skip_existing:  # 시작 시점에 이미 있던 사이클은 실시간 대상이 아님
+            self.closed = {info["cycle"] for info in map(parse_result_filename, os.listdir(csv_dir)) if info}
+
+    def _cycle(self, key):
+        if key not in self.cycles:
+            self.cycles[key] = {"detector": OnlineDetector(self.rules, self.dt, self.t_end), "tails": {},
+                                "sizes": {}, "idle": {}, "ended": set(), "since": time.monotonic()}
+        return self.cycles[key]
+
+    def poll(self):
+        events = []
+        with os.scandir(self.csv_dir) as entries:
+            for entry in entries:
+                info = parse_result_filename(entry.name)
+                if info is None or info["variable"] not in self.signals or info["cycle"] in self.closed:
+                    continue
+                state = self._cycle(info["cycle"])
+                signal = info["variable"]
+                if signal in state["ended"] or (signal in state["tails"] and state["tails"][signal].path != entry.path):
+                    continue  # 같은 사이클/변수 중복 파일은 처음 본 파일만 사용
+                tail = state["tails"].setdefault(signal, CsvTail(entry.path))
+                size = entry.stat().st_size
+                detector = state["detector"]
+                if size != state["sizes"].get(signal):
+                    state["sizes"][signal], state["idle"][signal] = size, 0
+                    new = detector.push(signal, *tail.read())
+                else:
+                    state["idle"][signal] += 1
+                    new = []
+                    if state["idle"][signal] >= self.idle_polls:
+                        new = detector.push(signal, *tail.flush()) + detector.finish(signal)
+                        state["ended"].add(signal)
+                events += [{**event, "cycle": info["cycle"]} for event in new]
+
+        now = time.monotonic()
+        for key, state in list(self.cycles.items()):
+            done = state["detector"].decision is not None and len(state["ended"]) == len(self.signals)
+            if done or now - state["since"] > self.cycle_timeout:
+                self.closed.add(key)
+                del self.cycles[key]
+        return events
+
+
+if __name__ == "__main__":
+    monitor = LiveMonitor()
+    print(f"[…] 실시간 판정 시작: {monitor.csv_dir}")
+    try:
+        while True:
+            for event in monitor.poll():
+                print(f"  [{event['type']}] {event['cycle']} {event['scenario']} "
+                      f"({event['signal']} t={event['time']:.3f}s)")
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        print("[✓] 실시간 판정 종료")
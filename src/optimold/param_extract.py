@@ -0,0 +1,115 @@
+# src/optimold/param_extract.py
+
+"""
+사이클 결과 CSV → 입력 매개변수(Inject, Backpr_amp, Retract_delay, Nozzle_delay) 추출 엔진
+
+- 신호 파일은 사이클당 1회만 읽고, 같은 구간의 통계(평균/최대/24bar 도달 시각)를 함께 계산
+- 24bar 도달 시각: np.flatnonzero로 첫 상승 교차 구간을 찾아 선형 보간 (Python 루프 없음)
+- extract_cycles: 여러 사이클을 프로세스 풀로 나눠 처리 (결과 순서는 입력 순서 유지)
+  읽을 수 없는 파일(손상/빈 파일)이 있는 사이클은 모든 항목 NaN (배치 전체를 중단하지 않음)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# 유효 시간대 설정
+INJECT_VALID_TIME = (5.6, 5.8)
+BACKPR_NOISE_TIME = (0.0, 2.02)  # Backpr_amp 기준 시간대
+RETRACT_VALID_TIME = (2.0, 2.6)
+NOZZLE_VALID_TIME = (5.6, 8.5)
+
+# 24bar 도달 시각 → 지연 시간 환산 기준
+CROSS_LEVEL = 24.0
+RETRACT_OFFSET = 2.06
+NOZZLE_OFFSET = 5.64
+
+
+def read_signal(path):
+    """결과 CSV 1개를 (t, v) float 배열로 로딩 (기존 추출 스크립트와 동일하게 skiprows=1)"""
+    df = pd.read_csv(path, skiprows=1)
+    return df.iloc[:, 0].astype(float).values, df.iloc[:, 1].astype(float).values
+
+
+def window(t, v, valid_time):
+    idx = (t >= valid_time[0]) & (t <= valid_time[1])
+    return t[idx], v[idx]
+
+
+def window_stat(v_window, method="mean"):
+    if len(v_window) == 0:
+        return np.nan
+    if method == "mean":
+        return float(np.mean(v_window))
+    elif method == "max":
+        return float(np.max(v_window))
+    elif method == "std":
+        return float(np.std(v_window))
+    return np.nan
+
+
+def crossing_time(t_window, v_window, level=CROSS_LEVEL):
+    """구간 내 level 첫 상승 교차 시각 (v[i-1] < level <= v[i] 구간 선형 보간), 없으면 NaN"""
+    if len(t_window) < 2 or v_window.max() < level:
+        return np.nan
+    hits = np.flatnonzero((v_window[:-1] < level) & (v_window[1:] >= level))
+    if len(hits) == 0:
+        return np.nan
+    i = hits[0] + 1
+    t1, t2 = t_window[i - 1], t_window[i]
+    v1, v2 = v_window[i - 1], v_window[i]
+    return t1 + (level - v1) * (t2 - t1) / (v2 - v1)
+
+
+def _delay(t, v, valid_time, offset):
+    """24bar 도달 시각 - offset (보간 실패 시 구간 최대값으로 대체)"""
+    t_window, v_window = window(t, v, valid_time)
+    cross = crossing_time(t_window, v_window)
+    if not np.isnan(cross):
+        return cross - offset
+    return window_stat(v_window, "max")
+
+
+def extract_cycle(paths, base_pressure=26.0, noise_std=0.7):
+    """
+    사이클 1개 매개변수 추출
+    - paths: {"Inject", "Backpr", "Retract", "Nozzle": 파일 경로}
+    - 반환값: {"Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay"} (계산 불가 항목은 NaN)
+    """
+    signals = {var: read_signal(paths[var]) for var in ("Inject", "Backpr", "Retract", "Nozzle")}
+
+    inject = window_stat(window(*signals["Inject"], INJECT_VALID_TIME)[1], "mean")
+
+    # Backpressure 노이즈 추정값 (정규화된 평균 편차)
+    backpr_mean = window_stat(window(*signals["Backpr"], BACKPR_NOISE_TIME)[1], "mean")
+    backpr = float((backpr_mean - base_pressure) / noise_std)
+
+    return {
+        "Inject": inject,
+        "Backpr_amp": backpr,
+        "Retract_delay": _delay(*signals["Retract"], RETRACT_VALID_TIME, RETRACT_OFFSET),
+        "Nozzle_delay": _delay(*signals["Nozzle"], NOZZLE_VALID_TIME, NOZZLE_OFFSET),
+    }
+
+
+def _extract_or_nan(paths):
+    try:
+        return extract_cycle(paths)
+    except (OSError, ValueError, IndexError):
+        return dict.fromkeys(("Inject", "Backpr_amp", "Retract_delay", "Nozzle_delay"), np.nan)
+
+
+def extract_cycles(cycle_paths, n_workers=None, chunksize=32):
+    """
+    여러 사이클 매개변수 추출 (프로세스 풀)
+    - cycle_paths: extract_cycle 입력 dict 리스트
+    - n_workers: 프로세스 수 (None이면 CPU 수, 1 이하면 현재 프로세스에서 순차 처리)
+    - 반환값: 입력 순서와 같은 결과 dict 리스트 (읽기 실패 사이클은 모든 항목 NaN)
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers <= 1 or len(cycle_paths) <= chunksize:
+        return [_extract_or_nan(p) for p in cycle_paths]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(_extract_or_nan, cycle_paths, chunksize=chunksize))
@@ -0,0 +1,114 @@
+# src/optimold/param_table.py
+
+"""
+input_params.csv 증분 갱신 유틸리티 (워터마크 방식)
+
+- 워터마크: 테이블에 마지막으로 반영된 run_id (run_id는 시간순 문자열이므로 사전순 비교)
+- 워터마크는 테이블 옆 {테이블}.watermark.json 에 생성 스크립트(key)별로 기록
+  (generate_input_params / generate_binlabel_column이 같은 경로에 서로 다른 컬럼으로 저장하므로 분리)
+- 테이블이 없거나 컬럼 구성이 기록과 다르면 워터마크를 무시하고 전체 재생성
+- 처리 완료 = 행 저장 성공 또는 추출 실패(failed, 노즐 신호 없음/파일 손상 등 재시도해도 같은 결과)
+  아직 파일이 덜 도착한 사이클만 미완료 (단, 마지막 파일 도착 후 PENDING_TIMEOUT초가 지나면 실패로 간주)
+- 워터마크는 '연속으로 처리 완료된' run_id까지만 이동 (advance_watermark)
+  병렬 배치 시뮬레이션은 순서 없이 끝나므로, 가장 이른 미완료 run_id 직전에서 멈춰야 그 사이클이 다음 실행에서 다시 검사됨
+- 워터마크 이후에 이미 처리된 run_id는 processed 목록으로 기록 → 저장한 행은 버리지 않고, 다음 실행에서 중복 추출하지 않음
+"""
+
+import json
+import os
+import time
+
+import pandas as pd
+
+WATERMARK_SUFFIX = ".watermark.json"
+PENDING_TIMEOUT = 3600.0  # 마지막 파일 도착 후 이 시간(초)이 지나도 파일이 모자라면 영구 누락으로 간주
+
+
+def _watermark_path(table_path):
+    return table_path + WATERMARK_SUFFIX
+
+
+def _read_state(table_path):
+    path = _watermark_path(table_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_watermark(table_path, key, columns):
+    """
+    key 스크립트의 워터마크(마지막 처리 run_id) 조회
+    반환값: run_id 문자열, 증분 불가(테이블 없음/컬럼 불일치/기록 없음)면 None
+    """
+    entry = _read_state(table_path).get(key)
+    if entry is None or not os.path.exists(table_path):
+        return None
+    header = pd.read_csv(table_path, nrows=0).columns.tolist()
+    if header != list(columns) or entry.get("columns") != list(columns):
+        return None
+    return entry["last_run_id"]
+
+
+def read_processed(table_path, key, watermark):
+    """워터마크 이후에 이미 처리(저장/실패)된 run_id 집합 (watermark None이면 전체 재생성이므로 빈 집합)"""
+    if watermark is None:
+        return set()
+    return set(_read_state(table_path).get(key, {}).get("processed", []))
+
+
+def write_watermark(table_path, key, columns, last_run_id, processed=()):
+    state = _read_state(table_path)
+    state[key] = {"last_run_id": last_run_id, "columns": list(columns), "processed": sorted(processed)}
+    path = _watermark_path(table_path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def pending_run_ids(run_ids, watermark, processed=()):
+    """워터마크 이후의 아직 처리되지 않은 run_id만 시간순으로 반환 (워터마크 None이면 전체)"""
+    return sorted(r for r in run_ids if (watermark is None or r > watermark) and r not in processed)
+
+
+def is_overdue(paths, timeout=PENDING_TIMEOUT):
+    """도착한 파일 중 가장 최근 파일도 timeout초 이상 지났으면 True (모자란 파일은 영구 누락으로 간주)"""
+    mtimes = [os.path.getmtime(p) for p in paths if p and os.path.exists(p)]
+    return not mtimes or time.time() - max(mtimes) > timeout
+
+
+def advance_watermark(pending, done):
+    """
+    pending(시간순 run_id) 중 앞에서부터 끊김 없이 처리 완료(done)된 마지막 run_id
+    가장 이른 미완료 run_id 직전에서 멈춤, 첫 run_id부터 미완료면 None (기존 워터마크 유지)
+    """
+    done = set(done)
+    last = None
+    for run_id in pending:
+        if run_id not in done:
+            break
+        last = run_id
+    return last
+
+
+def save_rows(table_path, df, key, watermark, pending, failed=()):
+    """
+    신규 행 저장 및 워터마크 갱신
+    - watermark가 있으면 기존 테이블 뒤에 추가, 없으면 테이블 전체를 새로 저장
+    - pending: 이번 실행에서 검사한 run_id, failed: 그중 추출에 실패한 run_id (행 없이 처리 완료)
+      df의 행은 모두 저장, 워터마크는 연속으로 처리 완료된 run_id까지만 이동 (파일 미도착 사이클에서 멈춤)
+      워터마크 이후에 처리된 run_id는 processed로 기록되어 다음 실행에서 다시 추출하지 않음
+    반환값: 저장한 행 수
+    """
+    previous = read_processed(table_path, key, watermark)
+    processed = previous | set(df["run_id"].astype(str)) | set(failed)
+    last_run_id = advance_watermark(sorted(set(pending) | previous), processed) or watermark
+    if watermark is not None:
+        if len(df):
+            df.to_csv(table_path, mode="a", header=False, index=False)
+    else:
+        df.to_csv(table_path, index=False)
+    write_watermark(table_path, key, df.columns, last_run_id,
+                    [r for r in processed if last_run_id is None or r > last_run_id])
+    return len(df)
@@ -0,0 +1,67 @@
+# src/optimold/result_files.py
+
+"""
+Simulink 결과 CSV 파일 규칙 모음
+- 파일명: {변수}_{YYYYMMDD}_{HHMMSS}_RID{run_id}.csv (예: Piston_Pressure_20250605_134320_RID014.csv)
+- 한 사이클의 변수별 파일은 수 초 간격으로 저장되므로 사이클은 '분' 단위(YYYYMMDD_HHMM)로 묶음
+- 컬럼: Time,{변수} (일부 파일은 Time 값에 '초' 단위 문자열 포함)
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+CSV_DIR = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/csv_results"
+
+VARIABLES = [
+    "Backpr", "Extruder", "Flow_Rate", "Inject", "Nozzle",
+    "Piston_Position", "Piston_Pressure", "Piston_Velocity", "Retract", "Volume"
+]
+
+RESULT_PATTERN = re.compile(r"^(?P<variable>[A-Za-z_]+?)_(?P<date>\d{8})_(?P<time>\d{6})_RID(?P<rid>[0-9A-Za-z]+)\.csv$")
+
+
+def parse_result_filename(fname):
+    """
+    결과 CSV 파일명 파싱
+    반환값: {"variable", "date", "time", "rid", "stamp", "cycle"} 또는 규칙에 맞지 않으면 None
+    - stamp: YYYYMMDD_HHMMSS_RID014 (파일 단위)
+    - cycle: YYYYMMDD_HHMM_RID014 (사이클 단위)
+    """
+    match = RESULT_PATTERN.match(fname)
+    if not match or match.group("variable") not in VARIABLES:
+        return None
+    info = match.groupdict()
+    info["stamp"] = f"{info['date']}_{info['time']}_RID{info['rid']}"
+    info["cycle"] = cycle_key(info["date"], info["time"], info["rid"])
+    return info
+
+
+def cycle_key(date, time, rid):
+    """분 단위 사이클 키 (YYYYMMDD_HHMM_RID{rid})"""
+    return f"{date}_{time[:4]}_RID{rid}"
+
+
+def clean_time(values):
+    """Time 컬럼의 '초'/'s' 단위 문자열 제거 후 float 변환"""
+    if values.dtype == object:
+        values = values.astype(str).str.replace("초", "", regex=False).str.replace("s", "", regex=False)
+    return values.astype(float).to_numpy()
+
+
+def read_signal_csv(path):
+    """결과 CSV 1개를 (time, value) float 배열로 로딩"""
+    df = pd.read_csv(path)
+    t = clean_time(df.iloc[:, 0])
+    v = df.iloc[:, 1].astype(float).to_numpy()
+    return t, v
+
+
+def resample(t, v, grid):
+    """가변 간격 시계열을 고정 시간축 grid로 선형 보간 (시간 오름차순 정렬 포함)"""
+    if len(t) == 0:
+        return np.full(len(grid), np.nan)
+    if np.any(np.diff(t) < 0):
+        order = np.argsort(t, kind="stable")
+        t, v = t[order], v[order]
+    return np.interp(grid, t, v)
@@ -0,0 +1,159 @@
+# src/optimold/result_index.py
+
+"""
+시뮬레이션 결과 CSV 색인 (SQLite manifest)
+
+glob + 정규식 스캔을 호출부마다 반복하는 대신, 파일 정보를 한 번만 색인해 두고 조회
+- files 테이블: 파일명 → 변수, 날짜/시각, RID, 사이클 키, 경로, 크기, mtime
+  seq: 등록 순번 (AUTOINCREMENT, 삭제된 행 번호를 재사용하지 않음 → 증분 추적 커서로 사용)
+- refresh(): 결과 디렉토리 mtime이 마지막 색인 이후 그대로면 디렉토리를 다시 읽지 않음,
+             바뀌었으면 새로 생기거나 변경된 파일만 반영 (사라진 파일은 삭제)
+             ※ 기존 CSV를 같은 이름으로 덮어쓰면 디렉토리 mtime이 바뀌지 않으므로 감지되지 않음
+               → 덮어쓴 쪽에서 register_files() 호출 또는 refresh(force=True)
+- register_files(): 시뮬레이션 postprocess 직후 생성 파일만 바로 등록
+- 조회: query / files_by_variable / files_by_cycle
+"""
+
+import os
+import sqlite3
+from collections import defaultdict
+from contextlib import closing
+
+from optimold.result_files import CSV_DIR, VARIABLES, parse_result_filename
+
+INDEX_PATH = os.path.join(os.path.dirname(CSV_DIR), "results_index.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    seq      INTEGER PRIMARY KEY AUTOINCREMENT,
+    dir      TEXT NOT NULL,
+    fname    TEXT NOT NULL,
+    variable TEXT NOT NULL,
+    date     TEXT NOT NULL,
+    time     TEXT NOT NULL,
+    rid      TEXT NOT NULL,
+    stamp    TEXT NOT NULL,
+    cycle    TEXT NOT NULL,
+    path     TEXT NOT NULL,
+    size     INTEGER,
+    mtime    REAL,
+    UNIQUE (dir, fname)
+);
+CREATE INDEX IF NOT EXISTS idx_files_var ON files (dir, rid, variable, fname);
+CREATE INDEX IF NOT EXISTS idx_files_cycle ON files (dir, rid, cycle);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def connect(db_path=INDEX_PATH):
+    """색인 DB 연결 (호출부에서 closing()으로 닫음, with conn은 커밋/롤백만 수행)"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")  # 조회 중에도 postprocess 쪽 등록 가능
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(files)")]
+    if columns and "seq" not in columns:
+        # seq 컬럼 이전 형식의 색인: 파일 정보는 디렉토리에서 다시 만들 수 있으므로 재구성
+        with conn:
+            conn.execute("DROP TABLE files")
+            conn.execute("DROP TABLE IF EXISTS meta")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _row(path, stat):
+    fname = os.path.basename(path)
+    info = parse_result_filename(fname)
+    if info is None:
+        return None
+    return (os.path.dirname(path), fname, info["variable"], info["date"], info["time"], info["rid"],
+            info["stamp"], info["cycle"], path, stat.st_size, stat.st_mtime)
+
+
+def _upsert(conn, rows):
+    # 같은 (dir, fname) 행은 삭제 후 새 seq로 다시 삽입 → 변경된 파일도 추적기 커서 이후로 다시 보임
+    conn.executemany(
+        "INSERT OR REPLACE INTO files (dir, fname, variable, date, time, rid, stamp, cycle, path, size, mtime) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def register_files(paths, db_path=INDEX_PATH):
+    """postprocess가 방금 저장한 파일만 색인에 추가 (디렉토리 전체 스캔 없음)"""
+    rows = [r for r in (_row(os.path.abspath(p), os.stat(p)) for p in paths) if r is not None]
+    with closing(connect(db_path)) as conn, conn:
+        _upsert(conn, rows)
+    return len(rows)
+
+
+def refresh(csv_dir=CSV_DIR, db_path=INDEX_PATH, force=False):
+    """
+    결과 디렉토리와 색인 동기화
+    반환값: 새로 추가/변경된 파일 수 (디렉토리 변경이 없으면 0, 스캔 생략)
+    - force=True: 디렉토리 mtime과 무관하게 전체 파일의 mtime 비교 (같은 이름으로 덮어쓴 파일 반영)
+    """
+    csv_dir = os.path.abspath(csv_dir)
+    dir_mtime = os.stat(csv_dir).st_mtime_ns
+    with closing(connect(db_path)) as conn, conn:
+        cur = conn.execute("SELECT value FROM meta WHERE key = ?", (f"dir_mtime:{csv_dir}",)).fetchone()
+        if not force and cur is not None and int(cur[0]) == dir_mtime:
+            return 0
+
+        known = dict(conn.execute("SELECT fname, mtime FROM files WHERE dir = ?", (csv_dir,)))
+        rows, seen = [], set()
+        with os.scandir(csv_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".csv"):
+                    continue
+                seen.add(entry.name)
+                stat = entry.stat()
+                if known.get(entry.name) == stat.st_mtime:
+                    continue
+                row = _row(entry.path, stat)
+                if row is not None:
+                    rows.append(row)
+
+        _upsert(conn, rows)
+        gone = [(csv_dir, f) for f in known if f not in seen]
+        conn.executemany("DELETE FROM files WHERE dir = ? AND fname = ?", gone)
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (f"dir_mtime:{csv_dir}", str(dir_mtime)))
+    return len(rows)
+
+
+def query(variable=None, rid=None, cycle=None, csv_dir=CSV_DIR, db_path=INDEX_PATH, auto_refresh=True):
+    """
+    조건에 맞는 파일 정보 리스트 (파일명 순)
+    반환값: [{"seq", "dir", "fname", "variable", "date", "time", "rid", "stamp", "cycle", "path", "size", "mtime"}, ...]
+    """
+    csv_dir = os.path.abspath(csv_dir)
+    if auto_refresh:
+        refresh(csv_dir, db_path)
+
+    clauses, args = ["dir = ?"], [csv_dir]
+    for col, val in (("variable", variable), ("rid", rid), ("cycle", cycle)):
+        if val is not None:
+            clauses.append(f"{col} = ?")
+            args.append(val)
+    sql = "SELECT * FROM files WHERE " + " AND ".join(clauses) + " ORDER BY fname"
+
+    with closing(connect(db_path)) as conn, conn:
+        conn.row_factory = sqlite3.Row
+        return [dict(r) for r in conn.execute(sql, args)]
+
+
+def files_by_variable(variables=VARIABLES, rid="014", limit=None, csv_dir=CSV_DIR, db_path=INDEX_PATH):
+    """{변수: 파일명 순 경로 리스트} (limit 지정 시 변수당 앞에서부터 limit개)"""
+    selected = {var: [] for var in variables}
+    for row in query(rid=rid, csv_dir=csv_dir, db_path=db_path):
+        paths = selected.get(row["variable"])
+        if paths is not None and (limit is None or len(paths) < limit):
+            paths.append(row["path"])
+    return selected
+
+
+def files_by_cycle(rid="014", csv_dir=CSV_DIR, db_path=INDEX_PATH):
+    """{사이클 키(YYYYMMDD_HHMM_RID014): {변수: 경로}} (같은 변수 파일이 여러 개면 가장 이른 파일)"""
+    cycles = defaultdict(dict)
+    for row in query(rid=rid, csv_dir=csv_dir, db_path=db_path):
+        cycles[row["cycle"]].setdefault(row["variable"], row["path"])
+    return dict(cycles)
@@ -0,0 +1,79 @@
+# src/optimold/rng_streams.py
+
+import hashlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# 하나의 난수 스트림이 담당하는 사이클 수
+BLOCK_SIZE = 256
+
+
+def run_key(run_id):
+    """run_id(문자열/숫자/None)를 SeedSequence spawn_key용 정수로 변환 (None만 빈 문자열, 0은 "0")"""
+    digest = hashlib.sha256(str("" if run_id is None else run_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def resolve_seed(seed=None):
+    """
+    루트 seed 확정
+    - seed가 None이면 OS 엔트로피로 새 seed를 만들고 출력 (재현 시 그대로 재사용)
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+        print(f"[i] root seed 자동 생성: {seed}")
+    return int(seed)
+
+
+def block_rng(seed, run_id, block):
+    """
+    (root seed, run_id, block index) 로 고정되는 독립 Generator
+    SeedSequence(seed).spawn() 트리에서 spawn_key=(run_key, block) 위치의 자식과 동일
+    """
+    ss = np.random.SeedSequence(entropy=int(seed), spawn_key=(run_key(run_id), int(block)))
+    return np.random.Generator(np.random.PCG64(ss))
+
+
+def draw_cycles(draw_fn, seed, run_id, start, n):
+    """
+    사이클 인덱스 [start, start + n) 구간의 난수 파라미터 샘플링
+    - draw_fn(rng, size) -> {name: (size, ...) 배열}
+    - 블록 단위로 항상 BLOCK_SIZE개 전체를 뽑은 뒤 잘라내므로,
+      어떤 방식으로 구간을 나눠도(샤딩) 직렬 실행과 비트 단위로 동일한 결과
+    """
+    if n <= 0:
+        return draw_fn(block_rng(seed, run_id, 0), 0)
+
+    stop = start + n
+    parts = []
+    for block in range(start // BLOCK_SIZE, (stop - 1) // BLOCK_SIZE + 1):
+        drawn = draw_fn(block_rng(seed, run_id, block), BLOCK_SIZE)
+        offset = block * BLOCK_SIZE
+        lo = max(start, offset) - offset
+        hi = min(stop, offset + BLOCK_SIZE) - offset
+        parts.append({name: arr[lo:hi] for name, arr in drawn.items()})
+
+    return {name: np.concatenate([p[name] for p in parts]) for name in parts[0]}
+
+
+def generate_sharded(generate_fn, n, seed, run_id=None, n_workers=4):
+    """
+    generate_batch(n, seed=..., run_id=..., start=...) 형태의 함수를 프로세스 풀로 나눠 실행
+    - 샤드 경계는 블록 단위로 맞춰 중복 샘플링을 피함
+    - 결과는 같은 seed의 직렬 generate_fn(n, ...) 호출과 비트 단위로 동일
+    """
+    seed = resolve_seed(seed)
+    if n <= 0:
+        return generate_fn(0, seed=seed, run_id=run_id, start=0)
+    n_blocks = -(-n // BLOCK_SIZE)
+    per_shard = -(-n_blocks // max(n_workers, 1)) * BLOCK_SIZE
+    shards = [(s, min(per_shard, n - s)) for s in range(0, n, per_shard)]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(generate_fn, size, seed=seed, run_id=run_id, start=s)
+            for s, size in shards
+        ]
+        results = [f.result() for f in futures]
+
+    return {name: np.concatenate([r[name] for r in results]) for name in results[0]}
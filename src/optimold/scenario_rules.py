@@ -0,0 +1,127 @@
+# src/optimold/scenario_rules.py
+
+"""
+이상 시나리오 선언형 분류기
+
+- RULES: (시나리오, 조건 목록) 을 우선순위 순서로 나열 → 앞선 규칙에 해당하면 뒤 규칙은 보지 않음
+  조건은 (특징량 컬럼, 비교 연산자, 임계값)이며 한 규칙의 조건은 모두 만족(AND)해야 함
+- compile_rules(): 규칙을 (컬럼, 연산 함수, 임계값) 튜플로 변환 (한 번만 수행)
+- classify(): 특징량 행렬(DataFrame / {컬럼: 배열}) 전체를 규칙별 불리언 마스크로 일괄 분류
+- classify_cycle(): 스트리밍으로 들어오는 사이클 1개 분류 (같은 컴파일 결과 사용)
+- NaN 특징량은 어떤 비교도 만족하지 않음 (기존 노트북 규칙과 동일)
+- 기본 규칙은 classified_scenarios_012.csv 판정 결과를 그대로 재현함
+"""
+
+import operator
+
+import numpy as np
+
+DEFAULT_SCENARIO = "Normal"
+
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+# 우선순위 순서 (위에서부터 먼저 판정)
+RULES = [
+    {
+        "scenario": "Short shot",
+        "description": "충진 부족으로 인해 부품 일부가 비어 있거나 형상이 완성되지 않음.",
+        "conditions": [("Volume_max", "<", 45.0)],
+    },
+    {
+        "scenario": "Overpacking / Flash",
+        "description": "압력이 과도하거나 피스톤 과이동으로 인해 금형 틈새로 수지가 누출됨.",
+        "conditions": [("Volume_max", ">", 55.0)],
+    },
+    {
+        "scenario": "Sticking / Slip - Late velocity stall",
+        "description": "보압 시작 이후 피스톤의 속도가 비정상적으로 정지되거나 불안정하게 유지됨.",
+        "conditions": [("Piston_Velocity_flat_ratio_t6", "<", 0.9)],
+    },
+    {
+        "scenario": "Sink mark - Velocity stalled during packing end",
+        "description": "보압 종료 시점 이후 피스톤 속도가 멈추어 냉각 수축에 따른 수축 자국(sink mark)이 발생할 수 있음.",
+        "conditions": [("Piston_Velocity_flat_duration_t8", ">", 1.95)],
+    },
+    {
+        "scenario": "Jetting - High flow surge",
+        "description": "충진 초기에 과도한 유량이 짧은 시간 급격히 변화하면서 외관 불량 가능성이 존재함.",
+        "conditions": [("Flow_Rate_jetting_duration", ">=", 0.6)],
+    },
+]
+
+# 판정 기준 표시용 특징량 이름
+FEATURE_LABELS = {
+    "Volume_max": "최대 충진량(Volume_max)",
+    "Piston_Velocity_flat_ratio_t6": "피스톤 속도 구간 flat ratio (6초 이후)",
+    "Piston_Velocity_flat_duration_t8": "8초 이후 피스톤 속도 flat 상태 지속시간(초)",
+    "Flow_Rate_jetting_duration": "Flow Rate 변화 기울기 강도 초과 지속시간(초)",
+}
+
+
+def compile_rules(rules=RULES):
+    """
+    반환값: (시나리오 이름 배열 (기본 시나리오가 0번), [(코드, [(컬럼, 연산 함수, 임계값)])])
+    """
+    scenarios = [DEFAULT_SCENARIO] + [rule["scenario"] for rule in rules]
+    compiled = []
+    for code, rule in enumerate(rules, start=1):
+        conds = []
+        for column, op, threshold in rule["conditions"]:
+            if op not in OPERATORS:
+                raise ValueError(f"지원하지 않는 비교 연산자: {op} ({rule['scenario']})")
+            conds.append((column, OPERATORS[op], float(threshold)))
+        compiled.append((code, conds))
+    return np.array(scenarios, dtype=object), compiled
+
+
+SCENARIOS, COMPILED = compile_rules()
+
+
+def required_features(rules=RULES):
+    return sorted({column for rule in rules for column, _, _ in rule["conditions"]})
+
+
+def classify_codes(features, compiled=COMPILED):
+    """
+    특징량 일괄 분류 → 시나리오 코드 (n,) int8 (0 = 기본 시나리오)
+    - features: DataFrame 또는 {컬럼: (n,) 배열}
+    """
+    columns = {}
+    codes = None
+    for code, conds in compiled:
+        mask = None
+        for column, op, threshold in conds:
+            if column not in columns:
+                columns[column] = np.asarray(features[column], dtype=float)
+            hit = op(columns[column], threshold)
+            mask = hit if mask is None else (mask & hit)
+        if codes is None:
+            codes = np.zeros(len(mask), dtype=np.int8)
+        codes[(codes == 0) & mask] = code  # 앞선 규칙에서 판정된 사이클은 유지
+    return codes
+
+
+def classify(features, rules=None):
+    """특징량 일괄 분류 → 시나리오 이름 배열 (n,)"""
+    scenarios, compiled = (SCENARIOS, COMPILED) if rules is None else compile_rules(rules)
+    return scenarios[classify_codes(features, compiled)]
+
+
+def classify_cycle(features, rules=None):
+    """사이클 1개({컬럼: 값}) 분류 → 시나리오 이름"""
+    scenarios, compiled = (SCENARIOS, COMPILED) if rules is None else compile_rules(rules)
+    for code, conds in compiled:
+        if all(op(float(features[column]), threshold) for column, op, threshold in conds):
+            return scenarios[code]
+    return scenarios[0]
+
+
+def describe_rules(rules=RULES):
+    """대시보드 표시용 {시나리오: 설명 + 판정 기준} (우선순위 순서, 기본 시나리오 포함)"""
+    desc = {DEFAULT_SCENARIO: "공정 출력이 모두 정상 범위 내에 있어 양품으로 판정됨."}
+    for rule in rules:
+        criteria = " 그리고 ".join(
+            f"{FEATURE_LABELS.get(column, column)} {op} {threshold:g}" for column, op, threshold in rule["conditions"]
+        )
+        desc[rule["scenario"]] = f"{rule['description']}  \n- **판정 기준**: {criteria}"
+    return desc
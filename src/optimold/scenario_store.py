@@ -0,0 +1,188 @@
+# src/optimold/scenario_store.py
+
+"""
+이상 시나리오 분류 결과 저장소 (content-addressed + 버전 목록)
+
+    store_dir/
+      versions.json          # 버전 목록 [{version, digest, source, rules, created, rows, counts}]
+      <digest>.csv           # 분류 결과 (cycle_id + 특징량 + scenario), 같은 내용이면 같은 파일
+
+- digest: 입력 특징량(cycle_id 정렬) + 규칙 파라미터의 SHA-256
+  → 최신 버전과 같은 입력/규칙으로 다시 분류하면 새 버전을 만들지 않고 최신 버전을 반환
+  → 더 오래된 버전과 같으면 분류/파일 저장 없이 그 결과를 가리키는 새 버전을 추가해 최신으로 만듦 (restored_from)
+- 결과 행은 cycle_id 기준으로 중복 제거 (같은 cycle_id가 여러 번 있으면 마지막 행 사용)
+- 기존 classified_scenarios_0NN.csv(cycle_id 없음)는 import_legacy()로 가져오며
+  행 내용 해시를 cycle_id로 사용 → 동일 행 / 바이트 단위로 같은 파일은 한 번만 저장
+- 대시보드는 최신 버전 또는 버전 번호 / digest 접두어로 고정한 버전을 읽음
+  저장소가 비어 있으면 기존 대시보드가 읽던 classified_scenarios_012.csv를 첫 버전으로 등록 (seed_legacy)
+"""
+
+import glob
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from optimold.result_files import CSV_DIR
+from optimold.scenario_rules import DEFAULT_SCENARIO, RULES, classify
+
+SCENARIO_STORE = os.path.join(os.path.dirname(CSV_DIR), "scenario_store")
+VERSIONS = "versions.json"
+LEGACY_RESULT = os.path.join(os.path.dirname(CSV_DIR), "classified_scenarios_012.csv")
+
+
+def list_versions(store_dir=SCENARIO_STORE):
+    path = os.path.join(store_dir, VERSIONS)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_versions(store_dir, versions):
+    path = os.path.join(store_dir, VERSIONS)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(versions, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)  # 원자적 교체: 대시보드는 항상 완전한 목록만 봄
+
+
+def rules_spec(rules=RULES):
+    """규칙의 판정 파라미터만 추린 정규형 (설명 문구 변경은 digest에 영향 없음)"""
+    return [{"scenario": r["scenario"], "conditions": [list(c) for c in r["conditions"]]} for r in rules]
+
+
+def dedupe_cycles(df):
+    """cycle_id 기준 중복 제거 + 정렬 (같은 cycle_id는 마지막 행 유지)"""
+    return df.drop_duplicates("cycle_id", keep="last").sort_values("cycle_id", kind="stable").reset_index(drop=True)
+
+
+def frame_digest(df, extra=None):
+    """DataFrame 내용(컬럼명 + 값) + 부가 파라미터의 SHA-256"""
+    h = hashlib.sha256()
+    h.update(json.dumps([list(map(str, df.columns)), extra], sort_keys=True).encode("utf-8"))
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind in "fiub":
+            h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        else:
+            h.update("\0".join(map(str, values)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _row_ids(df):
+    """cycle_id가 없는 기존 결과용: 행 내용 해시 → 동일한 행은 같은 id"""
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return [f"row_{h:016x}" for h in hashes]
+
+
+def _commit(store_dir, df, digest, source, rules):
+    """
+    결과 저장 + 버전 등록, 반환값: (버전 정보, 새로 만들었는지 여부)
+    - 최신 버전과 digest가 같으면 그대로 반환
+    - 더 오래된 버전과 같으면 파일은 재사용하고 그 버전을 가리키는 새 버전 추가 (df 불필요)
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    versions = list_versions(store_dir)
+    if versions and versions[-1]["digest"] == digest:
+        return versions[-1], False
+    previous = next((entry for entry in reversed(versions) if entry["digest"] == digest), None)
+
+    if previous is None:
+        path = os.path.join(store_dir, f"{digest}.csv")
+        tmp = path + ".tmp"
+        df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        rows, counts = len(df), {k: int(v) for k, v in df["scenario"].value_counts().items()}
+    else:
+        rows, counts = previous["rows"], previous["counts"]
+
+    entry = {
+        "version": versions[-1]["version"] + 1 if versions else 1,
+        "digest": digest,
+        "source": source,
+        "rules": rules,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "rows": rows,
+        "counts": counts,
+    }
+    if previous is not None:
+        entry["restored_from"] = previous["version"]
+    versions.append(entry)
+    _write_versions(store_dir, versions)
+    return entry, True
+
+
+def run_classification(features, rules=RULES, store_dir=SCENARIO_STORE, source=None):
+    """
+    특징량(cycle_id + 특징량 컬럼, 예: optimold.features.build_feature_df 결과) 분류 후 저장
+    - 입력/규칙이 기존 버전과 같으면 분류를 생략 (최신이 아니었다면 그 결과가 최신 버전이 됨)
+    반환값: (버전 정보 dict, 새 버전 여부)
+    """
+    df = dedupe_cycles(features.drop(columns=["scenario"], errors="ignore"))
+    spec = rules_spec(rules)
+    digest = frame_digest(df, spec)
+    if any(entry["digest"] == digest for entry in list_versions(store_dir)):
+        return _commit(store_dir, None, digest, source, spec)
+
+    df["scenario"] = classify(df, rules)
+    return _commit(store_dir, df, digest, source, spec)
+
+
+def import_legacy(paths, store_dir=SCENARIO_STORE):
+    """
+    기존 classified_scenarios*.csv 가져오기 (판정 결과는 파일 내용 그대로 사용)
+    반환값: [(파일 경로, 버전 정보, 새 버전 여부)]
+    """
+    results = []
+    for path in paths:
+        df = pd.read_csv(path)
+        df.insert(0, "cycle_id", _row_ids(df))
+        df = dedupe_cycles(df)
+        entry, created = _commit(store_dir, df, frame_digest(df), os.path.basename(path), None)
+        results.append((path, entry, created))
+    return results
+
+
+def seed_legacy(store_dir=SCENARIO_STORE, legacy_path=LEGACY_RESULT):
+    """저장소가 비어 있으면 기존 분류 결과 CSV를 첫 버전으로 등록, 반환값: 등록한 버전 정보 또는 None"""
+    if list_versions(store_dir) or not os.path.exists(legacy_path):
+        return None
+    return import_legacy([legacy_path], store_dir)[0][1]
+
+
+def resolve_version(version=None, store_dir=SCENARIO_STORE):
+    """None / "latest" → 최신, int → 버전 번호, str → digest 접두어"""
+    versions = list_versions(store_dir)
+    if not versions:
+        raise FileNotFoundError(f"분류 결과 버전 없음: {store_dir}")
+    if version is None or version == "latest":
+        return versions[-1]
+    for entry in versions:
+        if entry["version"] == version or (isinstance(version, str) and entry["digest"].startswith(version)):
+            return entry
+    raise KeyError(f"분류 결과 버전 없음: {version}")
+
+
+def load_results(version=None, store_dir=SCENARIO_STORE):
+    """분류 결과 DataFrame (cycle_id 기준 중복 없음)"""
+    entry = resolve_version(version, store_dir)
+    return pd.read_csv(os.path.join(store_dir, f"{entry['digest']}.csv"), dtype={"cycle_id": str})
+
+
+if __name__ == "__main__":
+    project_dir = os.path.dirname(CSV_DIR)
+    legacy = sorted(glob.glob(os.path.join(project_dir, "classified_scenarios*.csv")))
+    for path, entry, created in import_legacy(legacy):
+        status = "추가" if created and "restored_from" not in entry else "최신으로 지정" if created else "중복 → 생략"
+        print(f"[{status}] {os.path.basename(path)} → v{entry['version']} ({entry['digest'][:12]})")
+
+    feature_path = os.path.join(project_dir, "feature_df.csv")
+    if os.path.exists(feature_path):
+        entry, created = run_classification(pd.read_csv(feature_path, dtype={"cycle_id": str}), source="feature_df.csv")
+        status = "동일 입력/규칙 → 생략" if not created else "기존 결과를 최신으로 지정" if "restored_from" in entry else "추가"
+        normal = entry["counts"].get(DEFAULT_SCENARIO, 0)
+        print(f"[{status}] 규칙 분류 → v{entry['version']} ({entry['rows']}개 사이클, 정상 {normal}개)")
@@ -0,0 +1,134 @@
+# src/optimold/signal_tensor.py
+
+"""
+정렬된 사이클 신호 텐서 (특징량 / 인과 분석 / 밀도 지도 공용 데이터셋)
+
+사이클 저장소(optimold.cycle_store)가 CSV를 한 번만 파싱하고('초' 단위 문자열 제거 포함)
+공통 고정 시간축으로 보간한 결과를 RID별 float32 텐서 1개로 묶어 보관
+
+    tensor_dir/
+      RID014.f32     # (cycles, signals, samples) float32, C 순서 원시 바이너리
+      RID014.json    # {"cycles": [...], "signals": VARIABLES, "n_samples", "t_end", "dt"}
+
+- 사이클 축이 가장 바깥이므로 신규 사이클은 파일 끝에 이어 쓰기만 하면 됨 (append-only)
+  메타데이터는 데이터 쓰기 후 원자적으로 교체 → 읽는 쪽은 메타데이터의 사이클 수만큼만 매핑
+- open_tensor()는 np.memmap(읽기 전용)을 반환하므로 여러 소비자/프로세스가 복사 없이 공유
+  (signal()은 (cycles, samples) 뷰를 반환)
+"""
+
+import json
+import os
+
+import numpy as np
+
+from optimold.cycle_store import STORE_DIR, make_time_grid, read_manifest
+from optimold.result_files import CSV_DIR, VARIABLES
+
+TENSOR_DIR = os.path.join(os.path.dirname(CSV_DIR), "signal_tensor")
+DTYPE = np.float32
+
+
+class SignalTensor:
+    """
+    - data: (n_cycles, n_signals, n_samples) float32 memmap (읽기 전용)
+    - cycles: 사이클 키 리스트, signals: 신호 이름 리스트, time: (n_samples,) 공통 시간축
+    """
+
+    def __init__(self, data, cycles, signals, time):
+        self.data = data
+        self.cycles = cycles
+        self.signals = signals
+        self.time = time
+        self._signal_index = {name: i for i, name in enumerate(signals)}
+        self._cycle_index = {key: i for i, key in enumerate(cycles)}
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def signal_index(self, name):
+        return self._signal_index[name]
+
+    def signal(self, name):
+        """신호 1개의 전체 사이클 (n_cycles, n_samples) 뷰"""
+        return self.data[:, self._signal_index[name], :]
+
+    def cycle(self, key):
+        """사이클 1개의 (n_signals, n_samples) 뷰, 없으면 None"""
+        i = self._cycle_index.get(key)
+        return None if i is None else self.data[i]
+
+
+def _paths(tensor_dir, rid):
+    return os.path.join(tensor_dir, f"{rid}.f32"), os.path.join(tensor_dir, f"{rid}.json")
+
+
+def read_meta(rid, tensor_dir=TENSOR_DIR):
+    _, meta_path = _paths(tensor_dir, rid)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_tensor(rid="RID014", tensor_dir=TENSOR_DIR):
+    """RID 텐서 열기 (메타데이터에 기록된 사이클까지만 매핑), 없으면 None"""
+    meta = read_meta(rid, tensor_dir)
+    if meta is None:
+        return None
+    data_path, _ = _paths(tensor_dir, rid)
+    shape = (len(meta["cycles"]), len(meta["signals"]), meta["n_samples"])
+    if shape[0] == 0:
+        data = np.empty(shape, dtype=DTYPE)
+    else:
+        data = np.memmap(data_path, dtype=DTYPE, mode="r", shape=shape)
+    time = make_time_grid(meta["t_end"], meta["dt"])
+    return SignalTensor(data, meta["cycles"], meta["signals"], time)
+
+
+def build_tensor(store_dir=STORE_DIR, tensor_dir=TENSOR_DIR, rid="RID014"):
+    """
+    저장소 파티션의 신규 사이클을 텐서 파일 끝에 추가
+    반환값: 새로 추가된 사이클 키 리스트
+    """
+    manifest = read_manifest(store_dir)
+    os.makedirs(tensor_dir, exist_ok=True)
+    data_path, meta_path = _paths(tensor_dir, rid)
+    n_samples = len(make_time_grid(manifest["t_end"], manifest["dt"]))
+
+    meta = read_meta(rid, tensor_dir)
+    if meta is None or meta["n_samples"] != n_samples or meta["signals"] != VARIABLES:
+        meta = {"cycles": [], "signals": list(VARIABLES), "n_samples": n_samples,
+                "t_end": manifest["t_end"], "dt": manifest["dt"]}
+    done = len(meta["cycles"])
+
+    added = []
+    seen = 0
+    with open(data_path, "ab") as f:
+        # 메타데이터 이후에 남은 바이트(중단된 쓰기)는 잘라내고 이어 씀
+        f.truncate(done * len(VARIABLES) * n_samples * np.dtype(DTYPE).itemsize)
+        for chunk in manifest["partitions"].get(rid, []):
+            n = len(chunk["cycles"])
+            lo = max(done - seen, 0)
+            seen += n
+            if lo >= n:
+                continue
+            chunk_dir = os.path.join(store_dir, rid, chunk["chunk"])
+            block = np.empty((n - lo, len(VARIABLES), n_samples), dtype=DTYPE)
+            for j, var in enumerate(VARIABLES):
+                block[:, j, :] = np.load(os.path.join(chunk_dir, f"{var}.npy"), mmap_mode="r")[lo:]
+            f.write(block.tobytes())
+            added.extend(chunk["cycles"][lo:])
+
+    if added:
+        meta["cycles"].extend(added)
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, meta_path)
+    return added
+
+
+if __name__ == "__main__":
+    for part in sorted(read_manifest()["partitions"]):
+        added = build_tensor(rid=part)
+        print(f"[✓] {part} 신호 텐서 갱신: 신규 사이클 {len(added)}개 → {TENSOR_DIR}")
@@ -0,0 +1,386 @@
+# src/optimold/sim_pool.py
+
+"""
+Simulink 시뮬레이션 상주 워커 풀
+
+- 라이브러리 API: 스크립트/노트북에서 여러 사이클을 한 번에 처리할 때 사용 (Airflow DAG는 사용하지 않음)
+  DAG는 매핑 태스크 자체가 병렬 단위이므로 백엔드 + run_serial만 사용
+
+- 워커 프로세스 N개가 각자 백엔드 세션을 한 번만 기동(모델 로드 포함)하고,
+  큐로 전달되는 .mat 경로를 순서대로 처리
+- 풀이 워커별 큐로 한 번에 1개씩 배정하므로 어떤 워커가 어떤 사이클을 처리 중인지 항상 알 수 있음
+  → 처리 중 워커 프로세스가 죽으면(MATLAB 크래시 등) 해당 사이클을 재배정하고 워커를 새로 기동
+- 워커는 백엔드 기동 후 ready(또는 실패 시 dead) 메시지를 보내고, 풀은 ready를 받은 워커에만 사이클 배정
+  → ready 전에 종료된 워커는 기동 실패로 보고 교체하지 않음 (설정 오류 시 프로세스를 계속 띄우지 않음)
+- 결과는 워커별 파이프로 수신 (공유 Queue는 전송 중 크래시한 워커가 잠금을 쥔 채 죽으면 전체가 멈춤)
+- 백엔드는 start() / run(mat_path) / close() 세 메서드만 구현하면 교체 가능
+  · MatlabEngineBackend : matlab.engine 상주 세션 (모델 1회 로드)
+  · MatlabCliBackend    : 기존 matlab.exe -batch 방식 (사이클마다 기동, fallback 용)
+  · PythonBackend       : MATLAB 없이 파이썬 함수로 대체 (테스트용)
+- claim_session: 공유 MATLAB 세션 1개를 한 번에 한 프로세스만 쓰도록 잠금 (같은 base workspace 보호)
+"""
+
+import multiprocessing as mp
+import os
+import subprocess
+import tempfile
+import time
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing.connection import wait
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Simulink 모델 / Postprocess 스크립트 경로 (윈도우 기준)
+SLX_PATH = "C:/Users/Admin/MATLAB/Projects/my_project/src/wh04_3rd_3team_optimold/fifth_real_model.slx"
+POSTPROCESS_SCRIPT = "C:/Users/Admin/MATLAB/Projects/my_project/scripts/save_results_to_csv.m"
+LOG_PATH = "C:/Users/Admin/MATLAB/Projects/my_project/log.txt"
+
+# MATLAB CLI 실행 경로 (WSL용)
+MATLAB_EXE = '"/mnt/c/Program Files/MATLAB/R2024b/bin/matlab.exe"'
+
+
+def to_windows_path(path):
+    """WSL 경로(/mnt/c/...)를 Windows 경로(C:\\...)로 변환"""
+    return path.replace("/mnt/c", "C:").replace("/", "\\")
+
+
+def _load_commands(win_mat_path):
+    """.mat 로드 후 Simulink 입력 변수를 base workspace에 할당하는 MATLAB 명령"""
+    return (
+        "clearvars -except run_id; "
+        f"load('{win_mat_path}'); "
+        "assignin('base','Backpr',backpr_data); "
+        "assignin('base','Extruder',extruder_data); "
+        "assignin('base','Inject',inject_data); "
+        "assignin('base','Nozzle',nozzle_data); "
+        "assignin('base','Retract',retract_data); "
+    )
+
+
+class MatlabEngineBackend:
+    """
+    matlab.engine 기반 상주 세션
+    - session_name 지정 시 matlab.engine.shareEngine('<이름>')으로 공유된 세션에 연결 (종료하지 않음)
+    - 미지정 시 새 세션 기동, close()에서 종료
+    - MATLAB과 같은 OS의 파이썬에서 실행해야 함 (Windows 파이썬 또는 Linux MATLAB)
+    """
+
+    def __init__(self, slx_path=SLX_PATH, postprocess_script=POSTPROCESS_SCRIPT, session_name=None):
+        self.slx_path = slx_path
+        self.postprocess_script = postprocess_script
+        self.session_name = session_name
+        self.model_name = os.path.splitext(os.path.basename(slx_path))[0]
+        self.eng = None
+
+    def start(self):
+        import matlab.engine  # MATLAB Engine API for Python (선택 의존성)
+
+        if self.session_name:
+            self.eng = matlab.engine.connect_matlab(self.session_name)
+        else:
+            self.eng = matlab.engine.start_matlab()
+        # 모델은 세션당 한 번만 로드 (이미 로드된 경우 no-op)
+        self.eng.load_system(self.slx_path, nargout=0)
+
+    def run(self, mat_path):
+        win_mat_path = to_windows_path(mat_path) if mat_path.startswith("/mnt/") else mat_path
+        self.eng.eval(_load_commands(win_mat_path), nargout=0)
+        self.eng.eval(f"sim('{self.model_name}');", nargout=0)
+        self.eng.eval(f"run('{self.postprocess_script}');", nargout=0)
+        return mat_path
+
+    def close(self):
+        if self.eng is not None and not self.session_name:
+            self.eng.quit()
+        self.eng = None
+
+
+def _try_lock(f, blocking):
+    if fcntl is not None:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+    try:
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+@contextmanager
+def claim_session(sessions, index=0, lock_dir=None):
+    """
+    공유 MATLAB 세션 이름 중 하나를 독점 사용 (같은 호스트의 프로세스 간 파일 잠금)
+    - 공유 세션은 base workspace 1개를 쓰므로 두 프로세스가 동시에 load/assignin/sim하면 입력이 섞임
+    - 비어 있는 세션을 먼저 찾고, 모두 사용 중이면 sessions[index % n]이 풀릴 때까지 대기
+    - matlab.engine.connect_matlab은 같은 호스트의 세션에만 연결되므로 호스트 로컬 잠금으로 충분
+    반환값(with): 세션 이름
+    """
+    lock_dir = lock_dir or tempfile.gettempdir()
+    order = [sessions[(index + k) % len(sessions)] for k in range(len(sessions))]
+    files = {name: open(os.path.join(lock_dir, f"optimold_matlab_{name}.lock"), "a+b") for name in order}
+    try:
+        claimed = next((name for name in order if _try_lock(files[name], blocking=False)), None)
+        if claimed is None:
+            claimed = order[0]
+            _try_lock(files[claimed], blocking=True)
+        yield claimed
+    finally:
+        for f in files.values():
+            f.close()  # 파일을 닫으면 잠금도 해제
+
+
+class MatlabCliBackend:
+    """기존 matlab.exe -batch 방식 (사이클마다 MATLAB 기동 + 모델 로드)"""
+
+    def __init__(self, slx_path=SLX_PATH, postprocess_script=POSTPROCESS_SCRIPT, matlab_exe=MATLAB_EXE):
+        self.slx_path = slx_path
+        self.postprocess_script = postprocess_script
+        self.matlab_exe = matlab_exe
+
+    def start(self):
+        pass
+
+    def build_command(self, mat_path):
+        win_mat_path = to_windows_path(mat_path)
+        return (
+            f'{self.matlab_exe} -batch '
+            f'"diary(\'{LOG_PATH}\'); '
+            + _load_commands(win_mat_path)
+            + f"sim('{self.slx_path}'); "
+            f"run('{self.postprocess_script}'); "
+            'diary off;"'
+        )
+
+    def run(self, mat_path):
+        matlab_cmd = self.build_command(mat_path)
+        print(f"실행할 MATLAB 명령: {matlab_cmd}")
+        subprocess.run(matlab_cmd, shell=True, check=True)
+        return mat_path
+
+    def close(self):
+        pass
+
+
+class PythonBackend:
+    """
+    MATLAB 대체 백엔드 (테스트/로컬 실행용)
+    fn(mat_path) -> 결과, 풀에서 쓰려면 모듈 최상위 함수여야 함 (pickle 가능)
+    """
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def start(self):
+        pass
+
+    def run(self, mat_path):
+        return self.fn(mat_path)
+
+    def close(self):
+        pass
+
+
+def _run_task(backend, mat_path, worker_id):
+    """사이클 1개 실행 → 결과 dict (백엔드 예외는 ok=False로 기록)"""
+    started = time.perf_counter()
+    try:
+        result, error = backend.run(mat_path), None
+    except Exception as e:
+        result, error = None, repr(e)
+    return {
+        "mat_path": mat_path, "ok": error is None, "result": result, "error": error,
+        "worker": worker_id, "elapsed": time.perf_counter() - started,
+    }
+
+
+def run_serial(backend, mat_paths):
+    """
+    워커 프로세스 없이 현재 프로세스에서 백엔드를 1회 기동하고 순서대로 실행
+    (Airflow 매핑 태스크처럼 태스크 자체가 이미 병렬 단위인 경우, 프로세스 기동 비용 없음)
+    반환값: SimulationPool.map과 같은 형식의 결과 dict 리스트
+    """
+    backend.start()
+    try:
+        return [_run_task(backend, mat_path, os.getpid()) for mat_path in mat_paths]
+    finally:
+        backend.close()
+
+
+def _worker_loop(worker_id, backend_factory, task_queue, conn):
+    """
+    워커 프로세스: 백엔드 1회 기동 후 큐가 닫힐 때까지 사이클 처리
+    결과는 워커 전용 파이프로 동기 전송 (send가 끝난 뒤 크래시해도 다른 워커/메시지에 영향 없음)
+    """
+    try:
+        backend = backend_factory()
+        backend.start()
+    except Exception as e:
+        conn.send(("dead", worker_id, repr(e)))
+        return
+    conn.send(("ready", worker_id, None))
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            index, mat_path = task
+            conn.send(("done", index, _run_task(backend, mat_path, worker_id)))
+    finally:
+        backend.close()
+
+
+class SimulationPool:
+    """
+    상주 시뮬레이션 워커 풀
+
+    사용 예:
+        with SimulationPool(MatlabEngineBackend, n_workers=4) as pool:
+            results = pool.map(mat_paths)
+
+    backend_factory: 인자 없이 호출하면 백엔드를 반환하는 pickle 가능한 객체
+                     (클래스 자체 또는 functools.partial)
+    max_retries: 처리 중 워커가 죽은 사이클의 재배정 횟수 (초과 시 ok=False 결과로 기록)
+    """
+
+    def __init__(self, backend_factory, n_workers=2, max_retries=1):
+        self.backend_factory = backend_factory
+        self.n_workers = n_workers
+        self.max_retries = max_retries
+        self._ctx = mp.get_context("spawn")  # MATLAB 엔진은 fork 이후 상태 공유가 안전하지 않음
+        self._workers = {}  # 워커 ID → (프로세스, 전용 작업 큐, 결과 수신 파이프)
+        self._ready = set()  # 백엔드 기동을 마친(ready 메시지를 보낸) 워커 ID
+        self._next_id = 0
+
+    def _spawn(self):
+        worker_id = self._next_id
+        self._next_id += 1
+        task_queue = self._ctx.Queue()
+        reader, writer = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(
+            target=_worker_loop,
+            args=(worker_id, self.backend_factory, task_queue, writer),
+            daemon=True,
+        )
+        proc.start()
+        writer.close()  # 워커가 종료되면 reader에서 EOF
+        self._workers[worker_id] = (proc, task_queue, reader)
+        return worker_id
+
+    def _remove(self, worker_id):
+        _, _, reader = self._workers.pop(worker_id)
+        self._ready.discard(worker_id)
+        reader.close()
+
+    def start(self):
+        for _ in range(self.n_workers):
+            self._spawn()
+        return self
+
+    def _receive(self, timeout):
+        """
+        종료된 워커 목록을 먼저 확인한 뒤 모든 파이프의 메시지를 수신
+        → 종료 전에 보낸 ready/dead/done 메시지는 항상 종료 처리보다 먼저 반영됨
+        반환값: (메시지 리스트, 종료된 워커 ID 리스트)
+        """
+        wait([reader for _, _, reader in self._workers.values()], timeout)
+        exited = [w for w, (proc, _, _) in self._workers.items() if not proc.is_alive()]
+        messages = []
+        for _, _, reader in self._workers.values():
+            try:
+                while reader.poll():
+                    messages.append(reader.recv())
+            except (EOFError, OSError):
+                pass
+        return messages, exited
+
+    def map(self, mat_paths):
+        """mat_paths를 워커에 분배하고 입력 순서대로 결과 dict 리스트 반환"""
+        mat_paths = list(mat_paths)
+        pending = deque(range(len(mat_paths)))
+        attempts = [0] * len(mat_paths)
+        results = [None] * len(mat_paths)
+        remaining = len(mat_paths)
+        idle = deque(w for w in self._workers if w in self._ready)
+        in_flight = {}  # 워커 ID → 처리 중인 사이클 인덱스
+        dead = {}
+
+        def finish(index, payload):
+            nonlocal remaining
+            if results[index] is None:  # 재배정 후 원래 결과가 늦게 도착한 경우 중복 집계 방지
+                results[index] = payload
+                remaining -= 1
+
+        def lost(worker_id, reason):
+            """처리 중 워커 프로세스 종료: 처리 중이던 사이클은 재배정 또는 실패 기록 후 워커 교체"""
+            self._remove(worker_id)
+            if worker_id in idle:
+                idle.remove(worker_id)
+            index = in_flight.pop(worker_id, None)
+            if index is not None:
+                if attempts[index] <= self.max_retries:
+                    print(f"⚠️ 워커 {worker_id} 비정상 종료 ({reason}) → 사이클 {index} 재배정")
+                    pending.appendleft(index)
+                else:
+                    finish(index, {
+                        "mat_path": mat_paths[index], "ok": False, "result": None,
+                        "error": f"워커 {worker_id} 비정상 종료 ({reason}), 재시도 {self.max_retries}회 초과",
+                        "worker": worker_id, "elapsed": None,
+                    })
+            self._spawn()  # ready 메시지를 받은 뒤부터 배정
+
+        while remaining:
+            while pending and idle:
+                worker_id = idle.popleft()
+                index = pending.popleft()
+                attempts[index] += 1
+                in_flight[worker_id] = index
+                self._workers[worker_id][1].put((index, mat_paths[index]))
+
+            messages, exited = self._receive(timeout=1.0)
+            for kind, key, payload in messages:
+                if kind == "ready":
+                    self._ready.add(key)
+                    idle.append(key)
+                elif kind == "dead":
+                    dead[key] = payload
+                    print(f"⚠️ 워커 {key} 기동 실패: {payload}")
+                else:
+                    worker_id = payload["worker"]
+                    if in_flight.get(worker_id) == key:
+                        del in_flight[worker_id]
+                        idle.append(worker_id)
+                    finish(key, payload)
+
+            for worker_id in exited:
+                if worker_id in self._ready:
+                    lost(worker_id, f"exitcode={self._workers[worker_id][0].exitcode}")
+                else:  # ready 전에 종료 = 기동 실패 (배정된 사이클 없음, 교체하지 않음)
+                    dead.setdefault(worker_id, f"exitcode={self._workers[worker_id][0].exitcode}")
+                    self._remove(worker_id)
+            if remaining and not self._workers:
+                raise RuntimeError(f"모든 시뮬레이션 워커가 종료되었습니다: {dead}")
+        return results
+
+    def close(self):
+        for _, task_queue, _ in self._workers.values():
+            task_queue.put(None)
+        for worker_id, (proc, _, _) in list(self._workers.items()):
+            proc.join(timeout=60)
+            if proc.is_alive():
+                proc.terminate()
+            self._remove(worker_id)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,115 @@
+# src/optimold/surrogate_model.py
+
+"""
+공정 예측용 학습 대리모델 (제어 입력 4개 → 공정 출력 시계열 5종)
+
+- 학습 데이터: input_params.csv (run_id + Inject / Backpr_amp / Retract_delay / Nozzle_delay)
+  + 사이클 저장소(optimold.cycle_store)의 공정 출력 시계열 (공통 시간축, stride 간격으로 축약)
+- 출력 압축: 변수별 (평균, 표준편차)로 정규화 후 이어 붙여 PCA → 주성분 점수 몇 개만 회귀
+  (압력 ~1e7 / 위치 ~1e-2 처럼 단위가 달라도 변수별 기여가 균등)
+- 회귀: ExtraTreesRegressor (주성분 점수 다중 출력을 한 번에 예측)
+  노즐 지연 등 타이밍 입력에 대해 출력이 계단형으로 바뀌므로 단일 평활 커널(GP/다항)보다 트리 앙상블이 적합
+- 예측: 주성분 점수 → PCA 역변환 → 변수별 역정규화 (저장된 결과 CSV 탐색 없이 임의 입력을 바로 예측)
+- joblib으로 저장(optimold.model_io)하며 대시보드는 프로세스당 1회만 로딩 (st.cache_resource)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.ensemble import ExtraTreesRegressor
+
+from optimold.binning import AXES
+from optimold.cycle_store import STORE_DIR, load_signal, load_time
+from optimold.model_io import JoblibModel
+from optimold.result_files import CSV_DIR
+from optimold.timeseries_service import to_cycle_key
+
+MODEL_PATH = os.path.join(os.path.dirname(CSV_DIR), "surrogate_model.joblib")
+OUTPUT_VARIABLES = ["Piston_Position", "Piston_Pressure", "Piston_Velocity", "Flow_Rate", "Volume"]
+
+
+class SurrogateModel(JoblibModel):
+    """
+    - fit(X, Y, time): X (n, 4) 제어 입력, Y {변수: (n, T)} 출력 시계열
+    - predict(X): {변수: (m, T)}, predict_frames(x): {변수: DataFrame(Time, 변수)} (입력 1개)
+    - n_components: PCA 주성분 수 (0~1 실수면 설명 분산 비율 기준), n_estimators: 트리 수
+    - save(path) / load(path): optimold.model_io.JoblibModel (기본 경로 MODEL_PATH)
+    """
+
+    default_path = MODEL_PATH
+
+    def __init__(self, n_components=0.999, n_estimators=100, variables=OUTPUT_VARIABLES, random_state=0):
+        self.n_components = n_components
+        self.n_estimators = n_estimators
+        self.variables = list(variables)
+        self.random_state = random_state
+
+    def _encode(self, Y):
+        return np.hstack([(np.asarray(Y[var], dtype=float) - self.mean_[var]) / self.scale_[var]
+                          for var in self.variables])
+
+    def _decode(self, Z):
+        T = len(self.time_)
+        return {var: Z[:, i * T:(i + 1) * T] * self.scale_[var] + self.mean_[var]
+                for i, var in enumerate(self.variables)}
+
+    def fit(self, X, Y, time):
+        X = np.asarray(X, dtype=float)
+        self.time_ = np.asarray(time, dtype=float)
+        self.mean_ = {var: float(np.mean(Y[var])) for var in self.variables}
+        self.scale_ = {var: float(np.std(Y[var])) or 1.0 for var in self.variables}
+
+        Z = self._encode(Y)
+        self.pca_ = PCA(n_components=self.n_components, svd_solver="full", random_state=self.random_state)
+        scores = self.pca_.fit_transform(Z)
+
+        self.regressor_ = ExtraTreesRegressor(n_estimators=self.n_estimators, random_state=self.random_state)
+        self.regressor_.fit(X, scores if scores.shape[1] > 1 else scores.ravel())
+        self.n_train_ = len(X)
+        return self
+
+    def predict(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        scores = self.regressor_.predict(X).reshape(len(X), -1)  # 주성분 1개면 (m,)으로 반환됨
+        return self._decode(self.pca_.inverse_transform(scores))
+
+    def predict_frames(self, x):
+        """입력 1개 → {변수: DataFrame(Time, 변수)} (TimeSeriesService.frames와 같은 형식)"""
+        pred = self.predict([x])
+        return {var: pd.DataFrame({"Time": self.time_, var: pred[var][0]}) for var in self.variables}
+
+
+def training_set(input_path, store_dir=STORE_DIR, rid="RID014", variables=OUTPUT_VARIABLES, stride=10):
+    """
+    input_params.csv 행과 저장소 사이클을 사이클 키로 맞춘 학습 데이터
+    반환값: (X (n, 4), {변수: (n, T/stride)}, 시간축, 사용한 run_id 리스트)
+    """
+    params = pd.read_csv(input_path)
+    keys = params["run_id"].map(to_cycle_key)
+    stored, _ = load_signal(variables[0], store_dir, rid)
+    position = {key: i for i, key in enumerate(stored)}
+    matched = keys.isin(position) & params[AXES].notna().all(axis=1)
+    params, rows = params[matched], keys[matched].map(position).to_numpy()
+
+    Y = {var: np.asarray(load_signal(var, store_dir, rid)[1][rows][:, ::stride]) for var in variables}
+    time = load_time(store_dir)[::stride]
+    return params[AXES].to_numpy(dtype=float), Y, time, params["run_id"].tolist()
+
+
+def train(input_path, store_dir=STORE_DIR, rid="RID014", model_path=MODEL_PATH, stride=10, n_components=0.999):
+    X, Y, time, run_ids = training_set(input_path, store_dir, rid, stride=stride)
+    if len(X) < 2:
+        raise ValueError(f"학습 가능한 사이클 부족: {len(X)}개")
+    model = SurrogateModel(n_components).fit(X, Y, time)
+    model.save(model_path)
+    return model
+
+
+if __name__ == "__main__":
+    input_path = os.path.join(CSV_DIR, "input_params.csv")
+    model = train(input_path)
+    explained = model.pca_.explained_variance_ratio_.sum()
+    print(f"[✓] 대리모델 학습 완료: {model.n_train_}개 사이클, 주성분 {model.pca_.n_components_}개 "
+          f"(설명 분산 {explained:.4f}) → {MODEL_PATH}")
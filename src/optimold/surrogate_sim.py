@@ -0,0 +1,219 @@
+# src/optimold/surrogate_sim.py
+
+"""
+MATLAB/Simulink 없이 실행 가능한 사출 유압 실린더 대체(surrogate) 시뮬레이터
+
+- 입력: generate_mat / generate_batch 가 만드는 구간 선형 신호
+        (inject_data, backpr_data, retract_data, nozzle_data, extruder_data)
+- 출력: Piston_Position / Piston_Pressure / Piston_Velocity / Flow_Rate / Volume (+ 입력 5종)
+- 모든 사이클을 (N, T) 배열로 묶어 고정 시간 간격으로 동시에 적분 (시간축 루프 1회, 사이클 축은 벡터화)
+
+[모델 구성 (축약 집중정수 모델)]
+- 실린더 압력: 공급/노즐/회수 오리피스 유량 평형으로 정해지는 평형 압력을 1차 지연으로 추종, 릴리프 압력에서 포화
+- 피스톤 속도: 압력 - 배압에 비례하는 평형 속도를 1차 지연으로 추종, 스트로크 끝에서 정지
+- 유량: 노즐 개도 × sqrt(압력) 오리피스 식, 체적은 유량 적분
+- 1차 지연은 지수 적분(exact exponential update)으로 계산하여 시간 간격과 무관하게 안정
+
+계수(DEFAULT_PARAMS)는 기존 Simulink 결과(feature_df_from_csv.csv)의 출력 범위
+(압력 포화 6.99e7, 유량 최대 ~0.063, 체적 최대 ~45-53, 속도 최대 ~1.15)에 맞춘 값이며,
+새 Simulink 결과가 쌓이면 해당 결과로 재조정해야 함
+"""
+
+import os
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
+from scipy.io import loadmat
+
+from optimold.result_index import INDEX_PATH, register_files
+
+# 출력 CSV 저장 경로 (Simulink postprocess와 동일)
+CSV_DIR = "/mnt/c/Users/Admin/MATLAB/Projects/my_project/csv_results"
+
+INPUT_KEYS = {
+    "Inject": "inject_data",
+    "Backpr": "backpr_data",
+    "Retract": "retract_data",
+    "Nozzle": "nozzle_data",
+    "Extruder": "extruder_data",
+}
+OUTPUT_VARIABLES = ["Piston_Position", "Piston_Pressure", "Piston_Velocity", "Flow_Rate", "Volume"]
+
+DEFAULT_PARAMS = {
+    "relief_pressure": 6.99e7,   # 릴리프 밸브 설정 압력 [Pa]
+    "min_pressure": -4.0e6,      # 회수 시 최저 게이지 압력 [Pa]
+    "k_inject": 1.0,             # 공급 오리피스 계수 (상대값)
+    "k_nozzle": 0.35,            # 노즐 오리피스 계수
+    "k_retract": 0.6,            # 회수(탱크) 오리피스 계수
+    "k_leak": 0.05,              # 내부 누설
+    "tau_pressure": 0.015,       # 압력 응답 시정수 [s]
+    "backpr_pressure": 2.6e6,    # Backpr 명령 26 기준 배압 [Pa]
+    "extruder_pressure": 1.5e6,  # 스크류 회전 시 추가 반력 [Pa]
+    "velocity_gain": 1.6e-8,     # 순압력당 평형 속도 [m/s/Pa]
+    "tau_velocity": 0.004,       # 속도 응답 시정수 [s]
+    "position_min": -0.12,       # 후진 끝 [m]
+    "position_max": -0.045,      # 전진 끝 [m]
+    "flow_gain": 0.063,          # 노즐 완전 개방 + 릴리프 압력에서의 유량
+    "volume_gain": 1250.0,       # 누적 유량 → 체적 환산 계수
+}
+
+
+def interp_batch(data, time):
+    """
+    (N, K, 2) 구간 선형 신호를 공통 시간축 time (T,)에서 평가 → (N, T)
+    - 사이클별 breakpoint가 달라 np.interp(C 구현)를 행 단위로 호출하는 편이
+      (N, T, K) 브로드캐스트보다 메모리/속도 모두 유리
+    - 구간 밖은 양 끝값 유지
+    """
+    data = np.asarray(data, dtype=float)
+    out = np.empty((len(data), len(time)))
+    for i, cycle in enumerate(data):
+        out[i] = np.interp(time, cycle[:, 0], cycle[:, 1])
+    return out
+
+
+def simulate_batch(batch, t_end=10.0, dt=1e-3, params=None, chunk_size=2048):
+    """
+    N개 사이클 동시 시뮬레이션
+    - batch: {"inject_data": (N, K, 2), ...} (generate_batch 반환값 그대로 사용 가능)
+    - 반환값: (time (T,), {변수명: (N, T) 배열}) — 입력 5종 + 출력 5종
+    - chunk_size: 메모리 사용량 제한을 위한 사이클 묶음 크기
+    """
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    time = np.round(np.arange(0.0, t_end + dt / 2, dt), 9)
+    n = len(batch["inject_data"])
+
+    results = {}
+    for lo in range(0, n, chunk_size):
+        part = {key: np.asarray(arr)[lo:lo + chunk_size] for key, arr in batch.items() if key in INPUT_KEYS.values()}
+        chunk = _simulate_chunk(part, time, dt, p)
+        for name, arr in chunk.items():
+            results.setdefault(name, []).append(arr)
+
+    return time, {name: np.concatenate(parts) for name, parts in results.items()}
+
+
+def _simulate_chunk(batch, time, dt, p):
+    signals = {var: interp_batch(batch[key], time) for var, key in INPUT_KEYS.items()}
+    n, steps = signals["Inject"].shape
+
+    # 명령값 → 밸브 개도 (0 ~ 1 부근)
+    u_inj = np.clip(signals["Inject"] / 24.0, 0.0, 1.25)
+    u_noz = np.clip(signals["Nozzle"] / 24.0, 0.0, 1.0)
+    u_ret = np.clip(signals["Retract"] / 24.0, 0.0, 1.0)
+    u_bp = np.clip(signals["Backpr"] / 26.0, 0.0, 1.5)
+    u_ext = np.clip(signals["Extruder"] / 24.5, 0.0, 1.0)
+
+    # 오리피스 유량 평형에 따른 평형 압력
+    a = (p["k_inject"] * u_inj) ** 2
+    b = (p["k_nozzle"] * u_noz) ** 2 + p["k_leak"] ** 2
+    c = (p["k_retract"] * u_ret) ** 2
+    p_eq = p["relief_pressure"] * (a - c) / (a + b + c)
+    p_eq = np.clip(p_eq, p["min_pressure"], p["relief_pressure"])
+    p_back = p["backpr_pressure"] * u_bp + p["extruder_pressure"] * u_ext
+
+    alpha_p = 1.0 - np.exp(-dt / p["tau_pressure"])
+    alpha_v = 1.0 - np.exp(-dt / p["tau_velocity"])
+
+    pressure = np.empty((n, steps))
+    velocity = np.empty((n, steps))
+    position = np.empty((n, steps))
+
+    pr = np.zeros(n)
+    v = np.zeros(n)
+    x = np.full(n, p["position_min"])
+    for i in range(steps):
+        pr += (p_eq[:, i] - pr) * alpha_p
+        v_eq = p["velocity_gain"] * (pr - p_back[:, i])
+        v += (v_eq - v) * alpha_v
+        x += v * dt
+        # 스트로크 끝에서 정지
+        at_end = (x >= p["position_max"]) & (v > 0)
+        at_start = (x <= p["position_min"]) & (v < 0)
+        x = np.clip(x, p["position_min"], p["position_max"])
+        v = np.where(at_end | at_start, 0.0, v)
+        pressure[:, i] = pr
+        velocity[:, i] = v
+        position[:, i] = x
+
+    flow = p["flow_gain"] * u_noz * np.sqrt(np.clip(pressure, 0.0, None) / p["relief_pressure"])
+    volume = p["volume_gain"] * np.concatenate(
+        [np.zeros((n, 1)), np.cumsum((flow[:, 1:] + flow[:, :-1]) * 0.5 * dt, axis=1)], axis=1
+    )
+
+    return {
+        **signals,
+        "Piston_Position": position,
+        "Piston_Pressure": pressure,
+        "Piston_Velocity": velocity,
+        "Flow_Rate": flow,
+        "Volume": volume,
+    }
+
+
+def load_mat_batch(mat_path):
+    """사이클 .mat 또는 통합 배치 .mat을 (N, K, 2) 배치 dict로 로딩"""
+    mat = loadmat(mat_path)
+    batch = {}
+    for key in INPUT_KEYS.values():
+        arr = np.asarray(mat[key], dtype=float)
+        batch[key] = arr[None] if arr.ndim == 2 else arr
+    return batch
+
+
+def write_result_csvs(time, signals, index=0, out_dir=CSV_DIR, run_id="014", stamp=None):
+    """
+    Simulink postprocess와 같은 형식으로 사이클 1개의 CSV 10개 저장
+    - 파일명: {변수}_{YYYYMMDD_HHMMSS}_RID{run_id}.csv, 컬럼: Time,{변수}
+    - 반환값: {변수명: 저장 경로}
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tag = (stamp or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    paths = {}
+    for var, arr in signals.items():
+        path = os.path.join(out_dir, f"{var}_{tag}_RID{run_id}.csv")
+        np.savetxt(path, np.column_stack([time, arr[index]]), delimiter=",",
+                   header=f"Time,{var}", comments="", fmt="%.10g")
+        paths[var] = path
+    return paths
+
+
+class SurrogateBackend:
+    """
+    sim_pool 용 surrogate 백엔드 (MatlabEngineBackend 대체)
+    - run(mat_path): .mat 로딩 → 시뮬레이션 → csv_results에 CSV 저장 → 결과 색인에 등록
+    - 기존 소비 코드가 사이클을 '분' 단위 타임스탬프로 묶으므로,
+      사이클마다 가상 시각을 1분씩 증가시켜 파일명 충돌을 방지
+    - generate_batch_mats 파일(_C0012.mat)은 사이클 인덱스로 시각을 정하므로,
+      풀에서 여러 워커가 같은 start_time을 공유해도 충돌하지 않음
+      (예: functools.partial(SurrogateBackend, start_time=datetime.now()))
+    """
+
+    def __init__(self, out_dir=CSV_DIR, run_id="014", params=None, start_time=None, index_path=INDEX_PATH):
+        self.out_dir = out_dir
+        self.index_path = index_path
+        self.run_id = run_id
+        self.params = params
+        self.start_time = start_time
+        self._clock = None
+
+    def start(self):
+        self.start_time_base = (self.start_time or datetime.now()).replace(second=0, microsecond=0)
+        self._clock = self.start_time_base
+
+    def run(self, mat_path):
+        time, signals = simulate_batch(load_mat_batch(mat_path), params=self.params)
+        match = re.search(r"_C(\d+)\.mat$", mat_path)
+        if match:
+            self._clock = self.start_time_base + timedelta(minutes=int(match.group(1)))
+
+        written = []
+        for i in range(len(signals["Volume"])):
+            written.append(write_result_csvs(time, signals, i, self.out_dir, self.run_id, self._clock))
+            self._clock += timedelta(minutes=1)
+        register_files([path for paths in written for path in paths.values()], self.index_path)
+        return written
+
+    def close(self):
+        pass
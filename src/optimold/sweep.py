@@ -0,0 +1,131 @@
+# src/optimold/sweep.py
+
+"""
+제어 입력 공간 what-if 일괄 스윕 (운전 안전 영역 탐색)
+
+- 스윕 지점: grid_points() 축별 등간격 격자 / lhs_points() Latin hypercube (범위: binning.AXIS_RANGES)
+- SweepModel: input_params.csv 입력 ⨝ 분류 결과 저장소(optimold.scenario_store, cycle_id 기준)로 학습
+  · 시나리오 확률: ExtraTreesClassifier.predict_proba
+  · 핵심 특징량(판정 규칙이 쓰는 Volume_max / flat ratio 등): ExtraTreesRegressor 다중 출력
+- evaluate(): 수만 개 지점을 청크 단위 벡터 연산으로 한 번에 평가
+  → 입력 + bin_label + P(시나리오) + 예측 특징량 + 최빈 시나리오 DataFrame
+- 학습된 모델은 joblib으로 저장(optimold.model_io), 대시보드는 프로세스당 1회만 로딩
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+from sklearn.ensemble import ExtraTreesClassifier, ExtraTreesRegressor
+
+from optimold.binning import AXES, AXIS_RANGES, discretize
+from optimold.model_io import JoblibModel
+from optimold.result_files import CSV_DIR
+from optimold.scenario_rules import required_features
+from optimold.scenario_store import SCENARIO_STORE, load_results
+from optimold.timeseries_service import to_cycle_key
+
+SWEEP_MODEL_PATH = os.path.join(os.path.dirname(CSV_DIR), "sweep_model.joblib")
+KEY_FEATURES = required_features()
+
+
+def grid_points(n_per_axis=10, ranges=AXIS_RANGES):
+    """축별 n개 등간격 격자 (n_per_axis: 정수 또는 축별 4개) → (Π n, 4)"""
+    counts = np.broadcast_to(np.asarray(n_per_axis, dtype=int), (len(ranges),))
+    axes = [np.linspace(lo, hi, n) for (lo, hi), n in zip(ranges, counts)]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(ranges))
+
+
+def lhs_points(n, ranges=AXIS_RANGES, seed=0):
+    """Latin hypercube n개 → (n, 4)"""
+    lo, hi = np.array(ranges, dtype=float).T
+    return qmc.scale(qmc.LatinHypercube(d=len(ranges), seed=seed).random(n), lo, hi)
+
+
+def training_table(input_path, store_dir=SCENARIO_STORE, version=None):
+    """input_params.csv 행과 분류 결과를 cycle_id로 결합 (입력 + scenario + 핵심 특징량)"""
+    params = pd.read_csv(input_path)
+    params["cycle_id"] = params["run_id"].map(to_cycle_key)
+    results = load_results(version, store_dir)
+    table = params.merge(results[["cycle_id", "scenario"] + KEY_FEATURES], on="cycle_id", how="inner")
+    return table.dropna(subset=AXES + KEY_FEATURES)
+
+
+class SweepModel(JoblibModel):
+    """
+    - fit(table): training_table() 결과로 학습
+    - evaluate(points): (n, 4) 제어 입력 → 스윕 결과 DataFrame
+    - save(path) / load(path): optimold.model_io.JoblibModel (기본 경로 SWEEP_MODEL_PATH)
+    """
+
+    default_path = SWEEP_MODEL_PATH
+
+    def __init__(self, n_estimators=100, random_state=0):
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+
+    def fit(self, table):
+        X = table[AXES].to_numpy(dtype=float)
+        self.classifier_ = ExtraTreesClassifier(n_estimators=self.n_estimators, random_state=self.random_state)
+        self.classifier_.fit(X, table["scenario"].to_numpy())
+        self.regressor_ = ExtraTreesRegressor(n_estimators=self.n_estimators, random_state=self.random_state)
+        self.regressor_.fit(X, table[KEY_FEATURES].to_numpy(dtype=float))
+        self.scenarios_ = list(self.classifier_.classes_)
+        self.n_train_ = len(X)
+        return self
+
+    def evaluate(self, points, chunk_size=20000):
+        points = np.asarray(points, dtype=float)
+        proba = np.empty((len(points), len(self.scenarios_)))
+        features = np.empty((len(points), len(KEY_FEATURES)))
+        for lo in range(0, len(points), chunk_size):
+            part = points[lo:lo + chunk_size]
+            proba[lo:lo + chunk_size] = self.classifier_.predict_proba(part)
+            features[lo:lo + chunk_size] = self.regressor_.predict(part).reshape(len(part), -1)
+
+        out = pd.DataFrame(points, columns=AXES)
+        out["bin_label"] = discretize(points)[1]
+        for j, scenario in enumerate(self.scenarios_):
+            out[f"P({scenario})"] = proba[:, j]
+        for j, name in enumerate(KEY_FEATURES):
+            out[name] = features[:, j]
+        out["scenario"] = np.asarray(self.scenarios_, dtype=object)[proba.argmax(axis=1)]
+        return out
+
+
+def train(input_path, store_dir=SCENARIO_STORE, version=None, model_path=SWEEP_MODEL_PATH):
+    table = training_table(input_path, store_dir, version)
+    if table.empty:
+        raise ValueError("input_params와 cycle_id가 일치하는 분류 결과가 없습니다 (run_classification 결과 필요).")
+    model = SweepModel().fit(table)
+    model.save(model_path)
+    return model
+
+
+def safe_window(result, x_axis, y_axis, scenario="Normal", n_bins=20):
+    """
+    두 축 기준 (n_bins × n_bins) 평균 P(scenario) 지도 (나머지 축은 평균)
+    반환값: DataFrame (index: y 구간 중앙값 내림차순, columns: x 구간 중앙값, 항상 n_bins × n_bins),
+            지점이 없는 칸은 NaN → 표시 범위는 AXIS_RANGES 양 끝
+    """
+    ranges = dict(zip(AXES, AXIS_RANGES))
+    centers, cols = {}, {}
+    for axis in (x_axis, y_axis):
+        lo, hi = ranges[axis]
+        edges = np.linspace(lo, hi, n_bins + 1)
+        idx = np.clip(np.digitize(result[axis].to_numpy(), edges) - 1, 0, n_bins - 1)
+        centers[axis] = (edges[:-1] + edges[1:]) / 2
+        cols[axis] = centers[axis][idx]
+    column = f"P({scenario})"
+    p = result[column].to_numpy() if column in result else np.zeros(len(result))  # 학습 데이터에 없는 시나리오는 0
+    grid = pd.DataFrame({"x": cols[x_axis], "y": cols[y_axis], "p": p})
+    window = grid.pivot_table(index="y", columns="x", values="p", aggfunc="mean")
+    # pivot_table은 빈 구간을 빼므로 전체 n_bins × n_bins 격자로 되돌림 (격자 스윕처럼 지점이 듬성한 경우)
+    return window.reindex(index=centers[y_axis][::-1], columns=centers[x_axis])
+
+
+if __name__ == "__main__":
+    input_path = os.path.join(CSV_DIR, "input_params.csv")
+    model = train(input_path)
+    print(f"[✓] 스윕 모델 학습 완료: {model.n_train_}개 사이클, 시나리오 {model.scenarios_} → {SWEEP_MODEL_PATH}")
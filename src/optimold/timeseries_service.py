@@ -0,0 +1,140 @@
+# src/optimold/timeseries_service.py
+
+"""
+run_id 기준 사이클 시계열 조회 서비스 (Process Prediction)
+
+- run_id → 결과 파일: 결과 색인(optimold.result_index)에서 사이클 키로 직접 조회
+  (변수별 정렬 리스트의 위치를 맞추는 방식이 아니므로 파일 누락/추가에 영향 없음)
+- run_id 형식: input_params의 "YYYYMMDD_HHMM_RID014" / "YYYYMMDD_HHMMSS_RID014" 모두 허용
+- 읽은 시계열은 float32 (t, v) 배열로 변환하여 메모리 상한(max_bytes) 내 LRU 캐시에 보관
+  → 같은 run_id 재조회 시 디스크 I/O 없음
+- preload(): 이웃 run(top-k 후보)을 스레드 풀로 미리 로딩 (같은 run 동시 요청은 1회만 로딩)
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from optimold.result_files import CSV_DIR, VARIABLES, cycle_key, read_signal_csv
+from optimold.result_index import INDEX_PATH, query
+
+RUN_ID_PATTERN = re.compile(r"^(?P<date>\d{8})_(?P<time>\d{4}(?:\d{2})?)_RID(?P<rid>[0-9A-Za-z]+)$")
+
+
+def to_cycle_key(run_id):
+    """input_params run_id → 결과 색인 사이클 키 (YYYYMMDD_HHMM_RID014)"""
+    match = RUN_ID_PATTERN.match(str(run_id))
+    if not match:
+        raise ValueError(f"run_id 형식 오류: {run_id}")
+    return cycle_key(match.group("date"), match.group("time"), match.group("rid"))
+
+
+class TimeSeriesService:
+    """
+    - get(run_id): {변수: (t, v) float32 배열}, 결과 파일이 없으면 None
+    - frames(run_id): {변수: DataFrame(Time, 변수)} (대시보드 차트용)
+    - preload(run_ids): 백그라운드 로딩 예약
+    """
+
+    def __init__(self, csv_dir=CSV_DIR, max_bytes=256 * 1024 ** 2, variables=VARIABLES, n_workers=4,
+                 db_path=INDEX_PATH):
+        self.csv_dir = csv_dir
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.variables = list(variables)
+        self._cache = OrderedDict()
+        self._nbytes = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="ts-preload")
+        self.hits = 0
+        self.misses = 0
+
+    def _read(self, key):
+        files = {}
+        for row in query(cycle=key, csv_dir=self.csv_dir, db_path=self.db_path):
+            files.setdefault(row["variable"], row["path"])
+        if not files:
+            return None
+        data = {}
+        for var in self.variables:
+            if var in files:
+                t, v = read_signal_csv(files[var])
+                data[var] = (t.astype(np.float32), v.astype(np.float32))
+        return data
+
+    def _store(self, key, data):
+        size = sum(t.nbytes + v.nbytes for t, v in data.values())
+        if size > self.max_bytes:
+            return  # 단일 run이 상한보다 크면 캐시하지 않음
+        self._cache[key] = (data, size)
+        self._nbytes += size
+        while self._nbytes > self.max_bytes:
+            _, (_, old_size) = self._cache.popitem(last=False)
+            self._nbytes -= old_size
+
+    def _load(self, key):
+        """캐시 미스 로딩 (같은 키를 동시에 요청하면 먼저 시작한 로딩 결과를 공유)"""
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key][0]
+            event = self._pending.get(key)
+            owner = event is None
+            if owner:
+                event = self._pending[key] = threading.Event()
+        if not owner:
+            event.wait()
+            with self._lock:
+                entry = self._cache.get(key)
+            return entry[0] if entry else self._read(key)
+
+        try:
+            data = self._read(key)
+            with self._lock:
+                if data is not None:
+                    self._store(key, data)
+            return data
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            event.set()
+
+    def get(self, run_id):
+        key = to_cycle_key(run_id)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        return self._load(key)
+
+    def frames(self, run_id):
+        data = self.get(run_id)
+        if data is None:
+            return {}
+        return {var: pd.DataFrame({"Time": t, var: v}) for var, (t, v) in data.items()}
+
+    def preload(self, run_ids):
+        """캐시에 없는 run만 백그라운드 로딩 예약, Future 리스트 반환"""
+        futures = []
+        for run_id in run_ids:
+            key = to_cycle_key(run_id)
+            with self._lock:
+                if key in self._cache or key in self._pending:
+                    continue
+            futures.append(self._executor.submit(self._load, key))
+        return futures
+
+    def cache_info(self):
+        with self._lock:
+            return {"runs": len(self._cache), "bytes": self._nbytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
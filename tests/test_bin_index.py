@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimold.bin_index import BinIndex, parse_bin_labels
+from optimold.binning import AXES, AXIS_RANGES, discretize
+
+
+def _params(n, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.column_stack([rng.uniform(lo, hi, n) for lo, hi in AXIS_RANGES])
+    _, labels = discretize(values)
+    return pd.DataFrame({"run_id": [f"run{i:04d}" for i in range(n)], **dict(zip(AXES, values.T)),
+                         "bin_label": labels})
+
+
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_top_k_matches_brute_force_l1(k):
+    df = _params(500)
+    index = BinIndex(df)
+    bins = parse_bin_labels(df["bin_label"]).astype(int)
+    for label in ["I0_B0_R0_N0", "I10_B5_R19_N3", df["bin_label"].iloc[7]]:
+        target = parse_bin_labels([label]).astype(int)[0]
+        distances = np.abs(bins - target).sum(axis=1)
+        expected = np.lexsort((np.arange(len(df)), distances))[:k]  # 거리 동률이면 행 순서
+        rows, dist = index.top_k_bins(label, k=k)
+        assert rows.tolist() == expected.tolist()
+        assert dist.tolist() == distances[expected].tolist()
+
+
+def test_rows_with_label_and_nearest_runs():
+    df = _params(200, seed=1)
+    df = df[df["bin_label"] != "I19_B19_R19_N19"].reset_index(drop=True)
+    index = BinIndex(df)
+    label = df["bin_label"].iloc[3]
+    assert index.rows_with_label(label).tolist() == np.flatnonzero(df["bin_label"] == label).tolist()
+    assert index.rows_with_label("I19_B19_R19_N19").size == 0
+
+    rows, dist = index.nearest_runs(df[AXES].iloc[42].to_numpy(), k=1)
+    assert rows.tolist() == [42] and dist.tolist() == [0.0]
+
+
+def test_bad_label_is_rejected():
+    with pytest.raises(ValueError):
+        parse_bin_labels(["I1_B2_R3"])
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from optimold.causality import causal_edges, granger_rss, lag_design
+
+
+def _lstsq_rss(design, target):
+    coef, _, _, _ = np.linalg.lstsq(design, target, rcond=None)
+    return np.sum((target - design @ coef) ** 2)
+
+
+def test_rss_matches_lstsq_over_cycles():
+    rng = np.random.default_rng(0)
+    n_cycles, T, p = 4, 200, 3
+    xs = [rng.normal(size=(n_cycles, T)) for _ in range(3)]
+    ys = 2.0 * np.roll(xs[0], 1, axis=1) + rng.normal(size=(n_cycles, T))
+
+    rss_r, rss_u, df_num, n_obs = granger_rss(ys, xs, p)
+    assert n_obs == n_cycles * (T - p)
+    assert df_num.tolist() == [p] * 3
+    for j in range(3):
+        # 사이클별 설계 행렬을 이어 붙인 뒤 직접 최소제곱 (사이클 경계를 넘는 지연 없음)
+        design = np.concatenate([lag_design(ys[i], np.array([xs[j][i]]), p)[0] for i in range(n_cycles)])
+        target = design[:, -1]
+        np.testing.assert_allclose(rss_r[j], _lstsq_rss(design[:, :p + 1], target), rtol=1e-9)
+        np.testing.assert_allclose(rss_u[j], _lstsq_rss(design[:, :-1], target), rtol=1e-9)
+    assert rss_r[0] > 2 * rss_u[0]  # x0 → y 관계가 있는 쌍은 RSS가 크게 감소
+    assert rss_r[1] < 1.1 * rss_u[1]
+
+
+def test_constant_input_adds_no_degrees_of_freedom():
+    rng = np.random.default_rng(1)
+    ys = rng.normal(size=(2, 100))
+    rss_r, rss_u, df_num, _ = granger_rss(ys, [np.ones((2, 100))], 2)
+    assert df_num.tolist() == [0]
+    np.testing.assert_allclose(rss_r, rss_u)
+
+
+def test_causal_edges_strength():
+    table = pd.DataFrame({
+        "control": ["Inject"] * 2 + ["Nozzle"] * 2 + ["Backpr"] * 2,
+        "output": ["Volume"] * 6,
+        "lag": [1, 2] * 3,
+        "p_value": [0.01, 0.02, 0.01, 0.5, 0.3, 0.6],
+    })
+    assert causal_edges(table) == [("Inject", "Volume", "strong"), ("Nozzle", "Volume", "weak"),
+                                   ("Backpr", "Volume", "uncertain")]
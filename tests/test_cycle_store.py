@@ -0,0 +1,46 @@
+import threading
+
+import numpy as np
+
+from optimold.cycle_store import append_cycles, load_signal, make_time_grid, read_manifest, stored_cycles
+from optimold.result_files import VARIABLES
+
+T = len(make_time_grid(10.0, 1e-3))
+
+
+def _cycle(i):
+    return {f"20990101_{i:06d}_RID014": {var: np.full(T, float(i)) for var in VARIABLES}}
+
+
+def test_small_chunks_are_consolidated_in_order(tmp_path):
+    store = str(tmp_path / "store")
+    for i in range(10):
+        append_cycles(_cycle(i), store, chunk_size=8, max_small=4)
+
+    manifest = read_manifest(store)
+    assert [c["n"] for c in manifest["partitions"]["RID014"]] == [8, 2]
+    keys, values = load_signal(VARIABLES[0], store, "RID014")
+    assert keys == [f"20990101_{i:06d}_RID014" for i in range(10)]
+    assert values[:, 0].tolist() == list(range(10))
+
+
+def test_concurrent_appends_keep_every_cycle(tmp_path):
+    store = str(tmp_path / "store")
+
+    def writer(lo):
+        for i in range(lo, lo + 20):
+            append_cycles(_cycle(i), store, chunk_size=8, max_small=4)
+
+    threads = [threading.Thread(target=writer, args=(k * 100,)) for k in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    manifest = read_manifest(store)
+    assert sorted(stored_cycles(manifest)) == sorted(f"20990101_{k * 100 + i:06d}_RID014"
+                                                    for k in range(3) for i in range(20))
+    names = [c["chunk"] for c in manifest["partitions"]["RID014"]]
+    assert len(names) == len(set(names))
+    keys, values = load_signal(VARIABLES[0], store, "RID014")
+    assert all(row[0] == int(key.split("_")[1]) for key, row in zip(keys, values))
@@ -0,0 +1,25 @@
+import os
+
+from optimold.cycle_tracker import CycleTracker
+from optimold.result_index import refresh
+
+
+def _touch(csv_dir, fname):
+    with open(os.path.join(csv_dir, fname), "w") as f:
+        f.write("Time,Value\n0,0\n")
+
+
+def test_file_added_after_delete_is_tracked(tmp_path):
+    csv_dir, db_path = tmp_path / "csv", str(tmp_path / "index.sqlite")
+    csv_dir.mkdir()
+    for var in ("Inject", "Backpr"):
+        _touch(csv_dir, f"{var}_20250605_130000_RID014.csv")
+    tracker = CycleTracker(csv_dir=str(csv_dir), db_path=db_path)
+    assert tracker.poll() == 2
+
+    # 마지막 행 삭제 후 새 파일 등록: rowid였다면 삭제된 번호가 재사용되어 커서 이하가 됨
+    os.remove(csv_dir / "Backpr_20250605_130000_RID014.csv")
+    refresh(str(csv_dir), db_path, force=True)
+    _touch(csv_dir, "Piston_Pressure_20250605_130000_RID014.csv")
+    assert tracker.poll() == 1
+    assert tracker.summary()["files_by_var"]["Piston_Pressure"] == 1
@@ -0,0 +1,39 @@
+import numpy as np
+
+from optimold.cycle_store import append_cycles
+from optimold.features import FEATURE_COLUMNS, FEATURE_VARIABLES, build_feature_df, compute_features
+from optimold.generate_physical_mat import generate_batch
+from optimold.surrogate_sim import simulate_batch
+
+
+def _columns(values):
+    return dict(zip(FEATURE_COLUMNS, values.T))
+
+
+def test_base_features_on_known_signals():
+    time = np.linspace(0.0, 10.0, 1001)
+    ramp = time / 10.0
+    signals = {var: np.stack([ramp, np.full_like(time, 2.0)]) for var in FEATURE_VARIABLES}
+    features = _columns(compute_features(signals, time))
+
+    np.testing.assert_allclose(features["Volume_max"], [1.0, 2.0])
+    np.testing.assert_allclose(features["Volume_mean"], [0.5, 2.0])
+    np.testing.assert_allclose(features["Volume_auc"], [5.0, 20.0])
+    np.testing.assert_allclose(features["Volume_rise_time"][0], 8.0, atol=0.01)  # 10% → 90%
+    assert features["Volume_flat_ratio"][1] == 1.0 and features["Volume_std"][1] == 0.0
+    np.testing.assert_allclose(features["Piston_Position_min"], [0.0, 2.0])
+
+
+def test_store_features_match_direct_computation(tmp_path):
+    time, signals = simulate_batch(generate_batch(6, seed=2, run_id="014"))
+    keys = [f"20250605_13{i:02d}_RID014" for i in range(6)]
+    store = str(tmp_path / "store")
+    for lo in (0, 4):  # 청크 2개로 나눠 저장
+        append_cycles({key: {var: arr[i] for var, arr in signals.items()}
+                       for i, key in enumerate(keys) if lo <= i < lo + 4}, store)
+
+    serial = build_feature_df(store, n_workers=1)
+    parallel = build_feature_df(store, n_workers=2)
+    assert serial["cycle_id"].tolist() == keys
+    assert serial.equals(parallel)
+    np.testing.assert_array_equal(serial[FEATURE_COLUMNS].to_numpy(), compute_features(signals, time))
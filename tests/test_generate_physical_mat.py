@@ -0,0 +1,31 @@
+import numpy as np
+from scipy.io import loadmat
+
+from optimold import generate_physical_mat
+from optimold.generate_physical_mat import generate_batch, generate_mat
+
+
+def test_batch_shapes_and_time_order():
+    batch = generate_batch(300, seed=11, run_id="014")
+    assert {name: arr.shape for name, arr in batch.items()} == {
+        "inject_data": (300, 7, 2), "backpr_data": (300, 7, 2), "retract_data": (300, 7, 2),
+        "nozzle_data": (300, 7, 2), "extruder_data": (300, 8, 2),
+    }
+    for name in ("retract_data", "nozzle_data", "extruder_data"):
+        assert (np.diff(batch[name][:, :, 0], axis=1) >= 0.05 - 1e-12).all(), name
+    assert (batch["backpr_data"][:, :, 1] >= 0).all()
+
+
+def test_nozzle_failures_keep_valve_closed():
+    nozzle = generate_batch(2000, seed=11, run_id="014")["nozzle_data"][:, :, 1]
+    failed = nozzle[:, 2] == 0
+    assert (nozzle[failed, 3] == 0).all()
+    assert 0.05 < failed.mean() < 0.15  # 개방 실패 확률 10%
+
+
+def test_single_cycle_matches_batch_row(tmp_path, monkeypatch):
+    monkeypatch.setattr(generate_physical_mat, "CYCLE_DIR", str(tmp_path))
+    mat = loadmat(generate_mat(seed=11, run_id="014", cycle=5))
+    row = generate_batch(1, seed=11, run_id="014", start=5)
+    for name, arr in row.items():
+        np.testing.assert_array_equal(mat[name], arr[0])
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from optimold.features import FEATURE_COLUMNS, FEATURE_VARIABLES, compute_features
+from optimold.generate_physical_mat import generate_batch
+from optimold.online_detector import LiveMonitor, OnlineDetector, replay_cycle
+from optimold.result_files import read_signal_csv
+from optimold.scenario_rules import classify, required_features
+from optimold.surrogate_sim import simulate_batch, write_result_csvs
+
+N_CYCLES = 8
+
+
+@pytest.fixture(scope="module")
+def cycles(tmp_path_factory):
+    out_dir = str(tmp_path_factory.mktemp("csv"))
+    time, signals = simulate_batch(generate_batch(N_CYCLES, seed=3, run_id="014"))
+    start = datetime(2099, 1, 1)
+    return [write_result_csvs(time, signals, i, out_dir=out_dir, stamp=start + timedelta(minutes=i))
+            for i in range(N_CYCLES)]
+
+
+def _batch(cycles):
+    """CSV에서 다시 읽은 신호로 배치 분류 (실시간 판정기와 같은 입력)"""
+    time = read_signal_csv(cycles[0][FEATURE_VARIABLES[0]])[0]
+    signals = {var: np.stack([read_signal_csv(paths[var])[1] for paths in cycles]) for var in FEATURE_VARIABLES}
+    features = dict(zip(FEATURE_COLUMNS, compute_features(signals, time).T))
+    return features, classify(features).tolist()
+
+
+def test_replay_decisions_match_batch_classifier(cycles):
+    features, expected = _batch(cycles)
+    for i, paths in enumerate(cycles):
+        detector, events = replay_cycle(paths, chunk_size=333)
+        decisions = [e["scenario"] for e in events if e["type"] == "decision"]
+        assert decisions == [expected[i]]
+        assert detector.decision == expected[i]
+        for name in required_features():
+            lo, hi = detector.features()[name]
+            assert lo == pytest.approx(hi) == pytest.approx(features[name][i], abs=1e-9)
+
+
+def test_chunk_size_does_not_change_decision(cycles):
+    for paths in cycles[:3]:
+        assert replay_cycle(paths, chunk_size=1000)[0].decision == replay_cycle(paths, chunk_size=37)[0].decision
+
+
+def test_unfinished_streams_stay_undecided_or_consistent(cycles):
+    _, expected = _batch(cycles)
+    for i, paths in enumerate(cycles):
+        detector = OnlineDetector()
+        for signal in detector.signals:  # 앞 절반만 공급 → 확정됐다면 최종 판정과 같아야 함
+            t, v = read_signal_csv(paths[signal])
+            detector.push(signal, t[:len(t) // 2], v[:len(v) // 2])
+        assert detector.decision in (None, expected[i])
+
+
+def test_live_monitor_follows_partially_written_files(cycles, tmp_path):
+    _, expected = _batch(cycles)
+    monitor = LiveMonitor(str(tmp_path), idle_polls=2)
+    contents = {}
+    for signal, path in cycles[0].items():
+        if signal in monitor.signals:
+            with open(path, "rb") as f:
+                contents[signal] = f.read()
+
+    for signal, data in contents.items():  # 행 중간에서 끊긴 상태로 먼저 기록
+        with open(tmp_path / f"{signal}_20990101_000000_RID014.csv", "wb") as f:
+            f.write(data[:len(data) // 3 + 5])
+    events = monitor.poll()
+    for signal, data in contents.items():
+        with open(tmp_path / f"{signal}_20990101_000000_RID014.csv", "wb") as f:
+            f.write(data)
+    for _ in range(4):
+        events += monitor.poll()
+
+    decisions = [e for e in events if e["type"] == "decision"]
+    assert [(e["cycle"], e["scenario"]) for e in decisions] == [("20990101_0000_RID014", expected[0])]
+    assert not monitor.cycles and "20990101_0000_RID014" in monitor.closed
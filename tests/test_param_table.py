@@ -0,0 +1,66 @@
+import pandas as pd
+
+from optimold.param_table import advance_watermark, pending_run_ids, read_processed, read_watermark, save_rows
+
+COLUMNS = ["run_id", "Inject"]
+
+
+def _rows(run_ids):
+    return pd.DataFrame({"run_id": run_ids, "Inject": [1.0] * len(run_ids)}, columns=COLUMNS)
+
+
+def test_advance_watermark_stops_before_earliest_pending():
+    pending = ["20250605_1300_RID014", "20250605_1301_RID014", "20250605_1302_RID014"]
+    assert advance_watermark(pending, pending) == pending[-1]
+    assert advance_watermark(pending, [pending[0], pending[2]]) == pending[0]
+    assert advance_watermark(pending, pending[1:]) is None
+
+
+def test_out_of_order_completion_is_retried(tmp_path):
+    table = str(tmp_path / "input_params.csv")
+    a, b, c = "20250605_1300_RID014", "20250605_1301_RID014", "20250605_1302_RID014"
+
+    # 1차: a, c만 완료 (b는 병렬 배치에서 아직 파일이 덜 도착) → c 행도 저장, 워터마크는 a
+    pending = pending_run_ids([a, b, c], None)
+    assert save_rows(table, _rows([a, c]), "gen", None, pending) == 2
+    watermark = read_watermark(table, "gen", COLUMNS)
+    assert watermark == a
+    assert pd.read_csv(table)["run_id"].tolist() == [a, c]
+
+    # 2차: b 도착 → b만 다시 검사되고 중복 없이 추가
+    pending = pending_run_ids([a, b, c], watermark, read_processed(table, "gen", watermark))
+    assert pending == [b]
+    save_rows(table, _rows(pending), "gen", watermark, pending)
+    assert read_watermark(table, "gen", COLUMNS) == c
+    assert sorted(pd.read_csv(table)["run_id"]) == [a, b, c]
+
+
+def test_failed_cycle_does_not_pin_watermark(tmp_path):
+    table = str(tmp_path / "input_params.csv")
+    runs = [f"20250605_13{i:02d}_RID014" for i in range(6)]
+    failed = [runs[1], runs[4]]  # 노즐 신호 없음 등 추출 실패 사이클
+
+    pending = pending_run_ids(runs[:3], None)
+    ok = [r for r in pending if r not in failed]
+    assert save_rows(table, _rows(ok), "gen", None, pending, [r for r in pending if r in failed]) == 2
+    watermark = read_watermark(table, "gen", COLUMNS)
+    assert watermark == runs[2]
+
+    pending = pending_run_ids(runs, watermark, read_processed(table, "gen", watermark))
+    assert pending == runs[3:]
+    ok = [r for r in pending if r not in failed]
+    assert save_rows(table, _rows(ok), "gen", watermark, pending, [r for r in pending if r in failed]) == 2
+    assert read_watermark(table, "gen", COLUMNS) == runs[-1]
+    assert pd.read_csv(table)["run_id"].tolist() == [r for r in runs if r not in failed]
+
+
+def test_no_progress_keeps_watermark(tmp_path):
+    table = str(tmp_path / "input_params.csv")
+    a, b = "20250605_1300_RID014", "20250605_1301_RID014"
+    save_rows(table, _rows([a]), "gen", None, [a])
+
+    n_saved = save_rows(table, _rows([]), "gen", a, [b])
+    assert n_saved == 0
+    assert read_watermark(table, "gen", COLUMNS) == a
+    assert pending_run_ids([a, b], a, read_processed(table, "gen", a)) == [b]
+    assert pd.read_csv(table)["run_id"].tolist() == [a]
@@ -0,0 +1,45 @@
+import os
+
+from optimold import result_index
+from optimold.result_index import files_by_cycle, query, refresh
+
+
+def _touch(csv_dir, fname):
+    with open(os.path.join(csv_dir, fname), "w") as f:
+        f.write("Time,Value\n0,0\n")
+
+
+def test_refresh_picks_up_new_files_and_skips_unchanged_dir(tmp_path, monkeypatch):
+    csv_dir, db_path = tmp_path / "csv", str(tmp_path / "index.sqlite")
+    csv_dir.mkdir()
+    _touch(csv_dir, "Inject_20250605_130000_RID014.csv")
+    _touch(csv_dir, "notes.txt")
+    assert refresh(str(csv_dir), db_path) == 1
+
+    # 디렉토리 mtime이 그대로면 스캔하지 않음
+    def fail(*args):
+        raise AssertionError("unchanged directory was scanned")
+
+    with monkeypatch.context() as m:
+        m.setattr(result_index.os, "scandir", fail)
+        assert refresh(str(csv_dir), db_path) == 0
+
+    _touch(csv_dir, "Backpr_20250605_130000_RID014.csv")
+    _touch(csv_dir, "Inject_20250605_130100_RID014.csv")
+    os.remove(csv_dir / "Inject_20250605_130000_RID014.csv")
+    assert refresh(str(csv_dir), db_path) == 2
+    rows = query(rid="014", csv_dir=str(csv_dir), db_path=db_path)
+    assert [r["fname"] for r in rows] == ["Backpr_20250605_130000_RID014.csv", "Inject_20250605_130100_RID014.csv"]
+
+
+def test_files_by_cycle_groups_variables(tmp_path):
+    csv_dir, db_path = tmp_path / "csv", str(tmp_path / "index.sqlite")
+    csv_dir.mkdir()
+    for fname in ("Inject_20250605_130000_RID014.csv", "Backpr_20250605_130010_RID014.csv",
+                  "Inject_20250605_130100_RID014.csv", "Inject_20250605_130000_RID015.csv"):
+        _touch(csv_dir, fname)
+    cycles = files_by_cycle(rid="014", csv_dir=str(csv_dir), db_path=db_path)
+    assert {key: sorted(files) for key, files in cycles.items()} == {
+        "20250605_1300_RID014": ["Backpr", "Inject"],
+        "20250605_1301_RID014": ["Inject"],
+    }
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from optimold import generate_physical_b_mat, generate_physical_mat
+from optimold.rng_streams import BLOCK_SIZE, generate_sharded, run_key
+
+
+def _assert_same(a, b):
+    assert a.keys() == b.keys()
+    for name in a:
+        np.testing.assert_array_equal(a[name], b[name])
+
+
+@pytest.mark.parametrize("module", [generate_physical_mat, generate_physical_b_mat])
+def test_any_split_matches_serial(module):
+    n = 2 * BLOCK_SIZE + 88
+    serial = module.generate_batch(n, seed=7, run_id="014")
+    bounds = [0, 1, 100, BLOCK_SIZE, BLOCK_SIZE + 3, 2 * BLOCK_SIZE - 1, n]
+    parts = [module.generate_batch(hi - lo, seed=7, run_id="014", start=lo) for lo, hi in zip(bounds, bounds[1:])]
+    _assert_same(serial, {name: np.concatenate([p[name] for p in parts]) for name in serial})
+
+
+@pytest.mark.parametrize("module", [generate_physical_mat, generate_physical_b_mat])
+def test_sharded_matches_serial(module):
+    n = 3 * BLOCK_SIZE + 5
+    serial = module.generate_batch(n, seed=7, run_id="014")
+    _assert_same(serial, generate_sharded(module.generate_batch, n, seed=7, run_id="014", n_workers=3))
+
+
+def test_run_key_distinguishes_zero_from_none():
+    assert run_key(0) != run_key(None)
+    assert run_key(None) == run_key("")
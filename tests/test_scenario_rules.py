@@ -0,0 +1,31 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimold.scenario_rules import RULES, classify, classify_cycle
+
+LEGACY_RESULT = os.path.join(os.path.dirname(__file__), "..", "classified_scenarios_012.csv")
+
+
+def test_default_rules_reproduce_legacy_classification():
+    df = pd.read_csv(LEGACY_RESULT)
+    assert classify(df).tolist() == df["scenario"].tolist()
+    assert [classify_cycle(row) for row in df.to_dict("records")] == df["scenario"].tolist()
+
+
+def test_earlier_rule_wins_and_nan_never_matches():
+    features = {
+        "Volume_max": np.array([40.0, 50.0, np.nan]),
+        "Piston_Velocity_flat_ratio_t6": np.array([0.5, 0.5, 1.0]),
+        "Piston_Velocity_flat_duration_t8": np.array([0.0, 0.0, 0.0]),
+        "Flow_Rate_jetting_duration": np.array([0.0, 0.0, 0.0]),
+    }
+    assert classify(features).tolist() == ["Short shot", "Sticking / Slip - Late velocity stall", "Normal"]
+
+
+def test_unknown_operator_is_rejected():
+    rules = [{**RULES[0], "conditions": [("Volume_max", "==", 45.0)]}]
+    with pytest.raises(ValueError):
+        classify({"Volume_max": np.array([1.0])}, rules)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from optimold.cycle_store import append_cycles, load_signal
+from optimold.density import load_map, update_maps
+from optimold.result_files import VARIABLES
+from optimold.signal_tensor import build_tensor, open_tensor
+
+T_END, DT = 1.0, 0.01
+N_SAMPLES = 101
+
+
+def _append(store, lo, hi):
+    rng = np.random.default_rng(lo)
+    cycles = {f"20250605_13{i:02d}_RID014": {var: rng.uniform(0, 10, N_SAMPLES) for var in VARIABLES}
+              for i in range(lo, hi)}
+    for values in cycles.values():
+        values["Volume"][[0, 1]] = [0.0, 10.0]  # 모든 사이클의 값 범위 동일 → 밀도 지도 증분 누적
+    append_cycles(cycles, store, t_end=T_END, dt=DT)
+
+
+def test_incremental_tensor_matches_store(tmp_path):
+    store, tensor_dir = str(tmp_path / "store"), str(tmp_path / "tensor")
+    _append(store, 0, 3)
+    assert len(build_tensor(store, tensor_dir)) == 3
+    _append(store, 3, 5)
+    assert build_tensor(store, tensor_dir) == [f"20250605_13{i:02d}_RID014" for i in (3, 4)]
+    assert build_tensor(store, tensor_dir) == []
+
+    tensor = open_tensor("RID014", tensor_dir)
+    assert tensor.data.shape == (5, len(VARIABLES), N_SAMPLES) and tensor.data.dtype == np.float32
+    for var in VARIABLES:
+        keys, values = load_signal(var, store, "RID014")
+        assert keys == tensor.cycles
+        np.testing.assert_array_equal(tensor.signal(var), values.astype(np.float32))
+    np.testing.assert_array_equal(tensor.cycle(keys[2]), tensor.data[2])
+
+
+def test_incremental_density_matches_full_rebuild(tmp_path):
+    store = str(tmp_path / "store")
+    _append(store, 0, 3)
+    build_tensor(store, str(tmp_path / "tensor"))
+    update_maps(str(tmp_path / "tensor"), str(tmp_path / "inc"), variables=["Volume"])
+    _append(store, 3, 6)
+    build_tensor(store, str(tmp_path / "tensor"))
+    assert update_maps(str(tmp_path / "tensor"), str(tmp_path / "inc"), variables=["Volume"]) == {"Volume": 3}
+
+    update_maps(str(tmp_path / "tensor"), str(tmp_path / "full"), variables=["Volume"])
+    incremental = load_map("Volume", "RID014", str(tmp_path / "inc"))
+    full = load_map("Volume", "RID014", str(tmp_path / "full"))
+    np.testing.assert_array_equal(incremental["counts"], full["counts"])
+    assert incremental["counts"].sum() == 6 * N_SAMPLES
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+from functools import partial
+
+import pytest
+
+from optimold.sim_pool import PythonBackend, SimulationPool, claim_session
+
+
+def _run(mat_path):
+    """테스트 백엔드: 'crash' 경로는 항상, 'once' 경로는 마커 파일이 없을 때만 워커 프로세스를 강제 종료"""
+    if "crash" in mat_path:
+        os._exit(1)
+    if "once" in mat_path and not os.path.exists(mat_path):
+        open(mat_path, "w").close()
+        os._exit(1)
+    return os.path.basename(mat_path)
+
+
+class BrokenBackend(PythonBackend):
+    """start()에서 실패하는 백엔드 (잘못된 세션 이름/모델 경로 등)"""
+
+    def start(self):
+        raise RuntimeError("세션 연결 실패")
+
+
+def test_map_returns_in_order():
+    with SimulationPool(partial(PythonBackend, _run), n_workers=2) as pool:
+        results = pool.map([f"/tmp/cycle_{i}.mat" for i in range(6)])
+    assert [r["result"] for r in results] == [f"cycle_{i}.mat" for i in range(6)]
+    assert all(r["ok"] for r in results)
+
+
+def test_killed_worker_task_is_requeued(tmp_path):
+    paths = ["/tmp/cycle_0.mat", str(tmp_path / "once_1.mat"), "/tmp/cycle_2.mat", "/tmp/cycle_3.mat"]
+    with SimulationPool(partial(PythonBackend, _run), n_workers=2) as pool:
+        results = pool.map(paths)
+    assert all(r["ok"] for r in results)
+    assert results[1]["result"] == "once_1.mat"
+
+
+def test_task_that_always_kills_worker_fails_after_retries():
+    paths = ["/tmp/cycle_0.mat", "/tmp/crash_1.mat", "/tmp/cycle_2.mat"]
+    with SimulationPool(partial(PythonBackend, _run), n_workers=2, max_retries=1) as pool:
+        results = pool.map(paths)
+        assert [r["ok"] for r in results] == [True, False, True]
+        assert "비정상 종료" in results[1]["error"]
+        assert len(pool.map(["/tmp/cycle_4.mat"])) == 1  # 교체된 워커로 계속 처리 가능
+
+
+def test_backend_start_failure_is_not_respawned():
+    with SimulationPool(partial(BrokenBackend, _run), n_workers=2) as pool:
+        with pytest.raises(RuntimeError, match="세션 연결 실패"):
+            pool.map(["/tmp/cycle_0.mat", "/tmp/cycle_1.mat"])
+        assert pool._next_id == 2  # 기동 실패 워커는 교체하지 않음
+
+
+def test_claim_session_never_shares_a_session(tmp_path):
+    active, overlaps, claimed = {}, [], []
+    lock = threading.Lock()
+
+    def job(i):
+        with claim_session(["optimold"], i, str(tmp_path)) as name:
+            with lock:
+                active[name] = active.get(name, 0) + 1
+                overlaps.append(active[name])
+                claimed.append(name)
+            time.sleep(0.05)
+            with lock:
+                active[name] -= 1
+
+    threads = [threading.Thread(target=job, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert claimed == ["optimold"] * 4
+    assert max(overlaps) == 1
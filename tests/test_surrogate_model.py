@@ -0,0 +1,40 @@
+import numpy as np
+
+from optimold.surrogate_model import OUTPUT_VARIABLES, SurrogateModel
+
+
+def _data(n=40, T=50, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 1, size=(n, 4))
+    time = np.linspace(0, 10, T)
+    Y = {var: np.outer(X[:, j % 4] * 10 ** j, np.sin(time + j)) + 10 ** j for j, var in enumerate(OUTPUT_VARIABLES)}
+    return X, Y, time
+
+
+def test_predict_shapes_and_fit_quality():
+    X, Y, time = _data()
+    model = SurrogateModel(n_estimators=20).fit(X, Y, time)
+    pred = model.predict(X[:3])
+    for var in OUTPUT_VARIABLES:
+        assert pred[var].shape == (3, len(time))
+        span = np.ptp(Y[var])
+        assert np.abs(pred[var] - Y[var][:3]).max() < 0.2 * span
+    frames = model.predict_frames(X[0])
+    assert set(frames) == set(OUTPUT_VARIABLES) and len(frames["Volume"]) == len(time)
+
+
+def test_single_component_keeps_2d_scores():
+    X, Y, time = _data()
+    model = SurrogateModel(n_components=1, n_estimators=10).fit(X, Y, time)
+    assert model.pca_.n_components_ == 1
+    assert model.predict(X[0])["Volume"].shape == (1, len(time))
+    assert model.predict(X[:5])["Volume"].shape == (5, len(time))
+
+
+def test_save_load_roundtrip(tmp_path):
+    X, Y, time = _data()
+    model = SurrogateModel(n_estimators=5).fit(X, Y, time)
+    path = str(tmp_path / "models" / "surrogate.joblib")
+    model.save(path)
+    loaded = SurrogateModel.load(path)
+    np.testing.assert_array_equal(loaded.predict(X[:2])["Volume"], model.predict(X[:2])["Volume"])
@@ -0,0 +1,30 @@
+import numpy as np
+
+from optimold.generate_physical_mat import generate_batch
+from optimold.surrogate_sim import DEFAULT_PARAMS, OUTPUT_VARIABLES, simulate_batch
+
+
+def test_outputs_stay_within_documented_ranges():
+    time, signals = simulate_batch(generate_batch(40, seed=5, run_id="014"), chunk_size=16)
+    p = DEFAULT_PARAMS
+    assert time[0] == 0.0 and time[-1] == 10.0
+    assert all(signals[var].shape == (40, len(time)) for var in OUTPUT_VARIABLES)
+
+    pressure = signals["Piston_Pressure"]
+    assert pressure.min() >= p["min_pressure"] - 1.0 and pressure.max() <= p["relief_pressure"]
+    assert pressure.max() > 0.9 * p["relief_pressure"]  # 사출 구간에서 릴리프 압력 부근까지 상승
+    position = signals["Piston_Position"]
+    assert position.min() >= p["position_min"] and position.max() <= p["position_max"]
+    flow = signals["Flow_Rate"]
+    assert flow.min() >= 0.0 and flow.max() <= p["flow_gain"]
+    assert np.abs(signals["Piston_Velocity"]).max() <= p["velocity_gain"] * p["relief_pressure"]
+    volume = signals["Volume"]
+    assert volume[:, 0].tolist() == [0.0] * 40 and (np.diff(volume, axis=1) >= 0).all()
+
+
+def test_chunking_does_not_change_results():
+    batch = generate_batch(10, seed=5, run_id="014")
+    _, whole = simulate_batch(batch, t_end=2.0)
+    _, chunked = simulate_batch(batch, t_end=2.0, chunk_size=3)
+    for var in whole:
+        np.testing.assert_array_equal(whole[var], chunked[var])
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimold.binning import AXES, AXIS_RANGES
+from optimold.surrogate_model import SurrogateModel
+from optimold.sweep import KEY_FEATURES, SweepModel, grid_points, lhs_points, safe_window
+
+
+def _table(n=200, seed=0):
+    points = lhs_points(n, seed=seed)
+    table = pd.DataFrame(points, columns=AXES)
+    table["scenario"] = np.where(table["Inject"] < 20.0, "Short shot", "Normal")
+    for j, name in enumerate(KEY_FEATURES):
+        table[name] = table["Inject"] * (j + 1)
+    return table
+
+
+def test_sweep_points_cover_ranges():
+    grid = grid_points(3)
+    assert grid.shape == (81, 4)
+    assert grid.min(axis=0).tolist() == [lo for lo, _ in AXIS_RANGES]
+    assert grid.max(axis=0).tolist() == [hi for _, hi in AXIS_RANGES]
+    points = lhs_points(100, seed=1)
+    assert points.shape == (100, 4)
+    for j, (lo, hi) in enumerate(AXIS_RANGES):
+        assert lo <= points[:, j].min() and points[:, j].max() <= hi
+
+
+def test_evaluate_predicts_scenarios_in_chunks():
+    model = SweepModel(n_estimators=20).fit(_table())
+    points = grid_points([5, 2, 2, 2])
+    result = model.evaluate(points, chunk_size=7)
+    assert len(result) == len(points)
+    proba = result[[f"P({s})" for s in model.scenarios_]].to_numpy()
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0)
+    assert (result.loc[result["Inject"] <= 12.0, "scenario"] == "Short shot").all()
+    assert (result.loc[result["Inject"] >= 28.0, "scenario"] == "Normal").all()
+    assert result.equals(model.evaluate(points))
+
+
+def test_safe_window_is_full_grid():
+    model = SweepModel(n_estimators=10).fit(_table())
+    result = model.evaluate(grid_points([4, 4, 1, 1]))
+    window = safe_window(result, "Inject", "Backpr_amp", n_bins=8)
+    assert window.shape == (8, 8)
+    assert window.index.is_monotonic_decreasing and window.columns.is_monotonic_increasing
+    assert window.notna().sum().sum() == 16  # 4 × 4 지점만 채워지고 나머지 칸은 NaN
+    assert safe_window(result, "Inject", "Backpr_amp", scenario="Flash", n_bins=8).fillna(0).eq(0).all().all()
+
+
+def test_load_rejects_other_model_type(tmp_path):
+    path = str(tmp_path / "sweep.joblib")
+    SweepModel(n_estimators=2).fit(_table(20)).save(path)
+    assert isinstance(SweepModel.load(path), SweepModel)
+    with pytest.raises(TypeError):
+        SurrogateModel.load(path)
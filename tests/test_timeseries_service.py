@@ -0,0 +1,60 @@
+import numpy as np
+
+from optimold.timeseries_service import TimeSeriesService, to_cycle_key
+
+N_SAMPLES = 100
+RUN_BYTES = 2 * 2 * N_SAMPLES * 4  # 변수 2개 × (t, v) × float32
+
+
+def _write_runs(csv_dir, n_runs):
+    run_ids = []
+    for i in range(n_runs):
+        stamp = f"20250605_13{i:02d}00"
+        for var in ("Inject", "Backpr"):
+            t = np.linspace(0, 10, N_SAMPLES)
+            np.savetxt(csv_dir / f"{var}_{stamp}_RID014.csv", np.column_stack([t, t * 0 + i]),
+                       delimiter=",", header=f"Time,{var}", comments="")
+        run_ids.append(f"20250605_13{i:02d}_RID014")
+    return run_ids
+
+
+def test_lru_stays_within_byte_budget(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    run_ids = _write_runs(csv_dir, 5)
+    service = TimeSeriesService(str(csv_dir), max_bytes=2 * RUN_BYTES, variables=["Inject", "Backpr"],
+                                db_path=str(tmp_path / "index.sqlite"))
+    try:
+        for run_id in run_ids:
+            data = service.get(run_id)
+            assert data["Inject"][1][0] == run_ids.index(run_id)
+            info = service.cache_info()
+            assert info["bytes"] <= info["max_bytes"]
+        assert service.cache_info()["runs"] == 2
+
+        service.get(run_ids[-1])  # 최근 run은 캐시 적중
+        assert service.cache_info()["hits"] == 1
+        service.get(run_ids[0])  # 가장 오래된 run은 제거되었으므로 다시 로딩
+        assert service.cache_info()["misses"] == 6
+        assert service.get("20250605_1359_RID014") is None
+    finally:
+        service.close()
+
+
+def test_preload_fills_cache(tmp_path):
+    csv_dir = tmp_path / "csv"
+    csv_dir.mkdir()
+    run_ids = _write_runs(csv_dir, 3)
+    service = TimeSeriesService(str(csv_dir), variables=["Inject", "Backpr"], db_path=str(tmp_path / "index.sqlite"))
+    try:
+        for future in service.preload(run_ids):
+            future.result()
+        assert service.cache_info()["runs"] == 3
+        assert set(service.frames(run_ids[1])) == {"Inject", "Backpr"}
+        assert service.cache_info()["misses"] == 0
+    finally:
+        service.close()
+
+
+def test_run_id_formats():
+    assert to_cycle_key("20250605_1300_RID014") == to_cycle_key("20250605_130012_RID014")